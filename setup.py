@@ -1,15 +1,20 @@
 import os
 from setuptools import setup, find_packages
 
-with open ('requirments.txt') as f:
-    requirments = f.read().splitlines()
+with open('requirements.txt') as f:
+    requirements = f.read().splitlines()
 
 with open('README.md', encoding='utf-8') as f:
     long_description = f.read()
 
+# Read the version without importing the package (and its dependencies)
+version = {}
+with open(os.path.join('threedify', '_version.py')) as f:
+    exec(f.read(), version)
+
 setup(
     name="3Dify",
-    version="0.1.0",
+    version=version["__version__"],
     author="Az Ali",
     author_email="a.y.ali@student.utwente.nl",
     description="A Python package for creating 3d models from geospatial data for flood risk analysis",
@@ -25,12 +30,8 @@ setup(
         "Topic :: Scientific/Engineering :: Visualization",
     ],
     python_requires=">=3.8",
-    install_requires=requirments,
-    entry_points={
-        "console_script": [
-            "3dify=3dify.cli:main",
-        ],
-    },
+    install_requires=requirements,
+    scripts=["bin/3dify"],
     include_package_data=True,
 
 )
\ No newline at end of file
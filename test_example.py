@@ -3,35 +3,33 @@
 
 import unittest
 import os
+import shutil
 import tempfile
-from pathlib import Path
 from PIL import Image
 import numpy as np
 
 from threedify.core.pipeline import Pipeline
 
-class TestPipeline():
+SAMPLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "test_sample")
+
+class TestPipeline(unittest.TestCase):
     """Test cases for the threedify pipeline."""
     def setUp(self):
         """Set up test environment."""
-        self.test_dir = "test_sample"
-        if not os.path.exists(self.test_dir):
-            os.makedirs(self.test_dir)
-        self.test_image_path = os.path.join(self.test_dir, "bus.png")
+        # Read the committed sample image, write outputs to a scratch directory
+        self.test_dir = tempfile.mkdtemp()
+        self.test_image_path = os.path.join(SAMPLE_DIR, "bus.png")
         # self._create_test_image(self.test_image_path)
         self.pipeline = Pipeline()
     
     def _create_test_image(self, path):
         """Create a simple test image."""
         size = 256
-        img = Image.new('RGB', (size, size), color='white')
-        pixels = img.load()
-        
-        for i in range(size):
-            for j in range(size):
-                if (i // 32 + j // 32) % 2 == 0:
-                    pixels[i, j] = (0, 0, 0)
-        img.save(path)
+        cells = np.arange(size) // 32
+        black = (cells[:, None] + cells[None, :]) % 2 == 0
+        pixels = np.full((size, size, 3), 255, dtype=np.uint8)
+        pixels[black] = 0
+        Image.fromarray(pixels, 'RGB').save(path)
     
     def test_load_image(self):
         """Test loading an image into the pipeline."""
@@ -42,35 +40,31 @@ class TestPipeline():
         _ = self.pipeline.load(self.test_image_path, data_type="raster")
         _ = self.pipeline.process(process_type="raster")
 
+    @unittest.skipUnless(os.environ.get("THREEDIFY_NETWORK_TESTS"),
+                         "needs the TRELLIS API; set THREEDIFY_NETWORK_TESTS=1 to run")
     def test_full_pipeline(self):
         """Test running the full pipeline."""
         output_path = self.test_dir
-        result = self.pipeline.run_pipeline(
-            data_path=self.test_image_path,
-            output_path=output_path,
-            data_type="raster",
-            process_type="raster",
-            model_type="trellis",
-            export_format="gltf"
-        )
+        try:
+            self.pipeline.run_pipeline(
+                data_path=self.test_image_path,
+                output_path=output_path,
+                data_type="raster",
+                process_type="raster",
+                model_type="trellis",
+                export_format="gltf"
+            )
+        except ImportError as e:
+            self.skipTest(f"TRELLIS API client unavailable: {str(e)}")
     
     def tearDown(self):
         """Clean up after tests."""
-        if os.path.exists(self.test_image_path):
-            os.unlink(self.test_image_path)
-        for file in os.listdir(self.test_dir):
-            try:
-                os.unlink(os.path.join(self.test_dir, file))
-            except:
-                pass
-        try:
-            os.rmdir(self.test_dir)
-        except:
-            pass
+        shutil.rmtree(self.test_dir, ignore_errors=True)
 
 if __name__ == '__main__':
     test = TestPipeline()
     test.setUp()
     test.test_load_image()
     test.test_process_image()
-    test.test_full_pipeline()
\ No newline at end of file
+    test.test_full_pipeline()
+    test.tearDown()
\ No newline at end of file
@@ -3,8 +3,8 @@
 
 import unittest
 import os
+import shutil
 import tempfile
-from pathlib import Path
 from PIL import Image
 import numpy as np
 
@@ -12,24 +12,31 @@ from threedify.core.pipeline import Pipeline
 
 class TestPipeline(unittest.TestCase):
     """Test cases for the threedify pipeline."""
+    @classmethod
+    def setUpClass(cls):
+        """Create the shared test image once for the whole class."""
+        cls.test_dir = tempfile.mkdtemp()
+        cls.test_image_path = os.path.join(cls.test_dir, "test_image.jpg")
+        cls._create_test_image(cls.test_image_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared test directory."""
+        shutil.rmtree(cls.test_dir, ignore_errors=True)
+
     def setUp(self):
         """Set up test environment."""
-        self.test_dir = tempfile.mkdtemp()
-        self.test_image_path = os.path.join(self.test_dir, "test_image.jpg")
-        self._create_test_image(self.test_image_path)
         self.pipeline = Pipeline()
     
-    def _create_test_image(self, path):
+    @staticmethod
+    def _create_test_image(path):
         """Create a simple test image."""
         size = 256
-        img = Image.new('RGB', (size, size), color='white')
-        pixels = img.load()
-        
-        for i in range(size):
-            for j in range(size):
-                if (i // 32 + j // 32) % 2 == 0:
-                    pixels[i, j] = (0, 0, 0)
-        img.save(path)
+        cells = np.arange(size) // 32
+        black = (cells[:, None] + cells[None, :]) % 2 == 0
+        pixels = np.full((size, size, 3), 255, dtype=np.uint8)
+        pixels[black] = 0
+        Image.fromarray(pixels, 'RGB').save(path)
     
     def test_load_image(self):
         """Test loading an image into the pipeline."""
@@ -61,26 +68,13 @@ class TestPipeline(unittest.TestCase):
             
         except Exception as e:
             print(f"Skipping full pipeline test due to API error: {str(e)}")
-    
-    def tearDown(self):
-        """Clean up after tests."""
-        if os.path.exists(self.test_image_path):
-            os.unlink(self.test_image_path)
-        for file in os.listdir(self.test_dir):
-            try:
-                os.unlink(os.path.join(self.test_dir, file))
-            except:
-                pass
-        try:
-            os.rmdir(self.test_dir)
-        except:
-            pass
 
 if __name__ == '__main__':
     # unittest.main()
+    TestPipeline.setUpClass()
     test = TestPipeline()
     test.setUp()
     test.test_load_image()
     test.test_process_image()
     test.test_full_pipeline()
-    test.tearDown()
\ No newline at end of file
+    TestPipeline.tearDownClass()
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""Tests for voxel downsampling in the point cloud processor.
+"""
+
+import unittest
+import numpy as np
+
+from threedify.processing.point_cloud import PointCloudProcessor
+
+class TestDownsample(unittest.TestCase):
+    """Test cases for PointCloudProcessor._downsample."""
+    def setUp(self):
+        """Set up a processor and a seeded random generator."""
+        self.processor = PointCloudProcessor()
+        self.rng = np.random.default_rng(0)
+
+    def test_uniform_cloud(self):
+        """A uniform cloud lands close to the requested fraction."""
+        points = self.rng.random((100000, 3))
+        colors = self.rng.random((100000, 3))
+        downsampled, downsampled_colors = self.processor._downsample(points, colors, 0.5)
+        self.assertLess(abs(np.log(len(downsampled) / 50000)), 0.1)
+        self.assertEqual(len(downsampled_colors), len(downsampled))
+
+    def test_clustered_cloud(self):
+        """A dense cluster plus sparse outliers neither diverges nor collapses to one point."""
+        points = np.vstack([self.rng.random((99000, 3)) * 0.01,
+                            self.rng.random((1000, 3)) * 1000])
+        downsampled, _ = self.processor._downsample(points, None, 0.5)
+        # Every grid coarser than the cluster keeps about the 1000 outliers
+        self.assertGreater(len(downsampled), 1001)
+        self.assertLessEqual(len(downsampled), 50000 * 1.1)
+        self.assertTrue(np.isfinite(downsampled).all())
+
+class TestEstimateNormals(unittest.TestCase):
+    """Test cases for PointCloudProcessor._estimate_normals."""
+    def test_georeferenced_plane(self):
+        """A gently sloped plane far from the origin keeps near-vertical normals."""
+        xy = np.random.default_rng(0).random((20000, 2)) * 100
+        points = np.c_[xy, 0.05 * xy[:, 0]] + (512345.0, 5801234.0, 100.0)
+        normals = PointCloudProcessor()._estimate_normals(points)
+        self.assertGreater(np.abs(normals[:, 2]).mean(), 0.99)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""Tests for vector simplification in the vector processor.
+"""
+
+import unittest
+
+from threedify.processing.vector import VectorProcessor, ProcessedVector
+
+try:
+    import shapely
+except ImportError:
+    shapely = None
+
+try:
+    import geopandas
+except ImportError:
+    geopandas = None
+
+try:
+    import pyogrio
+except ImportError:
+    pyogrio = None
+
+@unittest.skipUnless(shapely is not None, "shapely is not installed")
+class TestVectorProcessor(unittest.TestCase):
+    """Test cases for VectorProcessor.process."""
+    def setUp(self):
+        """Set up a processor and a densely sampled polygon."""
+        self.processor = VectorProcessor()
+        self.polygon = shapely.Point(0, 0).buffer(1, quad_segs=256)
+
+    def _vector_data(self):
+        """Build loader output with the polygon as ragged arrays."""
+        from threedify.data.loaders import VectorData
+        geometry_type, coords, offsets = shapely.to_ragged_array([self.polygon, self.polygon])
+        return VectorData({"type": "vector", "geometry_type": geometry_type.name},
+                          coords=coords, offsets=offsets)
+
+    def test_polygon(self):
+        """A shapely Polygon is kept as is, or simplified, without probing .coords."""
+        result = self.processor.process(self.polygon)
+        self.assertIsInstance(result, ProcessedVector)
+        self.assertFalse(result.simplified)
+        self.assertIs(result.vector, self.polygon)
+        self.assertIsNone(result.geometries)
+        result = self.processor.process(self.polygon, simplify=0.01)
+        self.assertTrue(result.simplified)
+        self.assertIs(result.vector, self.polygon)
+        self.assertTrue(result.geometries.is_valid)
+        self.assertLess(shapely.get_num_coordinates(result.geometries),
+                        shapely.get_num_coordinates(self.polygon))
+
+    def test_vector_data(self):
+        """Loader output keeps its description dict as .vector either way."""
+        data = self._vector_data()
+        result = self.processor.process(data)
+        self.assertFalse(result.simplified)
+        self.assertIs(result.vector, data.vector)
+        self.assertIsNone(result.geometries)
+        result = self.processor.process(data, simplify=0.01)
+        self.assertTrue(result.simplified)
+        self.assertIs(result.vector, data.vector)
+        self.assertLess(len(result.geometries.coords), len(data.coords))
+        geometries = shapely.from_ragged_array(
+            shapely.GeometryType[result.geometries.vector["geometry_type"]],
+            result.geometries.coords, result.geometries.offsets)
+        self.assertEqual(len(geometries), 2)
+        self.assertTrue(shapely.is_valid(geometries).all())
+
+    @unittest.skipUnless(geopandas is not None, "geopandas is not installed")
+    def test_geodataframe(self):
+        """A GeoDataFrame is simplified per geometry and stays a GeoDataFrame."""
+        frame = geopandas.GeoDataFrame({"name": ["a"]}, geometry=[self.polygon])
+        result = self.processor.process(frame)
+        self.assertFalse(result.simplified)
+        self.assertIs(result.vector, frame)
+        result = self.processor.process(frame, simplify=0.01)
+        self.assertTrue(result.simplified)
+        self.assertIsInstance(result.geometries, geopandas.GeoDataFrame)
+        self.assertEqual(list(result.geometries["name"]), ["a"])
+        self.assertLess(shapely.get_num_coordinates(result.geometries.geometry.iloc[0]),
+                        shapely.get_num_coordinates(self.polygon))
+
+@unittest.skipUnless(shapely is not None and pyogrio is not None, "shapely and pyogrio are required")
+class TestVectorLoader(unittest.TestCase):
+    """Test cases for VectorLoader.load."""
+    def test_mixed_geometry_types(self):
+        """A layer mixing points and polygons keeps its geometries instead of failing."""
+        import json
+        import tempfile
+        from pathlib import Path
+        from threedify.data.loaders import VectorLoader
+        polygon = shapely.Point(0, 0).buffer(1, quad_segs=64)
+        collection = {"type": "FeatureCollection", "features": [
+            {"type": "Feature", "properties": {"name": "a"},
+             "geometry": shapely.geometry.mapping(shapely.Point(5, 5))},
+            {"type": "Feature", "properties": {"name": "b"},
+             "geometry": shapely.geometry.mapping(polygon)},
+        ]}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "mixed.geojson"
+            path.write_text(json.dumps(collection))
+            data = VectorLoader().load(path)
+        self.assertIsNone(data.coords)
+        self.assertIsNone(data.vector["geometry_type"])
+        self.assertEqual(list(shapely.get_type_id(data.geometries)), [0, 3])
+        self.assertEqual(list(data.attributes["name"]), ["a", "b"])
+        result = VectorProcessor().process(data, simplify=0.01)
+        self.assertTrue(result.simplified)
+        self.assertLess(shapely.get_num_coordinates(result.geometries.geometries[1]),
+                        shapely.get_num_coordinates(polygon))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,7 @@
 A comprehensive Python library for processing geospatial data (some LiDAR and satellite images)
 into 3D models for flood risk analysis and digital twin applications.(or at least that's what i will try and do)
 """
-__version__ = "0.1.0"
-
-from threedify.core.pipeline import Pipeline
-from threedify.visualization.jupyter import init_notebook
+from threedify._version import __version__
 
 def create_pipeline(config=None, verbose=True):
     """Create a new processing pipeline with optional configuration.
@@ -28,6 +25,19 @@ def load_example_data(example_name="sample_lidar"):
     from threedify.data.loaders import load_example
     return load_example(example_name)
 
+def __getattr__(name):
+    """Lazily import the heavier public names on first access (PEP 562)."""
+    if name == "Pipeline":
+        from threedify.core.pipeline import Pipeline
+        return Pipeline
+    if name == "init_notebook":
+        from threedify.visualization.jupyter import init_notebook
+        return init_notebook
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 __all__ = [
     "create_pipeline",
     "load_example_data",
@@ -0,0 +1,19 @@
+"""Logging setup shared by the pipeline and the command-line interface.
+"""
+import logging
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+_LOGGING_CONFIGURED = False
+
+def configure_logging(verbose: bool):
+    """Configure the root logger once, then only adjust its level.
+    Args:
+        verbose (bool): Log at INFO level if True, otherwise WARNING
+    """
+    global _LOGGING_CONFIGURED
+    level = logging.INFO if verbose else logging.WARNING
+    if not _LOGGING_CONFIGURED:
+        logging.basicConfig(level=level, format=LOG_FORMAT)
+        _LOGGING_CONFIGURED = True
+    else:
+        logging.getLogger().setLevel(level)
@@ -0,0 +1,4 @@
+"""Version information for 3Dify.
+Kept in a leaf module so it can be read without importing the package API.
+"""
+__version__ = "0.1.0"
@@ -1,17 +1,21 @@
 """Command-line interface for the 3Dify package.
 """
 import argparse
+import os
 import sys      
 import logging
 from pathlib import Path
 
-from threedify.core.pipeline import Pipeline
-from threedify import __version__
-
 logger = logging.getLogger(__name__)
 
-def parse_args():
-    """Parse command-line arguments."""
+_PARSER = None
+
+def _get_parser():
+    """Build the argument parser on first use and reuse it afterwards."""
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
+    from threedify._version import __version__
     parser = argparse.ArgumentParser(
         description="3Dify CLI",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter
@@ -90,15 +94,20 @@ def parse_args():
         action="store_true",
         help="Optimize the output mesh (reduce faces, optimize UVs)"
     )
-    return parser.parse_args()
+    _PARSER = parser
+    return parser
+
+def parse_args(argv=None):
+    """Parse command-line arguments.
+    Args:
+        argv (list, optional): Arguments to parse, defaults to sys.argv[1:]
+    """
+    return _get_parser().parse_args(argv)
 
 def setup_logging(verbose):
     """Set up logging configuration."""
-    level = logging.INFO if verbose else logging.WARNING
-    logging.basicConfig(
-        level=level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-    )
+    from threedify._logging import configure_logging
+    configure_logging(verbose)
 
 def create_config_from_args(args):
     """Create a configuration dictionary from command-line arguments."""
@@ -121,12 +130,18 @@ def create_config_from_args(args):
 
 def main():
     """Main entry point for the CLI."""
+    # Answer --version without building the parser or importing the pipeline
+    if len(sys.argv) == 2 and sys.argv[1] == "--version":
+        from threedify._version import __version__
+        print(f"{os.path.basename(sys.argv[0])} {__version__}")
+        return 0
     args = parse_args()
     setup_logging(args.verbose)  
     try:
+        from threedify.core.pipeline import Pipeline
         # Create the pipeline
         config = create_config_from_args(args)
-        pipeline = Pipeline(config)
+        pipeline = Pipeline(config, verbose=args.verbose)
         pipeline.run_pipeline(
             data_path=args.input,
             output_path=args.output,
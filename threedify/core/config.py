@@ -7,6 +7,15 @@ import json
 from typing import Dict, Optional, Any, Union
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Directories Config.save() has already created in this process
+_KNOWN_DIRS = set()
+_MISSING = object()
+
 DEFAULT_CONFIG = {
     "general": {
         "verbose": True,
@@ -44,15 +53,30 @@ DEFAULT_CONFIG = {
 
 }
 
+def _copy_tree(tree: Dict) -> Dict:
+    """Copy a nested configuration dictionary.
+    Only the dict levels are copied. The default leaves are immutable scalars,
+    so this is enough to stop instances sharing state and is much cheaper
+    than ``copy.deepcopy``.
+    Args:
+        tree (dict): Nested dictionary to copy
+    Returns:
+        dict: Copy with no dict shared with the original
+    """
+    return {key: _copy_tree(value) if isinstance(value, dict) else value
+            for key, value in tree.items()}
+
 class Config:
     """Configuration manager for the pipeline."""   
+    __slots__ = ("_config",)
+
     def __init__(self, config_dict: Optional[Dict] = None, config_path: Optional[Union[str, Path]] = None):
         """Initialize the configuration with default values and optional overrides.
         Args:
             config_dict (dict, optional): Configuration dictionary to override defaults
             config_path (str or Path, optional): Path to a JSON configuration file 
         """
-        self._config = DEFAULT_CONFIG.copy()
+        self._config = _copy_tree(DEFAULT_CONFIG)
         if config_path:
             self._load_from_file(config_path)
         if config_dict:
@@ -66,24 +90,32 @@ class Config:
         config_path = Path(config_path)
         if not config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        with open(config_path, 'r') as f:
-            try:
-                file_config = json.load(f)
-                self._update_recursive(self._config, file_config)
-            except json.JSONDecodeError:
-                raise ValueError(f"Invalid JSON format in configuration file: {config_path}")
+        raw = config_path.read_bytes()
+        try:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError
+            file_config = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except json.JSONDecodeError:
+            raise ValueError(f"Invalid JSON format in configuration file: {config_path}")
+        self._update_recursive(self._config, file_config)
     
-    def _update_recursive(self, target: Dict, source: Dict):
+    @staticmethod
+    def _update_recursive(target: Dict, source: Dict):
         """Recursively update the target dictionary with values from the source dictionary.
+        Nested levels are walked with an explicit stack, so deep configs cannot hit
+        the recursion limit.
         Args:
             target (dict): Target dictionary to be updated
             source (dict): Source dictionary with new values
         """
-        for key, value in source.items():
-            if isinstance(value, dict) and key in target and isinstance(target[key], dict):
-                self._update_recursive(target[key], value)
-            else:
-                target[key] = value
+        stack = [(target, source)]
+        while stack:
+            target, source = stack.pop()
+            for key, value in source.items():
+                current = target.get(key)
+                if isinstance(value, dict) and isinstance(current, dict):
+                    stack.append((current, value))
+                else:
+                    target[key] = value
 
     def get(self, *keys, default=None):
         """Get a configuration value by keys.
@@ -93,11 +125,13 @@ class Config:
         Returns:
             The configuration value or default if not found
         """
+        # Walk the live dict: sections handed out by get() or [] may be mutated in place
         value = self._config
         for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
+            if not isinstance(value, dict):
+                return default
+            value = value.get(key, _MISSING)
+            if value is _MISSING:
                 return default
         return value
 
@@ -127,7 +161,9 @@ class Config:
             self: For method chaining
         """
         config_path = Path(config_path)
-        os.makedirs(config_path.parent, exist_ok=True)
+        if config_path.parent not in _KNOWN_DIRS:
+            os.makedirs(config_path.parent, exist_ok=True)
+            _KNOWN_DIRS.add(config_path.parent)
         with open(config_path, 'w') as f:
             json.dump(self._config, f, indent=4)
         return self
@@ -1,33 +1,71 @@
 """Core pipeline implementation for 3dify.
 This module provides the main processing pipeline for converting geospatial data to 3D models.
 """
+from __future__ import annotations
+
 import os
 import shutil
 import logging
-from typing import Dict, List, Union, Optional, Any
+from functools import lru_cache
+from typing import TYPE_CHECKING
 from pathlib import Path
-import numpy as np
 
-from threedify.core.config import Config
-from threedify.data.loaders import get_loader
-from threedify.models.utils import get_model
-from threedify.processing.utils import get_processor
-from threedify.export import get_exporter
-from threedify.visualization.utils import get_visualizer
+if TYPE_CHECKING:
+    from typing import Dict, Optional, Union
 
 logger = logging.getLogger(__name__)
 
+_EXT_TO_TYPE = {
+    '.las': 'lidar', '.laz': 'lidar',
+    '.tif': 'raster', '.tiff': 'raster', '.jpg': 'raster', '.jpeg': 'raster', '.png': 'raster',
+    '.shp': 'vector', '.geojson': 'vector',
+    '.csv': 'tabular', '.txt': 'tabular',
+}
+
+# Registry lookups are memoized so batch runs resolve each component once.
+# Components registered under an already-resolved name after first use are
+# picked up only after calling ``cache_clear()`` on the matching helper.
+@lru_cache(maxsize=None)
+def _cached_loader(data_type: str):
+    from threedify.data.loaders import get_loader
+    return get_loader(data_type)
+
+@lru_cache(maxsize=None)
+def _cached_processor(processor_type: str):
+    from threedify.processing.utils import get_processor
+    return get_processor(processor_type)
+
+@lru_cache(maxsize=None)
+def _cached_model(model_type: str):
+    from threedify.models.utils import get_model
+    return get_model(model_type)
+
+@lru_cache(maxsize=None)
+def _cached_exporter(format_type: str):
+    from threedify.export import get_exporter
+    return get_exporter(format_type)
+
+@lru_cache(maxsize=None)
+def _cached_visualizer(visualization_type: str):
+    from threedify.visualization.utils import get_visualizer
+    return get_visualizer(visualization_type)
+
 class Pipeline:
     """Main processing pipeline for converting geospatial data to 3D models.
     This class manages the entire workflow, including loading data, processing it,
     and exporting the final 3D model.
     """
+    __slots__ = ("config", "verbose", "_loader", "_model", "_processor", "_exporter",
+                 "_visualizer", "_known_dirs", "data_path", "data", "processed_data",
+                 "model_data", "model_data_path", "download_path", "results")
+
     def __init__(self, config: Optional[Dict] = None, verbose: bool = True):
         """Initialize the pipeline with a configuration dictionary.
         Args:
             config (dict, optional): Configuration parameters for the pipeline
             verbose (bool): Whether to display verbose output
         """
+        from threedify.core.config import Config
         self.config = Config(config)
         self.verbose = verbose
         self._setup_logging()
@@ -39,17 +77,25 @@ class Pipeline:
         self._visualizer = None
         self.data_path = None
         self.results = {} # Store results heeere
+        self._known_dirs = set()  # output directories already created
         if self.verbose:
             logger.info("Pipeline initialized with configuration: %s", self.config)
     
     def _setup_logging(self):
         """Set up logging configuration."""
-        level = logging.INFO if self.verbose else logging.WARNING
-        logging.basicConfig(
-            level=level,
-            format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        )
+        from threedify._logging import configure_logging
+        configure_logging(self.verbose)
     
+    def _ensure_dir(self, directory: str):
+        """Create a directory once per pipeline, skipping the syscall on repeats.
+        Args:
+            directory (str): Directory to create, empty for the working directory
+        """
+        if not directory or directory in self._known_dirs:
+            return
+        os.makedirs(directory, exist_ok=True)
+        self._known_dirs.add(directory)
+
     def load(self, data_path: Union[str, Path], data_type: Optional[str] = None, **kwargs):
         """Load input data.
         Args:
@@ -63,7 +109,7 @@ class Pipeline:
         if data_type is None:
             data_type = self._infer_data_type(data_path)
             logger.info("Inferred data type: %s", data_type)
-        self._loader = get_loader(data_type)
+        self._loader = _cached_loader(data_type)
         if self.verbose:
             logger.info("Loading data from %s of type %s", data_path, data_type)
         self.data = self._loader.load(data_path, **kwargs)
@@ -83,7 +129,7 @@ class Pipeline:
             raise ValueError("No data loaded. Please call load() first.")
         if processor_type is None:
             processor_type = self._infer_processor_type()
-        self._processor = get_processor(processor_type)
+        self._processor = _cached_processor(processor_type)
         if self.verbose:
             logger.info("Processing data with %s processor", processor_type)
         self.processed_data = self._processor.process(self.data, **kwargs)
@@ -102,7 +148,7 @@ class Pipeline:
         """
         if not hasattr(self, 'processed_data'):
             raise ValueError("No processed data available. Please call process() first.")
-        self._model = get_model(model_type)
+        self._model = _cached_model(model_type)
         if self.verbose:
             logger.info("Generating 3d model using %s", model_type)
         self.model_data_path, self.download_path = self._model.generate(self.data_path, **kwargs)
@@ -122,9 +168,9 @@ class Pipeline:
         """
         if not self.model_data_path:
             raise ValueError("No model data available. Please call generate_model() first.")
-        output_path = Path(output_path)
-        os.makedirs(output_path.parent, exist_ok=True)
-        self._exporter = get_exporter(format_type)
+        output_path = os.fspath(output_path)
+        self._ensure_dir(os.path.dirname(output_path))
+        self._exporter = _cached_exporter(format_type)
         if self.verbose:
             logger.info("Exporting model to %s format at %s", format_type, output_path)
         # exporter_path = self._exporter.export(self.model_data, output_path, **kwargs)
@@ -144,7 +190,7 @@ class Pipeline:
         """
         if not hasattr(self, 'model_data'):
             raise ValueError("No model data available. Please call generate_model() first.")
-        self._visualizer = get_visualizer(visualization_type)
+        self._visualizer = _cached_visualizer(visualization_type)
         if self.verbose:
             logger.info("Visualizing model using %s", visualization_type)
         visualization = self._visualizer.visualize(self.model_data, **kwargs)
@@ -153,33 +199,31 @@ class Pipeline:
     def _infer_data_type(self, data_path: Union[str, Path]) -> str:
         """Infer the data type based on the file extension.
         Args:
-            data_path (Path): Path to the data file
+            data_path (str or Path): Path to the data file
         Returns:
             str: Inferred data type
         """
-        extension = data_path.suffix.lower()
-        if extension in ['.las', '.laz']:
-            return 'lidar'
-        elif extension in ['.tif', '.tiff', '.jpg', '.jpeg', '.png']:
-            return 'raster'
-        elif extension in ['.shp', '.geojson']:
-            return 'vector'
-        elif extension in ['.csv', '.txt']:
-            return 'tabular'
-        else:
+        extension = os.path.splitext(os.fspath(data_path))[1].lower()
+        data_type = _EXT_TO_TYPE.get(extension)
+        if data_type is None:
             raise ValueError(f"Unsupported data type for file: {data_path}. Supported types are: lidar, raster, vector, tabular.")
+        return data_type
     
-    def _infer_processor_type(self) -> str:
+    def _infer_processor_type(self, data=None) -> str:
         """Infer the processor type based on the loaded data.
+        Args:
+            data (optional): Data to inspect, defaults to the loaded data
         Returns:
             str: Inferred processor type
         """
-        if hasattr(self, 'data'):
-            if hasattr(self.data, 'point_cloud'):
+        if data is None:
+            data = getattr(self, 'data', None)
+        if data is not None:
+            if hasattr(data, 'point_cloud'):
                 return 'point_cloud'
-            elif hasattr(self.data, 'raster'):
+            elif hasattr(data, 'raster'):
                 return 'raster'
-            elif hasattr(self.data, 'vector'):
+            elif hasattr(data, 'vector'):
                 return 'vector'
         
         return 'general'
@@ -197,9 +241,27 @@ class Pipeline:
         Returns:
             self: Pipeline instance for method chaining
         """
-        return (self
-            .load(data_path, data_type, **kwargs.get('load_kwargs', {}))
-            .process(processor_type, **kwargs.get('process_kwargs', {}))
-            .generate_model(model_type, **kwargs.get('model_kwargs', {}))
-            .export(output_path, format_type, **kwargs.get('export_kwargs', {}))
-        )
\ No newline at end of file
+        # Same stages as load().process().generate_model().export(), but each stage
+        # feeds the next directly, so the "previous stage ran" guards are skipped.
+        self.data_path = Path(data_path)
+        if data_type is None:
+            data_type = self._infer_data_type(data_path)
+            logger.info("Inferred data type: %s", data_type)
+        self._loader = _cached_loader(data_type)
+        self.data = self._loader.load(data_path, **kwargs.get('load_kwargs', {}))
+        if processor_type is None:
+            processor_type = self._infer_processor_type(self.data)
+        self._processor = _cached_processor(processor_type)
+        self.processed_data = self._processor.process(self.data, **kwargs.get('process_kwargs', {}))
+        self.results['processed_data'] = self.processed_data
+        self._model = _cached_model(model_type)
+        self.model_data_path, self.download_path = self._model.generate(
+            self.data_path, **kwargs.get('model_kwargs', {}))
+        self.results['model_data_path'] = self.model_data_path
+        output_path = os.fspath(output_path)
+        self._ensure_dir(os.path.dirname(output_path))
+        self._exporter = _cached_exporter(format_type)
+        self.results['exporter_path'] = shutil.copy(self.model_data_path, output_path)
+        if self.verbose:
+            logger.info("Pipeline run complete, model exported to %s", self.results['exporter_path'])
+        return self
\ No newline at end of file
@@ -1,6 +1,11 @@
 """Data handling modules for 3Dify.
 """
 
-from threedify.data.loaders import get_loader, register_loader
+def __getattr__(name):
+    """Lazily import the loader registry on first access (PEP 562)."""
+    if name in ("get_loader", "register_loader", "load_cached"):
+        from threedify.data import loaders
+        return getattr(loaders, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ["get_loader", "register_loader"]
\ No newline at end of file
+__all__ = ["get_loader", "register_loader", "load_cached"]
\ No newline at end of file
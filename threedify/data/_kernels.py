@@ -0,0 +1,45 @@
+"""Compiled kernels for the data loaders.
+numba is optional; without it the helpers fall back to plain NumPy.
+"""
+
+from functools import lru_cache
+import numpy as np
+
+# Below this many elements NumPy's single pass beats waking numba's thread pool
+_PARALLEL_MIN_SIZE = 1 << 20
+
+@lru_cache(maxsize=None)
+def _scale_flat():
+    """Compile the parallel in-place scaling kernel on first use.
+    numba takes a noticeable time to import, so loaders that never see a large
+    array do not pay for it.
+    Returns:
+        The njit kernel, or None if numba is not installed
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def scale_flat(flat, factor):
+        for i in numba.prange(flat.size):
+            flat[i] *= factor
+    return scale_flat
+
+def normalize_inplace(arr: np.ndarray) -> np.ndarray:
+    """Scale a float array in place so that its maximum becomes 1.
+    Args:
+        arr (np.ndarray): Float array to normalize
+    Returns:
+        np.ndarray: The same array
+    """
+    max_value = arr.max() if arr.size else 0
+    if max_value > 0:
+        factor = arr.dtype.type(1.0 / max_value)
+        kernel = _scale_flat() if arr.size >= _PARALLEL_MIN_SIZE and arr.flags.c_contiguous else None
+        if kernel is not None:
+            kernel(arr.reshape(-1), factor)
+        else:
+            arr *= factor
+    return arr
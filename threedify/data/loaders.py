@@ -2,13 +2,131 @@
 """
 
 import os
+import importlib.util
 import logging
-from typing import Dict, Union, Optional, Any
+import queue
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Iterator, Union, Optional, Any
 from pathlib import Path
 import numpy as np
 
+from threedify.data._kernels import normalize_inplace
+
 logger = logging.getLogger(__name__)
 
+_END_OF_STREAM = object()
+
+# LAS stores RGB and intensity as 16-bit unsigned integers
+_UINT16_SCALE = np.float32(1.0 / 65535.0)
+
+# Optional dependencies are imported on first use and memoized, so repeated loads skip
+# the import machinery while a missing package still only fails the loader needing it
+@lru_cache(maxsize=None)
+def _laspy():
+    import laspy
+    return laspy
+
+@lru_cache(maxsize=None)
+def _pil_image():
+    from PIL import Image
+    return Image
+
+@lru_cache(maxsize=None)
+def _pandas():
+    import pandas as pd
+    return pd
+
+@lru_cache(maxsize=None)
+def _arrow_dtypes_available() -> bool:
+    """Whether pandas can return Arrow-backed columns (pandas >= 2.0 with pyarrow)."""
+    if int(_pandas().__version__.split('.')[0]) < 2:
+        return False
+    return importlib.util.find_spec('pyarrow') is not None
+
+class LidarData:
+    """Loaded LiDAR points as parallel per-point arrays."""
+    __slots__ = ("point_cloud", "colors", "intensity", "classification", "header", "path",
+                 "normals")
+    type = 'lidar'
+
+    def __init__(self, point_cloud, colors, intensity, classification, header=None, path=None,
+                 normals=None):
+        """Initialize the LiDAR data.
+        Args:
+            point_cloud (np.ndarray): (N, 3) point coordinates
+            colors (np.ndarray): (N, 3) colors in [0, 1]
+            intensity (np.ndarray): (N,) intensities in [0, 1]
+            classification (np.ndarray): (N,) uint8 classification codes
+            header: laspy header of the source file, if any
+            path (str or Path): Source file path, if any
+            normals (np.ndarray): (N, 3) float32 normals, if the file stores them
+        """
+        self.point_cloud = point_cloud
+        self.colors = colors
+        self.intensity = intensity
+        self.classification = classification
+        self.header = header
+        self.path = path
+        self.normals = normals
+
+class ImageData:
+    """Loaded image with its pixel array and metadata."""
+    __slots__ = ("image", "array", "metadata", "path")
+    type = 'image'
+
+    def __init__(self, image, array, metadata, path=None):
+        """Initialize the image data.
+        Args:
+            image (PIL.Image.Image): Loaded image
+            array (np.ndarray): Pixel array of the image
+            metadata (dict): Width, height, mode and format of the image
+            path (str or Path): Source file path, if any
+        """
+        self.image = image
+        self.array = array
+        self.metadata = metadata
+        self.path = path
+
+class VectorData:
+    """Loaded vector features, with geometries as flat coordinate and offset arrays."""
+    __slots__ = ("vector", "path", "coords", "offsets", "attributes", "geometries")
+    type = 'vector'
+
+    def __init__(self, vector, path=None, coords=None, offsets=None, attributes=None,
+                 geometries=None):
+        """Initialize the vector data.
+        Args:
+            vector (dict): Description of the dataset (path, crs, geometry type)
+            path (str or Path): Source file path, if any
+            coords (np.ndarray): (N, 2) or (N, 3) vertex coordinates of all geometries
+            offsets (tuple): Offset arrays as returned by shapely.to_ragged_array,
+                innermost (into coords) first and per-feature offsets last
+            attributes (pandas.DataFrame): Attribute table, one row per feature
+            geometries (np.ndarray): Shapely geometries, kept instead of coords and
+                offsets when the features mix geometry types
+        """
+        self.vector = vector
+        self.path = path
+        self.coords = coords
+        self.offsets = offsets
+        self.attributes = attributes
+        self.geometries = geometries
+
+class TabularData:
+    """Loaded tabular data."""
+    __slots__ = ("dataframe", "path")
+    type = 'tabular'
+
+    def __init__(self, dataframe, path=None):
+        """Initialize the tabular data.
+        Args:
+            dataframe (pandas.DataFrame): Loaded table
+            path (str or Path): Source file path, if any
+        """
+        self.dataframe = dataframe
+        self.path = path
+
 class BaseLoader:
     """Base class for data loaders."""
     def __init__(self):
@@ -24,6 +142,19 @@ class BaseLoader:
             Loaded data
         """
         raise NotImplementedError("Subclasses must implement load()")
+
+    def iter_load(self, path: Union[str, Path], chunk_size: Optional[int] = None,
+                  **kwargs) -> Iterator[Any]:
+        """Stream data from the given path in chunks.
+        Loaders without a chunked reader yield the whole file as a single chunk.
+        Args:
+            path (str or Path): Path to the data file
+            chunk_size (int, optional): Loader-specific chunk size
+            **kwargs: Additional loader-specific parameters
+        Yields:
+            Loaded data for each chunk
+        """
+        yield self.load(path, **kwargs)
     
     @property
     def name(self) -> str:
@@ -33,6 +164,20 @@ class BaseLoader:
         """
         raise NotImplementedError("Subclasses must implement name property")
 
+def _coordinate_dtype(header) -> type:
+    """Pick the narrowest float dtype that still resolves the LAS coordinate scale.
+    float32 halves memory traffic, but georeferenced coordinates (e.g. UTM northings)
+    are too large for it to keep centimetre precision, so those stay float64.
+    Args:
+        header: laspy header carrying mins, maxs and scales
+    Returns:
+        type: np.float32 or np.float64
+    """
+    extent = float(np.max(np.abs(np.concatenate((header.mins, header.maxs)))))
+    if np.spacing(np.float32(extent)) <= float(np.min(header.scales)):
+        return np.float32
+    return np.float64
+
 class LidarLoader(BaseLoader):
     """Loader for LiDAR data (LAS/LAZ files)."""
     def load(self, path: Union[str, Path], **kwargs) -> Any:
@@ -40,47 +185,148 @@ class LidarLoader(BaseLoader):
         Args:
             path (str or Path): Path to the LAS/LAZ file
             **kwargs: Additional loader-specific parameters   
+                - laz_backend (laspy.LazBackend): LAZ decompressor to use. By default laspy
+                  picks the first available one, which is lazrs' chunk-parallel decoder
+                  when lazrs is installed
+                - normalize (str): How colors and intensity are scaled to [0, 1].
+                  'range' (default) divides by the 16-bit range the LAS format defines;
+                  'max' divides by the largest value in the data, for files that store
+                  8-bit colors
         Returns:
             Loaded LiDAR data
         """
-        import laspy
+        laspy = _laspy()
         logger.info(f"Loading LiDAR data from {path}")
     
         try:
-            las_file = laspy.read(path)
-            point_cloud = np.vstack((las_file.x, las_file.y, las_file.z)).transpose()
-
-            if hasattr(las_file, 'red') and hasattr(las_file, 'green') and hasattr(las_file, 'blue'):
-                colors = np.vstack((las_file.red, las_file.green, las_file.blue)).transpose()
-                colors = colors / np.max(colors)
-            else:
-                colors = np.ones((point_cloud.shape[0], 3)) * 0.7
-            if hasattr(las_file, 'intensity'):
-                intensity = las_file.intensity
-                intensity = intensity / np.max(intensity)
-            else:
-                intensity = np.ones(point_cloud.shape[0])
-            
-            if hasattr(las_file, 'classification'):
-                classification = las_file.classification
-            else:
-                classification = np.zeros(point_cloud.shape[0], dtype=np.int32)
-            result = type('LidarData', (), {
-                'point_cloud': point_cloud,
-                'colors': colors,
-                'intensity': intensity,
-                'classification': classification,
-                'header': las_file.header,
-                'path': path,
-                'type': 'lidar'
-            }) 
-            logger.info(f"Loaded LiDAR data with {point_cloud.shape[0]} points")
+            las_file = laspy.read(path, laz_backend=kwargs.get('laz_backend'))
+            result = self._build_result(las_file, las_file.header, path,
+                                        normalize=kwargs.get('normalize', 'range'))
+            logger.info(f"Loaded LiDAR data with {result.point_cloud.shape[0]} points")
             return result
             
         except Exception as e:
             logger.error(f"Failed to load LiDAR data: {str(e)}")
             raise
     
+    def iter_load(self, path: Union[str, Path], chunk_size: int = 50_000,
+                  buffer_size: int = 4, **kwargs) -> Iterator[Any]:
+        """Stream LiDAR data from a LAS/LAZ file in chunks.
+        A background thread decodes chunks into a bounded queue, so decompression of
+        later chunks overlaps with the caller's work on earlier ones and at most
+        ``buffer_size`` decoded chunks are held in memory at once.
+        Args:
+            path (str or Path): Path to the LAS/LAZ file
+            chunk_size (int): Number of points per chunk
+            buffer_size (int): Maximum number of decoded chunks waiting in the queue
+            **kwargs: Additional loader-specific parameters
+                - laz_backend (laspy.LazBackend): LAZ decompressor to use
+                - normalize (str): 'range' or 'max', as in load(). With 'max' colors
+                  and intensity are normalized per chunk
+        Yields:
+            LiDAR data for each chunk, with the same attributes as load()
+        """
+        laspy = _laspy()
+        normalize = kwargs.get('normalize', 'range')
+        logger.info(f"Streaming LiDAR data from {path} in chunks of {chunk_size} points")
+        chunks = queue.Queue(maxsize=buffer_size)
+        stop = threading.Event()
+
+        def put(item):
+            # Block while the queue is full, but give up once the consumer has gone away
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def decode():
+            try:
+                with laspy.open(path, laz_backend=kwargs.get('laz_backend')) as reader:
+                    header = reader.header
+                    for points in reader.chunk_iterator(chunk_size):
+                        if not put(self._build_result(points, header, path, normalize=normalize)):
+                            return
+            except Exception as e:
+                put(e)
+                return
+            put(_END_OF_STREAM)
+
+        decoder = threading.Thread(target=decode, name="lidar-decoder", daemon=True)
+        decoder.start()
+        try:
+            while True:
+                item = chunks.get()
+                if item is _END_OF_STREAM:
+                    return
+                if isinstance(item, Exception):
+                    logger.error(f"Failed to stream LiDAR data: {str(item)}")
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            decoder.join()
+
+    def _build_result(self, points, header, path, normalize='range'):
+        """Convert laspy points (a whole file or one chunk) to LiDAR data.
+        Args:
+            points: laspy LasData or point record
+            header: laspy header of the file
+            path (str or Path): Path to the LAS/LAZ file
+            normalize (str): 'range' or 'max' scaling of colors and intensity
+        Returns:
+            LiDAR data
+        """
+        n_points = len(points)
+        # One set lookup per dimension instead of probing laspy's dynamic attributes
+        dims = set(header.point_format.dimension_names)
+        # Fill preallocated (N, 3) buffers column by column: C-contiguous, no (3, N) temporary
+        point_cloud = np.empty((n_points, 3), dtype=_coordinate_dtype(header))
+        point_cloud[:, 0] = points.x
+        point_cloud[:, 1] = points.y
+        point_cloud[:, 2] = points.z
+
+        if {'red', 'green', 'blue'} <= dims:
+            colors = np.empty((n_points, 3), dtype=np.float32)
+            if normalize == 'max':
+                colors[:, 0] = points.red
+                colors[:, 1] = points.green
+                colors[:, 2] = points.blue
+                normalize_inplace(colors)
+            else:
+                # Scale while converting from uint16, no separate pass or max scan
+                np.multiply(points.red, _UINT16_SCALE, out=colors[:, 0])
+                np.multiply(points.green, _UINT16_SCALE, out=colors[:, 1])
+                np.multiply(points.blue, _UINT16_SCALE, out=colors[:, 2])
+        else:
+            colors = np.full((point_cloud.shape[0], 3), 0.7, dtype=np.float32)
+        if 'intensity' in dims:
+            if normalize == 'max':
+                # astype from uint16 returns a fresh buffer, safe to scale in place
+                intensity = normalize_inplace(np.asarray(points.intensity).astype(np.float32))
+            else:
+                intensity = np.multiply(points.intensity, _UINT16_SCALE, dtype=np.float32)
+        else:
+            intensity = np.ones(point_cloud.shape[0], dtype=np.float32)
+        
+        if 'classification' in dims:
+            # laspy already exposes the codes as uint8, so this normally does not copy
+            classification = np.asarray(points.classification).astype(np.uint8, copy=False)
+        else:
+            classification = np.zeros(point_cloud.shape[0], dtype=np.uint8)
+
+        normals = None
+        if {'NormalX', 'NormalY', 'NormalZ'} <= dims:
+            # Same contiguous (N, 3) float32 layout renderers upload directly
+            normals = np.empty((n_points, 3), dtype=np.float32)
+            normals[:, 0] = points['NormalX']
+            normals[:, 1] = points['NormalY']
+            normals[:, 2] = points['NormalZ']
+        return LidarData(point_cloud, colors, intensity, classification, header=header, path=path,
+                         normals=normals)
+
     @property
     def name(self) -> str:
         """Get the name of the loader.
@@ -96,28 +342,34 @@ class ImageLoader(BaseLoader):
         Args:
             path (str or Path): Path to the image file
             **kwargs: Additional loader-specific parameters 
+                - window (tuple): (left, upper, right, lower) pixel box to load instead
+                  of the whole image. Uncompressed TIFFs are memory-mapped so only the
+                  window's rows are read
         Returns:
             Loaded image data
         """
-        from PIL import Image
-        import numpy as np
+        Image = _pil_image()
+        window = kwargs.get('window')
         logger.info(f"Loading image data from {path}")
         try:
             img = Image.open(path)
-            img_array = np.array(img)
+            image_format = img.format
+            if window is not None:
+                img = self._load_window(img, path, tuple(window))
+            else:
+                img.load()
+            # asarray exports the decoded pixels once instead of np.array's extra copy;
+            # the result is read-only, processors copy it before modifying
+            img_array = np.asarray(img)
             metadata = {
                 'width': img.width,
                 'height': img.height,
                 'mode': img.mode,
-                'format': img.format
+                'format': image_format
             }
-            result = type('ImageData', (), {
-                'image': img,
-                'array': img_array,
-                'metadata': metadata,
-                'path': path,
-                'type': 'image'
-            })
+            if window is not None:
+                metadata['window'] = tuple(window)
+            result = ImageData(img, img_array, metadata, path=path)
             
             logger.info(f"Loaded image data with dimensions {img.width}x{img.height}")
             return result
@@ -125,6 +377,34 @@ class ImageLoader(BaseLoader):
         except Exception as e:
             logger.error(f"Failed to load image data: {str(e)}")
             raise
+
+    def _load_window(self, img, path, window):
+        """Load a rectangular window of an opened image.
+        Args:
+            img (PIL.Image.Image): Opened, not yet decoded image
+            path (str or Path): Path to the image file
+            window (tuple): (left, upper, right, lower) pixel box
+        Returns:
+            PIL.Image.Image: Decoded window
+        """
+        Image = _pil_image()
+        if img.format == 'TIFF':
+            try:
+                import tifffile
+                pixels = tifffile.memmap(os.fspath(path), mode='r')
+                left, upper, right, lower = window
+                region = Image.fromarray(np.ascontiguousarray(pixels[upper:lower, left:right]))
+                img.close()
+                return region
+            except ImportError:
+                pass
+            except (ValueError, TypeError) as e:
+                # Compressed or tiled TIFFs and unusual pixel types cannot be mapped
+                logger.debug(f"Cannot memory-map {path}, decoding with Pillow: {str(e)}")
+        region = img.crop(window)
+        region.load()
+        img.close()
+        return region
     
     @property
     def name(self) -> str:
@@ -140,19 +420,37 @@ class VectorLoader(BaseLoader):
         """Load vector data from a file.
         Args:
             path (str or Path): Path to the vector file
-            **kwargs: Additional loader-specific parameters 
+            **kwargs: Additional loader-specific parameters, passed to pyogrio.read_arrow
         Returns:
             Loaded vector data
         """
         try:
             logger.info(f"Loading vector data from {path}")
             vector_data = {"type": "vector", "path": str(path)}
-            result = type('VectorData', (), {
-                'vector': vector_data,
-                'path': path,
-                'type': 'vector'
-            })
-            logger.info(f"Loaded vector data")
+            try:
+                import pyogrio
+                import shapely
+            except ImportError:
+                logger.warning("pyogrio and shapely are required to read vector geometries, "
+                               "returning the file reference only")
+                return VectorData(vector_data, path=path)
+            meta, table = pyogrio.read_arrow(os.fspath(path), **kwargs)
+            geometry_column = meta['geometry_name'] or 'wkb_geometry'
+            geometries = shapely.from_wkb(table.column(geometry_column).to_numpy(zero_copy_only=False))
+            attributes = table.drop_columns([geometry_column]).to_pandas()
+            try:
+                geometry_type, coords, offsets = shapely.to_ragged_array(geometries)
+            except ValueError:
+                # Ragged arrays hold a single geometry type, so mixed layers keep the geometries
+                vector_data.update({'crs': meta['crs'], 'geometry_type': None})
+                result = VectorData(vector_data, path=path, attributes=attributes, geometries=geometries)
+                n_vertices = int(shapely.get_num_coordinates(geometries).sum())
+            else:
+                vector_data.update({'crs': meta['crs'], 'geometry_type': geometry_type.name})
+                result = VectorData(vector_data, path=path, coords=coords, offsets=offsets,
+                                    attributes=attributes)
+                n_vertices = len(coords)
+            logger.info(f"Loaded vector data with {len(attributes)} features and {n_vertices} vertices")
             return result
         except Exception as e:
             logger.error(f"Failed to load vector data: {str(e)}")
@@ -172,24 +470,98 @@ class TabularLoader(BaseLoader):
         """Load tabular data from a file.
         Args:
             path (str or Path): Path to the tabular file
-            **kwargs: Additional loader-specific parameters
+            **kwargs: Additional loader-specific parameters, passed to pandas.read_csv
+                - chunksize (int): Parse the file in chunks of this many rows and
+                  concatenate them. Use iter_load() to process chunks without ever
+                  holding the whole table
+                - engine (str): 'pyarrow' parses with PyArrow's multithreaded CSV reader,
+                  falling back to pandas' C parser when pyarrow is not installed
+                - dtype_backend (str): Defaults to 'pyarrow' (Arrow-backed columns) when
+                  pandas >= 2.0 and pyarrow are installed
         Returns:
             Loaded tabular data
         """
-        import pandas as pd
+        pd = _pandas()
+        chunksize = kwargs.pop('chunksize', None)
         logger.info(f"Loading tabular data from {path}")
         try:
-            df = pd.read_csv(path, **kwargs)
-            result = type('TabularData', (), {
-                'dataframe': df,
-                'path': path,
-                'type': 'tabular'
-            })
+            if chunksize:
+                chunks = (chunk.dataframe for chunk in self.iter_load(path, chunksize, **kwargs))
+                df = pd.concat(chunks, ignore_index=True)
+            elif kwargs.get('engine') == 'pyarrow':
+                df = self._read_csv_pyarrow(path, **kwargs)
+            else:
+                df = pd.read_csv(path, **self._read_csv_options(path, kwargs))
+            result = TabularData(df, path=path)
             logger.info(f"Loaded tabular data with {len(df)} rows and {len(df.columns)} columns")
             return result
         except Exception as e:
             logger.error(f"Failed to load tabular data: {str(e)}")
             raise
+
+    def iter_load(self, path: Union[str, Path], chunk_size: int = 262_144,
+                  **kwargs) -> Iterator[TabularData]:
+        """Stream tabular data from a file in chunks of rows.
+        Args:
+            path (str or Path): Path to the tabular file
+            chunk_size (int): Number of rows per chunk
+            **kwargs: Additional parameters passed to pandas.read_csv
+        Yields:
+            TabularData: Tabular data for each chunk
+        """
+        pd = _pandas()
+        if kwargs.get('engine') == 'pyarrow':
+            # pandas' pyarrow engine cannot read in chunks
+            logger.debug("Ignoring engine='pyarrow' for chunked reading")
+            kwargs.pop('engine')
+        logger.info(f"Streaming tabular data from {path} in chunks of {chunk_size} rows")
+        with pd.read_csv(path, chunksize=chunk_size, **self._read_csv_options(path, kwargs)) as reader:
+            for df in reader:
+                yield TabularData(df, path=path)
+
+    def _read_csv_pyarrow(self, path, **kwargs):
+        """Read a CSV file with PyArrow's multithreaded reader.
+        Args:
+            path (str or Path): Path to the tabular file
+            **kwargs: Additional parameters passed to pandas.read_csv
+        Returns:
+            pandas.DataFrame: Loaded table
+        """
+        pd = _pandas()
+        try:
+            from pyarrow import csv as pacsv
+        except ImportError:
+            logger.warning("pyarrow not available, falling back to the pandas C parser")
+            kwargs.pop('engine')
+            return pd.read_csv(path, **self._read_csv_options(path, kwargs))
+        options = self._read_csv_options(path, kwargs)
+        if set(options) - {'engine', 'dtype_backend'}:
+            # pandas translates its read_csv options for the pyarrow engine
+            return pd.read_csv(path, **options)
+        read_options = pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+        table = pacsv.read_csv(os.fspath(path), read_options=read_options)
+        if options.get('dtype_backend') == 'pyarrow':
+            return table.to_pandas(types_mapper=pd.ArrowDtype)
+        return table.to_pandas()
+
+    def _read_csv_options(self, path, kwargs):
+        """Merge the caller's pandas.read_csv options over the loader's defaults.
+        Args:
+            path (str or Path): Path to the tabular file
+            kwargs (dict): Caller's pandas.read_csv options
+        Returns:
+            dict: Options to pass to pandas.read_csv
+        """
+        options = {}
+        if _arrow_dtypes_available():
+            options['dtype_backend'] = 'pyarrow'
+        if kwargs.get('engine', 'c') == 'c':
+            # Parse whole columns at once so dtypes are inferred a single time
+            options.update(engine='c', low_memory=False)
+            if isinstance(path, (str, os.PathLike)):
+                options['memory_map'] = True
+        options.update(kwargs)
+        return options
     
     @property
     def name(self) -> str:
@@ -199,12 +571,14 @@ class TabularLoader(BaseLoader):
         """
         return "tabular"
 
-_LOADERS: Dict[str, BaseLoader] = {
-    "lidar": LidarLoader(),
-    "raster": ImageLoader(),
-    "vector": VectorLoader(),
-    "tabular": TabularLoader(),
+# Loaders are instantiated on first request; _LOADERS caches the instances
+_LOADER_FACTORIES: Dict[str, Callable[[], BaseLoader]] = {
+    "lidar": LidarLoader,
+    "raster": ImageLoader,
+    "vector": VectorLoader,
+    "tabular": TabularLoader,
 }
+_LOADERS: Dict[str, BaseLoader] = {}
 
 def get_loader(loader_type: str) -> BaseLoader:
     """Get a loader instance by type.
@@ -215,10 +589,17 @@ def get_loader(loader_type: str) -> BaseLoader:
     Raises:
         ValueError: If the loader type is not registered
     """
-    if loader_type not in _LOADERS:
+    try:
+        return _LOADERS[loader_type]
+    except KeyError:
+        pass
+    try:
+        factory = _LOADER_FACTORIES[loader_type]
+    except KeyError:
+        available = list(dict.fromkeys([*_LOADER_FACTORIES, *_LOADERS]))
         raise ValueError(f"Unknown loader type: {loader_type}. "
-                         f"Available types: {list(_LOADERS.keys())}")
-    return _LOADERS[loader_type]
+                         f"Available types: {available}") from None
+    return _LOADERS.setdefault(loader_type, factory())
 
 def register_loader(loader_type: str, loader_instance: BaseLoader):
     """Register a new loader type.
@@ -230,6 +611,27 @@ def register_loader(loader_type: str, loader_instance: BaseLoader):
     """
     _LOADERS[loader_type] = loader_instance
 
+# Number of recent load_cached() results kept, enough for a tile and its neighbours
+_LOAD_CACHE_SIZE = 8
+
+@lru_cache(maxsize=_LOAD_CACHE_SIZE)
+def _load_cached(loader_type: str, path: str, mtime_ns: int) -> Any:
+    return get_loader(loader_type).load(path)
+
+def load_cached(loader_type: str, path: Union[str, Path]) -> Any:
+    """Load a file with a registered loader, reusing recently loaded results.
+    Results are keyed on the path and modification time, so an edited file is
+    reloaded. Cached results are shared between callers and must not be modified
+    in place.
+    Args:
+        loader_type (str): Type of loader to use
+        path (str or Path): Path to the data file
+    Returns:
+        Loaded data
+    """
+    path = os.fspath(path)
+    return _load_cached(loader_type, path, os.stat(path).st_mtime_ns)
+
 def load_example(example_name: str) -> Any:
     """Load an example dataset.
     Args:
@@ -241,46 +643,30 @@ def load_example(example_name: str) -> Any:
     if example_name == "sample_lidar":
         # Create sample point cloud
         n_points = 1000
-        point_cloud = np.random.randn(n_points, 3)
-        colors = np.random.rand(n_points, 3)
-        intensity = np.random.rand(n_points)
-        classification = np.zeros(n_points, dtype=np.int32)
+        rng = np.random.default_rng()
+        point_cloud = rng.standard_normal((n_points, 3), dtype=np.float32)
+        colors = rng.random((n_points, 3), dtype=np.float32)
+        intensity = rng.random(n_points, dtype=np.float32)
+        classification = np.zeros(n_points, dtype=np.uint8)
         
-        result = type('LidarData', (), {
-            'point_cloud': point_cloud,
-            'colors': colors,
-            'intensity': intensity,
-            'classification': classification,
-            'header': None,
-            'path': None,
-            'type': 'lidar'
-        })
+        result = LidarData(point_cloud, colors, intensity, classification)
         return result
     
     elif example_name == "sample_image":
-        from PIL import Image
-        import numpy as np
+        Image = _pil_image()
         size = 256
-        img = Image.new('RGB', (size, size), color='white')
-        pixels = img.load()
-        for i in range(size):
-            for j in range(size):
-                if (i // 32 + j // 32) % 2 == 0:
-                    pixels[i, j] = (0, 0, 0)
-        img_array = np.array(img)
+        # 32px checkerboard, black where the cell indices sum to an even number
+        ii, jj = np.indices((size, size), dtype=np.int16)
+        white = ((ii >> 5) + (jj >> 5)) & 1
+        img_array = np.repeat(white[..., None] * np.uint8(255), 3, axis=2).astype(np.uint8)
+        img = Image.fromarray(img_array, 'RGB')
         metadata = {
             'width': size,
             'height': size,
             'mode': 'RGB',
             'format': None
         }
-        result = type('ImageData', (), {
-            'image': img,
-            'array': img_array,
-            'metadata': metadata,
-            'path': None,
-            'type': 'image'
-        })
+        result = ImageData(img, img_array, metadata)
         return result
     
     else:
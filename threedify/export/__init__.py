@@ -1,19 +1,23 @@
 """Export modules for 3Dify.
 This module provides functionality for exporting 3D models to various formats.
 """
+from importlib import import_module
 from typing import Dict
 from threedify.export.base import BaseExporter
-from threedify.export.gltf import GLTFExporter
-from threedify.export.citygml import CityGMLExporter
-from threedify.export.obj import OBJExporter
-from threedify.export.ply import PLYExporter
 
-_EXPORTERS: Dict[str, BaseExporter] = {
-    "gltf": GLTFExporter(),
-    "citygml": CityGMLExporter(),
-    "obj": OBJExporter(),
-    "ply": PLYExporter(),
+# Exporter modules are imported and instantiated on first request; _EXPORTERS caches
+# the instances
+_EXPORTER_CLASSES: Dict[str, tuple] = {
+    "gltf": ("threedify.export.gltf", "GLTFExporter"),
+    "citygml": ("threedify.export.citygml", "CityGMLExporter"),
+    "obj": ("threedify.export.obj", "OBJExporter"),
+    "ply": ("threedify.export.ply", "PLYExporter"),
 }
+_EXPORTERS: Dict[str, BaseExporter] = {}
+
+def _exporter_class(module_name: str, class_name: str) -> type:
+    """Import an exporter module and return the exporter class from it."""
+    return getattr(import_module(module_name), class_name)
 
 def get_exporter(export_format: str) -> BaseExporter:
     """Get an exporter instance by format.
@@ -24,10 +28,18 @@ def get_exporter(export_format: str) -> BaseExporter:
     Raises:
         ValueError: If the exporter format is not registered
     """
-    if export_format not in _EXPORTERS:
+    try:
+        return _EXPORTERS[export_format]
+    except KeyError:
+        pass
+    try:
+        module_name, class_name = _EXPORTER_CLASSES[export_format]
+    except KeyError:
+        available = list(dict.fromkeys([*_EXPORTER_CLASSES, *_EXPORTERS]))
         raise ValueError(f"Unknown export format: {export_format}. "
-                         f"Available formats: {list(_EXPORTERS.keys())}")
-    return _EXPORTERS[export_format]
+                         f"Available formats: {available}") from None
+    exporter = _exporter_class(module_name, class_name)()
+    return _EXPORTERS.setdefault(export_format, exporter)
 
 def register_exporter(export_format: str, exporter_instance: BaseExporter):
     """Register a new exporter format.
@@ -39,6 +51,16 @@ def register_exporter(export_format: str, exporter_instance: BaseExporter):
     """
     _EXPORTERS[export_format] = exporter_instance
 
+def __getattr__(name):
+    """Lazily import the exporter classes on first access (PEP 562)."""
+    for module_name, class_name in _EXPORTER_CLASSES.values():
+        if name == class_name:
+            return _exporter_class(module_name, class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 __all__ = [
     "get_exporter", "register_exporter", "BaseExporter",
     "GLTFExporter", "CityGMLExporter", "OBJExporter", "PLYExporter"
@@ -0,0 +1,51 @@
+"""File helpers shared by the exporters.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Set
+
+# Output directories already created by this process; batch exports into one
+# directory then create (stat) it once rather than once per file
+_MADE_DIRS: Set[Path] = set()
+
+def ensure_parent(path: Path):
+    """Create the parent directory of an output file once per process.
+    Args:
+        path (Path): Output file path
+    """
+    parent = path.parent
+    if parent not in _MADE_DIRS:
+        parent.mkdir(parents=True, exist_ok=True)
+        _MADE_DIRS.add(parent)
+
+# Buffer size for the userspace copy fallback
+COPY_BUFSIZE = 1 << 22
+
+def copy_file(src, dst):
+    """Copy a (typically large) model file, kernel-side where the platform allows.
+    Args:
+        src (str or Path): Source file
+        dst (str or Path): Destination file
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if hasattr(os, 'sendfile'):
+            try:
+                size = os.fstat(fsrc.fileno()).st_size
+                offset = 0
+                while offset < size:
+                    sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+                else:
+                    return
+                fsrc.seek(offset)
+                fdst.seek(offset)
+            except OSError:
+                # e.g. file systems that do not support sendfile; restart with a plain copy
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        shutil.copyfileobj(fsrc, fdst, length=COPY_BUFSIZE)
@@ -0,0 +1,288 @@
+"""Vectorized mesh clean-up helpers shared by the mesh exporters.
+"""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from functools import lru_cache
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Below this many faces the NumPy path beats waking numba's thread pool
+_PARALLEL_MIN_FACES = 1 << 16
+
+@lru_cache(maxsize=None)
+def _vertex_normals_kernel():
+    """Compile the parallel vertex normal kernel on first use.
+    Importing numba is slow, so exports of small meshes never load it.
+    Returns:
+        The njit kernel, or None if numba is not installed
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def vertex_normals_kernel(vertices, faces):
+        face_normals = np.empty((faces.shape[0], 3))
+        for i in numba.prange(faces.shape[0]):
+            a, b, c = faces[i, 0], faces[i, 1], faces[i, 2]
+            ux = vertices[b, 0] - vertices[a, 0]
+            uy = vertices[b, 1] - vertices[a, 1]
+            uz = vertices[b, 2] - vertices[a, 2]
+            vx = vertices[c, 0] - vertices[a, 0]
+            vy = vertices[c, 1] - vertices[a, 1]
+            vz = vertices[c, 2] - vertices[a, 2]
+            face_normals[i, 0] = uy * vz - uz * vy
+            face_normals[i, 1] = uz * vx - ux * vz
+            face_normals[i, 2] = ux * vy - uy * vx
+        # Faces share vertices, so the scatter stays serial to avoid racing adds
+        normals = np.zeros((vertices.shape[0], 3))
+        for i in range(faces.shape[0]):
+            for corner in range(3):
+                v = faces[i, corner]
+                normals[v, 0] += face_normals[i, 0]
+                normals[v, 1] += face_normals[i, 1]
+                normals[v, 2] += face_normals[i, 2]
+        for v in numba.prange(vertices.shape[0]):
+            length = np.sqrt(normals[v, 0] ** 2 + normals[v, 1] ** 2 + normals[v, 2] ** 2)
+            if length > 0:
+                normals[v, 0] /= length
+                normals[v, 1] /= length
+                normals[v, 2] /= length
+        return normals
+    return vertex_normals_kernel
+
+def _frozen(array):
+    array.setflags(write=False)
+    return array
+
+# Placeholder exported when a model carries no usable geometry; shared, so read-only,
+# and float32/int32 as the PLY and GLB writers store them
+UNIT_CUBE = {
+    'vertices': _frozen(np.array([
+        [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
+        [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
+    ], dtype=np.float32)),
+    'faces': _frozen(np.array([
+        [0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7],
+        [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
+        [0, 3, 7], [0, 7, 4], [1, 2, 6], [1, 6, 5]
+    ], dtype=np.int32)),
+}
+
+# Rows formatted per write by write_rows
+_WRITE_BLOCK_ROWS = 1 << 16
+
+def write_rows(fh, row_format, rows):
+    """Write one text line per row, formatting a whole block with one % operation.
+    Args:
+        fh: Text file to write to
+        row_format (str): %-format of one line, including the newline
+        rows (np.ndarray): (N, k) values, k matching the format's fields
+    """
+    for start in range(0, len(rows), _WRITE_BLOCK_ROWS):
+        block = rows[start:start + _WRITE_BLOCK_ROWS]
+        fh.write((row_format * len(block)) % tuple(block.ravel().tolist()))
+
+def _unique_rows(key: np.ndarray):
+    """Group equal rows of a non-negative integer array.
+    Args:
+        key (np.ndarray): (N, k) non-negative integer rows
+    Returns:
+        tuple: (index, inverse) — first row of each group, and the group of every row
+    """
+    span = key.max(axis=0) + 1
+    if np.prod(span, dtype=np.float64) < 2 ** 63:
+        # Pack each row into one int64 so a 1-D unique (a single sort) groups them
+        flat = key[:, 0]
+        for column, size in zip(key.T[1:], span[1:]):
+            flat = flat * size + column
+        _, index, inverse = np.unique(flat, return_index=True, return_inverse=True)
+    else:
+        _, index, inverse = np.unique(key, axis=0, return_index=True, return_inverse=True)
+    return index, inverse.reshape(-1)
+
+def merge_vertices(vertices, faces, uvs=None, digits=4):
+    """Merge vertices that coincide once rounded to `digits` decimals.
+    Vertices with differing UVs are kept apart, as trimesh's merge_vertices does.
+    Args:
+        vertices (np.ndarray): (V, 3) vertex positions
+        faces (np.ndarray): (F, 3) vertex indices
+        uvs (np.ndarray): Optional (V, 2) per-vertex texture coordinates
+        digits (int): Decimal places vertices are compared at
+    Returns:
+        tuple: (vertices, faces, index) where index selects the kept original vertices
+    """
+    if not len(vertices):
+        return vertices, faces, np.arange(0)
+    scale = 10 ** digits
+    key = np.round(vertices * scale).astype(np.int64)
+    if uvs is not None:
+        key = np.hstack([key, np.round(np.asarray(uvs) * scale).astype(np.int64)])
+    key -= key.min(axis=0)
+    index, inverse = _unique_rows(key)
+    return vertices[index], inverse[faces], index
+
+def remove_duplicate_faces(faces):
+    """Drop faces that use the same vertices as an earlier face, in any order.
+    Args:
+        faces (np.ndarray): (F, k) vertex indices
+    Returns:
+        np.ndarray: The first occurrence of each face, in the original order
+    """
+    if not len(faces):
+        return faces
+    index, _ = _unique_rows(np.sort(faces, axis=1))
+    return faces[np.sort(index)]
+
+def remove_unreferenced_vertices(vertices, faces):
+    """Drop vertices no face refers to.
+    Args:
+        vertices (np.ndarray): (V, 3) vertex positions
+        faces (np.ndarray): (F, k) vertex indices
+    Returns:
+        tuple: (vertices, faces, index) where index selects the kept original vertices
+    """
+    used = np.zeros(len(vertices), dtype=bool)
+    used[faces] = True
+    index = np.flatnonzero(used)
+    remap = np.cumsum(used) - 1
+    return vertices[index], remap[faces], index
+
+def vertex_normals(vertices, faces):
+    """Compute area-weighted unit vertex normals of a triangle mesh.
+    Args:
+        vertices (np.ndarray): (V, 3) vertex positions
+        faces (np.ndarray): (F, 3) vertex indices
+    Returns:
+        np.ndarray: (V, 3) vertex normals; zero for vertices no face uses
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    faces = np.asarray(faces)
+    kernel = _vertex_normals_kernel() if len(faces) >= _PARALLEL_MIN_FACES else None
+    if kernel is not None:
+        return kernel(np.ascontiguousarray(vertices),
+                      np.ascontiguousarray(faces[:, :3], dtype=np.int64))
+    corners = vertices[faces[:, :3]]
+    face_normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    # Each face adds its normal to its three vertices; one bincount per axis
+    flat_faces = faces[:, :3].ravel()
+    normals = np.stack([
+        np.bincount(flat_faces, weights=np.repeat(face_normals[:, axis], 3), minlength=len(vertices))
+        for axis in range(3)], axis=1)
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    np.divide(normals, lengths, out=normals, where=lengths > 0)
+    return normals
+
+# Simplified meshes kept for re-exports of the same geometry, most recent last
+_SIMPLIFY_CACHE_SIZE = 8
+_simplify_cache = OrderedDict()
+
+def _digest(*arrays):
+    """Hash the dtype, shape and contents of arrays into a short cache key."""
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f'{array.dtype.str}{array.shape}'.encode('ascii'))
+        digest.update(memoryview(array).cast('B'))
+    return digest.digest()
+
+def _decimate(vertices, faces, face_count):
+    """Run quadric decimation with the first available backend, or return None."""
+    try:
+        import open3d as o3d
+    except ImportError:
+        o3d = None
+    if o3d is not None:
+        mesh = o3d.geometry.TriangleMesh(
+            o3d.utility.Vector3dVector(np.asarray(vertices, dtype=np.float64)),
+            o3d.utility.Vector3iVector(np.asarray(faces, dtype=np.int32)))
+        mesh = mesh.simplify_quadric_decimation(target_number_of_triangles=face_count)
+        return np.asarray(mesh.vertices), np.asarray(mesh.triangles)
+    import trimesh
+    mesh = trimesh.Trimesh(vertices=vertices, faces=faces, process=False)
+    # Renamed from simplify_quadratic_decimation in trimesh 4
+    decimate = getattr(mesh, 'simplify_quadric_decimation', None) or mesh.simplify_quadratic_decimation
+    try:
+        mesh = decimate(face_count=face_count)
+    except ImportError as e:
+        logger.warning(f"No mesh decimation backend available, keeping all faces: {str(e)}")
+        return None
+    return np.asarray(mesh.vertices), np.asarray(mesh.faces)
+
+def simplify(vertices, faces, face_count):
+    """Quadric-error decimation of a triangle mesh in native code.
+    Uses open3d's C++ decimation when it is installed, otherwise trimesh's
+    (fast_simplification backed) implementation. Results are cached by mesh content,
+    so exporting the same geometry again, in any format, decimates only once.
+    Args:
+        vertices (np.ndarray): (V, 3) vertex positions
+        faces (np.ndarray): (F, 3) vertex indices
+        face_count (int): Target number of faces
+    Returns:
+        tuple: (vertices, faces) of the simplified mesh, read-only, or the input arrays
+            when no decimation backend is available
+    """
+    face_count = int(face_count)
+    key = (_digest(vertices, faces), face_count)
+    cached = _simplify_cache.get(key)
+    if cached is not None:
+        _simplify_cache.move_to_end(key)
+        return cached
+    result = _decimate(vertices, faces, face_count)
+    if result is None:
+        return vertices, faces
+    result = tuple(_frozen(np.ascontiguousarray(array)) for array in result)
+    _simplify_cache[key] = result
+    if len(_simplify_cache) > _SIMPLIFY_CACHE_SIZE:
+        _simplify_cache.popitem(last=False)
+    return result
+
+def _morton_codes(points, bits=21):
+    """Z-order (Morton) codes of 3-D points quantized to `bits` bits per axis.
+    Args:
+        points (np.ndarray): (N, 3) positions
+        bits (int): Quantization bits per axis, at most 21
+    Returns:
+        np.ndarray: (N,) uint64 codes; nearby points get nearby codes
+    """
+    low = points.min(axis=0)
+    span = np.ptp(points, axis=0)
+    span[span == 0] = 1
+    quantized = ((points - low) / span * ((1 << bits) - 1)).astype(np.uint64)
+    codes = np.zeros(len(points), dtype=np.uint64)
+    for axis in range(3):
+        # Spread the bits of one axis two places apart, then interleave
+        x = quantized[:, axis]
+        for shift, mask in ((32, 0x1F00000000FFFF), (16, 0x1F0000FF0000FF), (8, 0x100F00F00F00F00F),
+                            (4, 0x10C30C30C30C30C3), (2, 0x1249249249249249)):
+            x = (x | (x << np.uint64(shift))) & np.uint64(mask)
+        codes |= x << np.uint64(axis)
+    return codes
+
+def optimize_topology(vertices, faces):
+    """Reorder a mesh for vertex-cache and vertex-fetch locality.
+    Faces are sorted along a Z-order curve through their centroids, so faces that
+    share vertices end up close together in the index buffer, and vertices are then
+    renumbered in order of first use. Both passes are sorts plus linear scans.
+    Args:
+        vertices (np.ndarray): (V, 3) vertex positions
+        faces (np.ndarray): (F, k) vertex indices
+    Returns:
+        tuple: (vertices, faces, index) where index selects the kept original vertices,
+            in their new order; vertices no face uses are dropped
+    """
+    vertices = np.asarray(vertices)
+    faces = np.asarray(faces)
+    if not len(faces):
+        return vertices, faces, np.arange(len(vertices))
+    centroids = vertices[faces].mean(axis=1)
+    faces = faces[np.argsort(_morton_codes(centroids), kind='stable')]
+    used, first = np.unique(faces.ravel(), return_index=True)
+    index = used[np.argsort(first)]
+    remap = np.empty(len(vertices), dtype=np.int64)
+    remap[index] = np.arange(len(index))
+    return vertices[index], remap[faces], index
@@ -1,10 +1,38 @@
 """Base exporter interface for 3Dify.
 """
 
+import logging
+import logging.handlers
+import multiprocessing
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Union
 from pathlib import Path
 
+class _ForwardHandler(logging.Handler):
+    """Hand records received from worker processes to the parent's own loggers."""
+    def emit(self, record):
+        logger = logging.getLogger(record.name)
+        if logger.isEnabledFor(record.levelno):
+            logger.handle(record)
+
+def _init_worker(log_queue, level):
+    """Route a worker process's log records to the parent through `log_queue`."""
+    root = logging.getLogger()
+    # Replace (not add to) any handlers inherited over fork, or records would print twice
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+
+def _export_one(job):
+    """Run one export in a worker process; a top-level function so it pickles.
+    Args:
+        job (tuple): (exporter class, model data, output path, export kwargs)
+    Returns:
+        Path: Path to the exported file
+    """
+    exporter_class, model_data, output_path, kwargs = job
+    return exporter_class().export(model_data, output_path, **kwargs)
+
 class BaseExporter(ABC):
     """Base class for 3D model exporters."""
     @abstractmethod
@@ -19,6 +47,40 @@ class BaseExporter(ABC):
         """
         pass
 
+    @classmethod
+    def export_many(cls, models: Iterable[Any], paths: Iterable[Union[str, Path]],
+                    workers: Optional[int] = None, **kwargs) -> List[Path]:
+        """Export several independent models in parallel worker processes.
+        Each export is CPU-bound and runs under the GIL, so processes rather than
+        threads are used. Models must be picklable; log records from the workers are
+        forwarded to this process's handlers.
+        Args:
+            models: Model data to export, one per output path
+            paths: Paths to save the output files
+            workers (int): Number of worker processes (default: CPU count)
+            **kwargs: Exporter-specific parameters applied to every export
+        Returns:
+            List[Path]: Paths to the exported files, in input order
+        Raises:
+            ValueError: If models and paths differ in length
+        """
+        models, paths = list(models), list(paths)
+        if len(models) != len(paths):
+            raise ValueError(f"Got {len(models)} models but {len(paths)} output paths")
+        jobs = [(cls, model_data, output_path, kwargs)
+                for model_data, output_path in zip(models, paths)]
+        if len(jobs) < 2 or workers == 1:
+            return [_export_one(job) for job in jobs]
+        log_queue = multiprocessing.Queue()
+        listener = logging.handlers.QueueListener(log_queue, _ForwardHandler())
+        listener.start()
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(log_queue, logging.getLogger().getEffectiveLevel())) as executor:
+                return list(executor.map(_export_one, jobs))
+        finally:
+            listener.stop()
+
     @property
     @abstractmethod
     def name(self) -> str:
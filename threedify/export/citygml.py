@@ -4,20 +4,143 @@ This module provides functionality for exporting 3D building models to CityGML f
 This one took me a very long time to figure out but this is the best i could do with the time i had.
 """
 
-import os
+import io
+import copy
 import logging
+import os
+import itertools
+import uuid
 from typing import Any, Dict, Optional, Union
 from pathlib import Path
-import xml.etree.ElementTree as ET
-import xml.dom.minidom as minidom
+from functools import lru_cache
+from xml.sax.saxutils import XMLGenerator, escape
+try:
+    from lxml import etree as ET
+    _LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _LXML = False
 import numpy as np
 
 from threedify.export.base import BaseExporter
+from threedify.export._files import ensure_parent
 
 logger = logging.getLogger(__name__)
 
+# Mesh faces gathered and formatted per batch
+_FACE_BLOCK_SIZE = 4096
+# Buffer of the file the streaming writer emits into
+_WRITE_BUFFER_SIZE = 1 << 20
+
+# Element IDs are this random per-process prefix plus one process-wide counter, so they
+# stay unique across exporter instances (export_many makes one per job)
+_UUID_PREFIX = uuid.uuid4().hex[:12]
+_id_counter = itertools.count(1)
+
+def _reseed_ids():
+    """Draw a fresh ID prefix in a forked child, which would otherwise repeat the parent's IDs."""
+    global _UUID_PREFIX, _id_counter
+    _UUID_PREFIX = uuid.uuid4().hex[:12]
+    _id_counter = itertools.count(1)
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_ids)
+
+# Prefix -> namespace URI; '' is the default CityGML namespace. Elements are created with
+# qualified {uri}local names so lxml (and ElementTree) emit the namespaces natively
+_NAMESPACES = {
+    '': 'http://www.opengis.net/citygml/2.0',
+    'bldg': 'http://www.opengis.net/citygml/building/2.0',
+    'gml': 'http://www.opengis.net/gml',
+    'xsi': 'http://www.w3.org/2001/XMLSchema-instance',
+    'xAL': 'urn:oasis:names:tc:ciq:xsdschema:xAL:2.0',
+}
+# Declared alongside the default namespace for compatibility, but never used in names
+_CORE_NAMESPACE = ('core', 'http://www.opengis.net/citygml/2.0')
+_SCHEMA_LOCATION = ('http://www.opengis.net/citygml/2.0 http://schemas.opengis.net/citygml/2.0/cityGMLBase.xsd '
+                    'http://www.opengis.net/citygml/building/2.0 http://schemas.opengis.net/citygml/building/2.0/building.xsd')
+_NAMESPACE_DECLARATIONS = {
+    f'xmlns:{prefix}' if prefix else 'xmlns': uri
+    for prefix, uri in [*_NAMESPACES.items()][:1] + [_CORE_NAMESPACE] + [*_NAMESPACES.items()][1:]}
+if not _LXML:
+    for _prefix, _uri in _NAMESPACES.items():
+        ET.register_namespace(_prefix, _uri)
+
+@lru_cache(maxsize=None)
+def _q(name: str) -> str:
+    """Turn a prefixed name such as 'gml:Polygon' into its qualified '{uri}Polygon' form."""
+    prefix, _, local = name.rpartition(':')
+    return f'{{{_NAMESPACES[prefix]}}}{local}'
+
+@lru_cache(maxsize=None)
+def _prefixed(qname: str) -> str:
+    """Turn a qualified '{uri}local' name back into its prefixed form for writing."""
+    if not qname.startswith('{'):
+        return qname
+    uri, local = qname[1:].split('}')
+    prefix = next(p for p, u in _NAMESPACES.items() if u == uri)
+    return f'{prefix}:{local}' if prefix else local
+
+@lru_cache(maxsize=None)
+def _pos_list_format(width: int, precision: Optional[int]) -> str:
+    """Get the %-format string that writes a posList of `width` numbers in one operation."""
+    spec = '%r' if precision is None else f'%.{precision}f'
+    return ' '.join([spec] * width)
+
+@lru_cache(maxsize=4096)
+def _cached_escape(text: str) -> str:
+    """Escape element text; attribute values repeat across buildings in batch exports."""
+    return escape(str(text))
+
+@lru_cache(maxsize=None)
+def _surface_template():
+    """Build the empty surfaceMember/Polygon/exterior/LinearRing/posList chain once."""
+    surface_member = ET.Element(_q('gml:surfaceMember'))
+    polygon = ET.SubElement(surface_member, _q('gml:Polygon'))
+    exterior = ET.SubElement(polygon, _q('gml:exterior'))
+    linear_ring = ET.SubElement(exterior, _q('gml:LinearRing'))
+    ET.SubElement(linear_ring, _q('gml:posList'))
+    return surface_member
+
+@lru_cache(maxsize=None)
+def _indents(level: int) -> tuple:
+    """Get the newline + indentation strings for `level` and the five levels below it."""
+    return tuple('\n' + '  ' * (level + depth) for depth in range(6))
+
 class CityGMLExporter(BaseExporter):
     """Exporter for CityGML format."""
+
+    # (building_attributes key, bldg element, unit of measure), in schema order
+    _BLDG_ATTR_MAP = [
+        ('class', 'bldg:class', None),
+        ('function', 'bldg:function', None),
+        ('usage', 'bldg:usage', None),
+        ('year_of_construction', 'bldg:yearOfConstruction', None),
+        ('storeys_above_ground', 'bldg:storeysAboveGround', None),
+        ('storeys_below_ground', 'bldg:storeysBelowGround', None),
+        ('measured_height', 'bldg:measuredHeight', 'm'),
+    ]
+    _BLDG_ATTR_KEYS = frozenset(key for key, _, _ in _BLDG_ATTR_MAP)
+    # LOD -> (placeholder surfaces without geometry, surfaces generated from geometry)
+    _LOD_SOLIDS = {
+        1: ('_box_surfaces', '_simplified_building_surfaces'),
+        2: ('_building_with_roof_surfaces', '_building_surfaces'),
+        3: ('_detailed_building_surfaces', '_detailed_building_surfaces_from_geometry'),
+        4: ('_detailed_building_surfaces', '_detailed_building_surfaces_from_geometry'),
+    }
+
+    # Surfaces of the constant placeholder blocks, built once: prebuilt elements for the
+    # tree path keyed by (generator name, precision), serialized markup for streaming keyed
+    # by (generator name, precision, level)
+    _static_elements = {}
+    _static_xml = {}
+
+    def __init__(self):
+        """Initialize the exporter."""
+        # CompositeSurface element -> pending surfaces while a streaming export runs
+        self._deferred_surfaces = None
+        # Decimal places posList coordinates are rounded to; None writes them unrounded
+        self._precision = None
     
     def export(self, model_data: Any, output_path: Union[str, Path], **kwargs) -> Path:
         """Export model data to CityGML format.
@@ -29,6 +152,10 @@ class CityGMLExporter(BaseExporter):
                 - building_attributes (dict): Additional building attributes
                 - epsg (int): EPSG code for coordinate reference system
                 - building_type (str): Type of building (residential, commercial, etc.)      
+                - stream (bool): Write surfaces to the file as they are generated instead
+                  of building the whole document tree first (default True)
+                - precision (int): Write coordinates with this many decimal places, e.g. 3
+                  for millimetres (default None, full precision)
         Returns:
             Path: Path to the exported file
         """
@@ -40,17 +167,31 @@ class CityGMLExporter(BaseExporter):
         building_attributes = kwargs.get('building_attributes', {})
         epsg = kwargs.get('epsg', 4326)  # Default to WGS84
         building_type = kwargs.get('building_type', 'Building')
-        os.makedirs(output_path.parent, exist_ok=True)
+        stream = kwargs.get('stream', True)
+        self._precision = kwargs.get('precision', None)
+        ensure_parent(output_path)
         
         try:
+            if stream:
+                self._stream_export(output_path, model_data, lod, building_attributes,
+                                    building_type, epsg)
+                logger.info(f"Model exported successfully to {output_path}")
+                return output_path
             root = self._create_citygml_root(epsg)
             self._add_building(root, model_data, lod, building_attributes, building_type)
             tree = ET.ElementTree(root)
-            xml_str = ET.tostring(root, encoding='utf-8')
-            dom = minidom.parseString(xml_str)
-            pretty_xml = dom.toprettyxml(indent="  ")
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(pretty_xml)
+            if _LXML:
+                tree.write(str(output_path), encoding='utf-8', xml_declaration=True,
+                           pretty_print=True)
+            elif hasattr(ET, 'indent'):
+                # Indent in place and serialize once, no minidom re-parse
+                ET.indent(tree, space="  ")
+                tree.write(output_path, encoding='utf-8', xml_declaration=True)
+            else:  # Python 3.8
+                import xml.dom.minidom as minidom
+                pretty_xml = minidom.parseString(ET.tostring(root, encoding='utf-8')).toprettyxml(indent="  ")
+                with open(output_path, 'w', encoding='utf-8') as f:
+                    f.write(pretty_xml)
             logger.info(f"Model exported successfully to {output_path}")
             return output_path
             
@@ -58,6 +199,142 @@ class CityGMLExporter(BaseExporter):
             logger.error(f"Failed to export model to CityGML: {str(e)}")
             raise
     
+    def _stream_export(self, output_path, model_data, lod, building_attributes, building_type, epsg):
+        """Write a CityGML document, streaming the surfaces of each solid to the file.
+        The document skeleton (root, building, attributes, solids) is built as a small
+        tree; surfaces are generated lazily as (id, posList) pairs and emitted through an
+        XMLGenerator into a 1 MiB file buffer, without building their elements.
+        Args:
+            output_path (Path): Path to save the output file
+            model_data: Model data
+            lod (int): Level of detail
+            building_attributes (dict): Additional building attributes
+            building_type (str): Type of building
+            epsg (int): EPSG code for coordinate reference system
+        """
+        self._deferred_surfaces = {}
+        try:
+            root = self._create_citygml_root(epsg)
+            self._add_building(root, model_data, lod, building_attributes, building_type)
+            with open(output_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as fh:
+                gen = XMLGenerator(fh, 'utf-8', short_empty_elements=True)
+                gen.startDocument()
+                self._write_element(gen, root, 0)
+                gen.ignorableWhitespace('\n')
+                gen.endDocument()
+        finally:
+            self._deferred_surfaces = None
+
+    def _write_element(self, gen, elem, level):
+        """Emit an element as SAX events, streaming any surfaces deferred under it.
+        Args:
+            gen (XMLGenerator): Generator writing the document
+            elem (ET.Element): Element to write
+            level (int): Indentation level of the element
+        """
+        tag = _prefixed(elem.tag)
+        attrs = {_prefixed(key): value for key, value in elem.items()}
+        if level == 0:
+            attrs = {**_NAMESPACE_DECLARATIONS, **attrs}
+        surfaces = self._deferred_surfaces.pop(elem, None)
+        gen.startElement(tag, attrs)
+        if len(elem) or surfaces is not None:
+            indents = _indents(level)
+            for child in elem:
+                gen.ignorableWhitespace(indents[1])
+                self._write_element(gen, child, level + 1)
+            if isinstance(surfaces, str):
+                # Pre-serialized markup; ignorableWhitespace writes its content unescaped
+                gen.ignorableWhitespace(self._static_surfaces_xml(surfaces, level + 1))
+            else:
+                for polygon_id, pos_list in surfaces or ():
+                    gen.ignorableWhitespace(indents[1])
+                    self._write_surface(gen, polygon_id, pos_list, level + 1)
+            gen.ignorableWhitespace(indents[0])
+        elif elem.text:
+            # ignorableWhitespace writes unescaped, so hand it the cached escaped text
+            gen.ignorableWhitespace(_cached_escape(elem.text))
+        gen.endElement(tag)
+
+    def _write_surface(self, gen, polygon_id, pos_list, level):
+        """Emit a polygon surfaceMember as SAX events, without building its elements.
+        Args:
+            gen (XMLGenerator): Generator writing the document
+            polygon_id (str): ID for the polygon
+            pos_list (str): Space-separated vertex coordinates
+            level (int): Indentation level of the surfaceMember
+        """
+        indents = _indents(level)
+        gen.startElement('gml:surfaceMember', {})
+        gen.ignorableWhitespace(indents[1])
+        gen.startElement('gml:Polygon', {'gml:id': polygon_id})
+        gen.ignorableWhitespace(indents[2])
+        gen.startElement('gml:exterior', {})
+        gen.ignorableWhitespace(indents[3])
+        gen.startElement('gml:LinearRing', {})
+        gen.ignorableWhitespace(indents[4])
+        gen.startElement('gml:posList', {})
+        # Formatted numbers never need escaping
+        gen.ignorableWhitespace(pos_list)
+        gen.endElement('gml:posList')
+        gen.ignorableWhitespace(indents[3])
+        gen.endElement('gml:LinearRing')
+        gen.ignorableWhitespace(indents[2])
+        gen.endElement('gml:exterior')
+        gen.ignorableWhitespace(indents[1])
+        gen.endElement('gml:Polygon')
+        gen.ignorableWhitespace(indents[0])
+        gen.endElement('gml:surfaceMember')
+
+    def _add_surfaces(self, composite_surface, surfaces):
+        """Attach surfaces to a composite surface, or defer them when streaming.
+        Args:
+            composite_surface (ET.Element): CompositeSurface element
+            surfaces (iterable): (polygon id, posList) pairs
+        """
+        if self._deferred_surfaces is not None:
+            self._deferred_surfaces[composite_surface] = surfaces
+        else:
+            # Build the detached surfaces first, then attach them in one bulk insert
+            composite_surface.extend([self._pos_list_surface(pos_list, polygon_id)
+                                      for polygon_id, pos_list in surfaces])
+
+    def _add_static_surfaces(self, composite_surface, generator_name):
+        """Attach the surfaces of a constant geometry block from its memoized form.
+        Args:
+            composite_surface (ET.Element): CompositeSurface element
+            generator_name (str): Name of the method generating the block's surfaces
+        """
+        if self._deferred_surfaces is not None:
+            self._deferred_surfaces[composite_surface] = generator_name
+            return
+        key = (generator_name, self._precision)
+        elements = self._static_elements.get(key)
+        if elements is None:
+            elements = self._static_elements[key] = [
+                self._pos_list_surface(pos_list, polygon_id)
+                for polygon_id, pos_list in getattr(self, generator_name)()]
+        composite_surface.extend(copy.deepcopy(element) for element in elements)
+
+    def _static_surfaces_xml(self, generator_name, level):
+        """Get the serialized surfaces of a constant geometry block.
+        Args:
+            generator_name (str): Name of the method generating the block's surfaces
+            level (int): Indentation level of the surfaces
+        Returns:
+            str: surfaceMember markup, each element preceded by its indentation
+        """
+        key = (generator_name, self._precision, level)
+        xml = self._static_xml.get(key)
+        if xml is None:
+            buf = io.StringIO()
+            gen = XMLGenerator(buf, 'utf-8', short_empty_elements=True)
+            for polygon_id, pos_list in getattr(self, generator_name)():
+                gen.ignorableWhitespace(_indents(level)[0])
+                self._write_surface(gen, polygon_id, pos_list, level)
+            xml = self._static_xml[key] = buf.getvalue()
+        return xml
+
     def _create_citygml_root(self, epsg=4326):
         """Create the root element for a CityGML document.
         Args:
@@ -65,25 +342,18 @@ class CityGMLExporter(BaseExporter):
         Returns:
             ET.Element: Root element
         """
-        nsmap = {
-            'xmlns': 'http://www.opengis.net/citygml/2.0',
-            'xmlns:core': 'http://www.opengis.net/citygml/2.0',
-            'xmlns:bldg': 'http://www.opengis.net/citygml/building/2.0',
-            'xmlns:gml': 'http://www.opengis.net/gml',
-            'xmlns:xsi': 'http://www.w3.org/2001/XMLSchema-instance',
-            'xmlns:xAL': 'urn:oasis:names:tc:ciq:xsdschema:xAL:2.0',
-            'xsi:schemaLocation': 'http://www.opengis.net/citygml/2.0 http://schemas.opengis.net/citygml/2.0/cityGMLBase.xsd http://www.opengis.net/citygml/building/2.0 http://schemas.opengis.net/citygml/building/2.0/building.xsd'
-        }
-        root = ET.Element('CityModel')
-
-        for ns_key, ns_val in nsmap.items():
-            root.set(ns_key, ns_val)
-        bounded_by = ET.SubElement(root, 'gml:boundedBy')
-        envelope = ET.SubElement(bounded_by, 'gml:Envelope')
+        if _LXML:
+            nsmap = {prefix or None: uri for prefix, uri in _NAMESPACES.items()}
+            root = ET.Element(_q('CityModel'), nsmap=nsmap)
+        else:
+            root = ET.Element(_q('CityModel'))
+        root.set(_q('xsi:schemaLocation'), _SCHEMA_LOCATION)
+        bounded_by = ET.SubElement(root, _q('gml:boundedBy'))
+        envelope = ET.SubElement(bounded_by, _q('gml:Envelope'))
         envelope.set('srsName', f"EPSG:{epsg}")
-        lower_corner = ET.SubElement(envelope, 'gml:lowerCorner')
+        lower_corner = ET.SubElement(envelope, _q('gml:lowerCorner'))
         lower_corner.text = "-180.0 -90.0 0.0"
-        upper_corner = ET.SubElement(envelope, 'gml:upperCorner')
+        upper_corner = ET.SubElement(envelope, _q('gml:upperCorner'))
         upper_corner.text = "180.0 90.0 100.0"
         return root
     
@@ -96,138 +366,71 @@ class CityGMLExporter(BaseExporter):
             building_attributes (dict): Additional building attributes
             building_type (str): Type of building
         """
-        city_object_member = ET.SubElement(root, 'cityObjectMember')
-        building = ET.SubElement(city_object_member, f'bldg:{building_type}')
-        building.set('gml:id', f'Building_{self._generate_uuid()}')
-        if 'class' in building_attributes:
-            class_elem = ET.SubElement(building, 'bldg:class')
-            class_elem.text = building_attributes['class']
-        if 'function' in building_attributes:
-            function = ET.SubElement(building, 'bldg:function')
-            function.text = building_attributes['function']
-        if 'usage' in building_attributes:
-            usage = ET.SubElement(building, 'bldg:usage')
-            usage.text = building_attributes['usage']
-        if 'year_of_construction' in building_attributes:
-            year = ET.SubElement(building, 'bldg:yearOfConstruction')
-            year.text = str(building_attributes['year_of_construction'])
-        if 'storeys_above_ground' in building_attributes:
-            storeys = ET.SubElement(building, 'bldg:storeysAboveGround')
-            storeys.text = str(building_attributes['storeys_above_ground'])
-        
-        if 'storeys_below_ground' in building_attributes:
-            storeys = ET.SubElement(building, 'bldg:storeysBelowGround')
-            storeys.text = str(building_attributes['storeys_below_ground'])
-        if 'measured_height' in building_attributes:
-            height = ET.SubElement(building, 'bldg:measuredHeight')
-            height.set('uom', 'm')
-            height.text = str(building_attributes['measured_height'])
+        city_object_member = ET.SubElement(root, _q('cityObjectMember'))
+        building = ET.SubElement(city_object_member, _q(f'bldg:{building_type}'))
+        building.set(_q('gml:id'), f'Building_{self._generate_uuid()}')
+        # Walk the table only for the keys actually given; it still sets the schema order
+        present = self._BLDG_ATTR_KEYS.intersection(building_attributes)
+        if present:
+            for key, tag, uom in self._BLDG_ATTR_MAP:
+                if key in present:
+                    elem = ET.SubElement(building, _q(tag))
+                    if uom:
+                        elem.set('uom', uom)
+                    elem.text = str(building_attributes[key])
         if 'address' in building_attributes:
             addr = building_attributes['address']
-            address = ET.SubElement(building, 'bldg:address')
-            xal_address = ET.SubElement(address, 'xAL:Address')
+            address = ET.SubElement(building, _q('bldg:address'))
+            xal_address = ET.SubElement(address, _q('xAL:Address'))
             
             if 'country' in addr:
-                country = ET.SubElement(xal_address, 'xAL:Country')
-                country_name = ET.SubElement(country, 'xAL:CountryName')
+                country = ET.SubElement(xal_address, _q('xAL:Country'))
+                country_name = ET.SubElement(country, _q('xAL:CountryName'))
                 country_name.text = addr['country']
             if 'city' in addr:
-                locality = ET.SubElement(xal_address, 'xAL:Locality')
+                locality = ET.SubElement(xal_address, _q('xAL:Locality'))
                 locality.set('Type', 'Town')
-                locality_name = ET.SubElement(locality, 'xAL:LocalityName')
+                locality_name = ET.SubElement(locality, _q('xAL:LocalityName'))
                 locality_name.text = addr['city']
             if 'street' in addr:
-                thoroughfare = ET.SubElement(xal_address, 'xAL:Thoroughfare')
+                thoroughfare = ET.SubElement(xal_address, _q('xAL:Thoroughfare'))
                 thoroughfare.set('Type', 'Street')
-                thoroughfare_name = ET.SubElement(thoroughfare, 'xAL:ThoroughfareName')
+                thoroughfare_name = ET.SubElement(thoroughfare, _q('xAL:ThoroughfareName'))
                 thoroughfare_name.text = addr['street']
                 if 'number' in addr:
-                    number = ET.SubElement(thoroughfare, 'xAL:ThoroughfareNumber')
+                    number = ET.SubElement(thoroughfare, _q('xAL:ThoroughfareNumber'))
                     number.text = addr['number']
             if 'postal_code' in addr:
-                postal_code = ET.SubElement(xal_address, 'xAL:PostCode')
-                postal_code_number = ET.SubElement(postal_code, 'xAL:PostCodeNumber')
+                postal_code = ET.SubElement(xal_address, _q('xAL:PostCode'))
+                postal_code_number = ET.SubElement(postal_code, _q('xAL:PostCodeNumber'))
                 postal_code_number.text = addr['postal_code']
-        if lod == 1:
-            self._add_lod1_solid(building, model_data)
-        elif lod == 2:
-            self._add_lod2_solid(building, model_data)
-        elif lod == 3:
-            self._add_lod3_solid(building, model_data)
-        elif lod == 4:
-            self._add_lod4_solid(building, model_data)
-        else:
+        if lod not in self._LOD_SOLIDS:
             logger.warning(f"Invalid LOD: {lod}, using LOD2 instead")
-            self._add_lod2_solid(building, model_data)
+            lod = 2
+        self._add_lod_solid(building, model_data, int(lod))
     
-    def _add_lod1_solid(self, building, model_data):
-        """Add a LOD1 solid (simple block model) to the building.
+    def _add_lod_solid(self, building, model_data, lod):
+        """Add a LODn solid to the building.
+        LOD1 is a simple block model, LOD2 adds roof shapes, LOD3 doors and windows
+        and LOD4 the interior.
         Args:
             building (ET.Element): Building element
             model_data: Model data
+            lod (int): Level of detail (1-4)
         """
-        lod1_solid = ET.SubElement(building, 'bldg:lod1Solid')
-        solid = ET.SubElement(lod1_solid, 'gml:Solid')
-        solid.set('gml:id', f'Solid_{self._generate_uuid()}')
-        exterior = ET.SubElement(solid, 'gml:exterior')
-        composite_surface = ET.SubElement(exterior, 'gml:CompositeSurface')
+        placeholder_surfaces, geometry_surfaces = self._LOD_SOLIDS[lod]
+        lod_solid = ET.SubElement(building, _q(f'bldg:lod{lod}Solid'))
+        solid = ET.SubElement(lod_solid, _q('gml:Solid'))
+        solid.set(_q('gml:id'), f'Solid_{self._generate_uuid()}')
+        exterior = ET.SubElement(solid, _q('gml:exterior'))
+        composite_surface = ET.SubElement(exterior, _q('gml:CompositeSurface'))
         geom = self._extract_geometry(model_data)
         if geom is None or len(geom) == 0:
-            self._add_box_surfaces(composite_surface)
+            self._add_static_surfaces(composite_surface, placeholder_surfaces)
         else:
-            self._add_simplified_building_surfaces(composite_surface, geom)
-    
-    def _add_lod2_solid(self, building, model_data):
-        """Add a LOD2 solid (with roof shapes) to the building.
-        Args:
-            building (ET.Element): Building element
-            model_data: Model data
-        """
-        lod2_solid = ET.SubElement(building, 'bldg:lod2Solid')
-        solid = ET.SubElement(lod2_solid, 'gml:Solid')
-        solid.set('gml:id', f'Solid_{self._generate_uuid()}')
-        exterior = ET.SubElement(solid, 'gml:exterior')
-        composite_surface = ET.SubElement(exterior, 'gml:CompositeSurface')
-        geom = self._extract_geometry(model_data)
-        if geom is None or len(geom) == 0:
-            self._add_building_with_roof_surfaces(composite_surface)
-        else:
-            self._add_building_surfaces(composite_surface, geom)
-    
-    def _add_lod3_solid(self, building, model_data):
-        """Add a LOD3 solid (with doors and windows) to the building.
-        Args:
-            building (ET.Element): Building element
-            model_data: Model data
-        """
-        lod3_solid = ET.SubElement(building, 'bldg:lod3Solid')
-        solid = ET.SubElement(lod3_solid, 'gml:Solid')
-        solid.set('gml:id', f'Solid_{self._generate_uuid()}')
-        exterior = ET.SubElement(solid, 'gml:exterior')
-        composite_surface = ET.SubElement(exterior, 'gml:CompositeSurface')
-        geom = self._extract_geometry(model_data)
-        if geom is None or len(geom) == 0:
-            self._add_detailed_building_surfaces(composite_surface)
-        else:
-            self._add_detailed_building_surfaces_from_geometry(composite_surface, geom)
-    
-    def _add_lod4_solid(self, building, model_data):
-        """Add a LOD4 solid (with interior) to the building.
-        Args:
-            building (ET.Element): Building element
-            model_data: Model data
-        """
-        lod4_solid = ET.SubElement(building, 'bldg:lod4Solid')
-        solid = ET.SubElement(lod4_solid, 'gml:Solid')
-        solid.set('gml:id', f'Solid_{self._generate_uuid()}')
-        exterior = ET.SubElement(solid, 'gml:exterior')
-        composite_surface = ET.SubElement(exterior, 'gml:CompositeSurface')
-        geom = self._extract_geometry(model_data)
-        if geom is None or len(geom) == 0:
-            self._add_detailed_building_surfaces(composite_surface)
-        else:
-            self._add_detailed_building_surfaces_from_geometry(composite_surface, geom)
-        self._add_interior_features(building, model_data)
+            self._add_surfaces(composite_surface, getattr(self, geometry_surfaces)(geom))
+        if lod == 4:
+            self._add_interior_features(building, model_data)
     
     def _extract_geometry(self, model_data):
         """Extract geometry data from model_data.
@@ -253,10 +456,10 @@ class CityGMLExporter(BaseExporter):
             return geom
         return None
     
-    def _add_box_surfaces(self, composite_surface):
-        """Add box surfaces to the composite surface.
-        Args:
-            composite_surface (ET.Element): CompositeSurface element
+    def _box_surfaces(self):
+        """Generate box surfaces.
+        Yields:
+            tuple: (polygon id, posList) pairs
         """
         coords = [
             # Bottom face
@@ -273,27 +476,24 @@ class CityGMLExporter(BaseExporter):
             [(10, 0, 0), (10, 10, 0), (10, 10, 5), (10, 0, 5)]
         ]
         for i, face_coords in enumerate(coords):
-            self._add_polygon_surface(composite_surface, face_coords, f'Box_Polygon_{i+1}')
+            yield self._polygon(face_coords, f'Box_Polygon_{i+1}')
     
-    def _add_simplified_building_surfaces(self, composite_surface, geom):
-        """Add simplified building surfaces to the composite surface.
+    def _simplified_building_surfaces(self, geom):
+        """Generate simplified building surfaces.
         Args:
-            composite_surface (ET.Element): CompositeSurface element
             geom (dict): Geometry data
+        Yields:
+            tuple: (polygon id, posList) pairs
         """
         if 'vertices' in geom and 'faces' in geom and geom['vertices'] is not None and geom['faces'] is not None:
-            vertices = geom['vertices']
-            faces = geom['faces']
-            for i, face in enumerate(faces):
-                face_coords = [vertices[idx] for idx in face]
-                self._add_polygon_surface(composite_surface, face_coords, f'Building_Polygon_{i+1}')
+            yield from self._mesh_surfaces(geom['vertices'], geom['faces'])
         else:
-            self._add_box_surfaces(composite_surface)
+            yield from self._box_surfaces()
     
-    def _add_building_with_roof_surfaces(self, composite_surface):
-        """Add building surfaces with a roof to the composite surface.
-        Args:
-            composite_surface (ET.Element): CompositeSurface element
+    def _building_with_roof_surfaces(self):
+        """Generate building surfaces with a roof.
+        Yields:
+            tuple: (polygon id, posList) pairs
         """
         coords = [
             # Bottom face
@@ -312,49 +512,47 @@ class CityGMLExporter(BaseExporter):
             [(5, 0, 8), (10, 0, 5), (10, 10, 5), (5, 10, 8)]
         ]
         for i, face_coords in enumerate(coords):
-            self._add_polygon_surface(composite_surface, face_coords, f'Building_Polygon_{i+1}')
+            yield self._polygon(face_coords, f'Building_Polygon_{i+1}')
     
-    def _add_building_surfaces(self, composite_surface, geom):
-        """Add building surfaces with roof from geometry to the composite surface.
+    def _building_surfaces(self, geom):
+        """Generate building surfaces with roof from geometry.
         Args:
-            composite_surface (ET.Element): CompositeSurface element
             geom (dict): Geometry data
+        Yields:
+            tuple: (polygon id, posList) pairs
         """
         if 'vertices' in geom and 'faces' in geom and geom['vertices'] is not None and geom['faces'] is not None:
-            vertices = geom['vertices']
-            faces = geom['faces']
-            for i, face in enumerate(faces):
-                face_coords = [vertices[idx] for idx in face]
-                self._add_polygon_surface(composite_surface, face_coords, f'Building_Polygon_{i+1}')
+            yield from self._mesh_surfaces(geom['vertices'], geom['faces'])
         else:
-            self._add_building_with_roof_surfaces(composite_surface)
+            yield from self._building_with_roof_surfaces()
     
-    def _add_detailed_building_surfaces(self, composite_surface):
-        """Add detailed building surfaces to the composite surface.
-        Args:
-            composite_surface (ET.Element): CompositeSurface element
+    def _detailed_building_surfaces(self):
+        """Generate detailed building surfaces.
+        Yields:
+            tuple: (polygon id, posList) pairs
         """
-        self._add_building_with_roof_surfaces(composite_surface)
+        yield from self._building_with_roof_surfaces()
         window_coords = [(2, 0.01, 2), (4, 0.01, 2), (4, 0.01, 4), (2, 0.01, 4)]
-        self._add_polygon_surface(composite_surface, window_coords, f'Window_Polygon_1')
+        yield self._polygon(window_coords, f'Window_Polygon_1')
         door_coords = [(7, 0.01, 0), (9, 0.01, 0), (9, 0.01, 3), (7, 0.01, 3)]
-        self._add_polygon_surface(composite_surface, door_coords, f'Door_Polygon_1')
+        yield self._polygon(door_coords, f'Door_Polygon_1')
     
-    def _add_detailed_building_surfaces_from_geometry(self, composite_surface, geom):
-        """Add detailed building surfaces from geometry to the composite surface.
+    def _detailed_building_surfaces_from_geometry(self, geom):
+        """Generate detailed building surfaces from geometry.
         Args:
-            composite_surface (ET.Element): CompositeSurface element
             geom (dict): Geometry data
+        Yields:
+            tuple: (polygon id, posList) pairs
         """
-        self._add_building_surfaces(composite_surface, geom)
+        yield from self._building_surfaces(geom)
         if 'building_data' in geom and 'openings' in geom['building_data']:
             openings = geom['building_data']['openings']
             
             for i, opening in enumerate(openings):
                 if opening['type'] == 'window':
-                    self._add_polygon_surface(composite_surface, opening['coords'], f'Window_Polygon_{i+1}')
+                    yield self._polygon(opening['coords'], f'Window_Polygon_{i+1}')
                 elif opening['type'] == 'door':
-                    self._add_polygon_surface(composite_surface, opening['coords'], f'Door_Polygon_{i+1}')
+                    yield self._polygon(opening['coords'], f'Door_Polygon_{i+1}')
     
     def _add_interior_features(self, building, model_data):
         """Add interior features to the building.
@@ -362,13 +560,20 @@ class CityGMLExporter(BaseExporter):
             building (ET.Element): Building element
             model_data: Model data
         """
-        room = ET.SubElement(building, 'bldg:Room')
-        room.set('gml:id', f'Room_{self._generate_uuid()}')
-        lod4_solid = ET.SubElement(room, 'bldg:lod4Solid')
-        solid = ET.SubElement(lod4_solid, 'gml:Solid')
-        solid.set('gml:id', f'Room_Solid_{self._generate_uuid()}')
-        exterior = ET.SubElement(solid, 'gml:exterior')
-        composite_surface = ET.SubElement(exterior, 'gml:CompositeSurface')
+        room = ET.SubElement(building, _q('bldg:Room'))
+        room.set(_q('gml:id'), f'Room_{self._generate_uuid()}')
+        lod4_solid = ET.SubElement(room, _q('bldg:lod4Solid'))
+        solid = ET.SubElement(lod4_solid, _q('gml:Solid'))
+        solid.set(_q('gml:id'), f'Room_Solid_{self._generate_uuid()}')
+        exterior = ET.SubElement(solid, _q('gml:exterior'))
+        composite_surface = ET.SubElement(exterior, _q('gml:CompositeSurface'))
+        self._add_static_surfaces(composite_surface, '_room_surfaces')
+
+    def _room_surfaces(self):
+        """Generate the surfaces of the interior room.
+        Yields:
+            tuple: (polygon id, posList) pairs
+        """
         coords = [
             # Bottom face
             [(2, 2, 0.1), (8, 2, 0.1), (8, 8, 0.1), (2, 8, 0.1)],
@@ -384,31 +589,71 @@ class CityGMLExporter(BaseExporter):
             [(8, 2, 0.1), (8, 8, 0.1), (8, 8, 4.9), (8, 2, 4.9)]
         ]
         for i, face_coords in enumerate(coords):
-            self._add_polygon_surface(composite_surface, face_coords, f'Room_Polygon_{i+1}')
+            yield self._polygon(face_coords, f'Room_Polygon_{i+1}')
     
-    def _add_polygon_surface(self, composite_surface, coords, polygon_id):
-        """Add a polygon surface to the composite surface.
+    def _mesh_surfaces(self, vertices, faces):
+        """Generate one polygon surface per mesh face.
+        Args:
+            vertices: (V, 3) vertex coordinates
+            faces: (F, k) vertex indices per face, or a ragged list of index lists
+        Yields:
+            tuple: (polygon id, posList) pairs
+        """
+        vertices = np.asarray(vertices)
+        try:
+            faces = np.asarray(faces, dtype=np.int64)
+        except ValueError:
+            # Faces with differing vertex counts cannot be gathered in one step
+            for i, face in enumerate(faces):
+                yield self._polygon(vertices[list(face)], f'Building_Polygon_{i+1}')
+            return
+        # Gather face vertices with one fancy index per block of faces; blocks keep the
+        # gathered coordinates small while streaming
+        for start in range(0, len(faces), _FACE_BLOCK_SIZE):
+            block = vertices[faces[start:start + _FACE_BLOCK_SIZE]]
+            rows = block.reshape(len(block), -1).tolist()
+            # Faces of a block share a width, so one format string formats each whole row
+            row_format = _pos_list_format(block.shape[1] * block.shape[2], self._precision)
+            for i, face_coords in enumerate(rows, start + 1):
+                yield f'Building_Polygon_{i}', row_format % tuple(face_coords)
+
+    def _polygon(self, coords, polygon_id):
+        """Prepare a polygon surface for writing.
         Args:
-            composite_surface (ET.Element): CompositeSurface element
             coords (list): List of coordinates for the polygon
             polygon_id (str): ID for the polygon
+        Returns:
+            tuple: (polygon id, posList)
+        """
+        # One flatten + tolist, then a single format call for the whole posList
+        flat = np.asarray(coords).ravel().tolist()
+        pos_list = _pos_list_format(len(flat), self._precision) % tuple(flat)
+        return polygon_id, pos_list
+
+    def _pos_list_surface(self, pos_list, polygon_id):
+        """Build a detached polygon surface from a formatted posList.
+        Args:
+            pos_list (str): Space-separated vertex coordinates
+            polygon_id (str): ID for the polygon
+        Returns:
+            ET.Element: surfaceMember element
         """
-        surface_member = ET.SubElement(composite_surface, 'gml:surfaceMember')
-        polygon = ET.SubElement(surface_member, 'gml:Polygon')
-        polygon.set('gml:id', polygon_id)
-        exterior = ET.SubElement(polygon, 'gml:exterior')
-        linear_ring = ET.SubElement(exterior, 'gml:LinearRing')
-        pos_list = ' '.join([f'{x} {y} {z}' for x, y, z in coords])
-        pos_list_elem = ET.SubElement(linear_ring, 'gml:posList')
-        pos_list_elem.text = pos_list
+        # One deepcopy of the empty surface is cheaper than five element constructions
+        surface_member = copy.deepcopy(_surface_template())
+        polygon = surface_member[0]
+        polygon.set(_q('gml:id'), polygon_id)
+        polygon[0][0][0].text = pos_list
+        return surface_member
     
     def _generate_uuid(self):
         """Generate a unique ID for CityGML elements.
+        IDs combine a random per-process prefix with a process-wide counter, which keeps
+        them unique across exporter instances without drawing a fresh random UUID for
+        every element.
         Returns:
             str: Unique ID
         """
-        import uuid
-        return uuid.uuid4().hex
+        return f"{_UUID_PREFIX}{next(_id_counter):08x}"
     
     @property
     def name(self) -> str:
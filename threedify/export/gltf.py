@@ -2,16 +2,71 @@
 This module provides functionality for exporting 3D models to GLTF/GLB format.
 """
 
-import os
+import struct
 import logging
 from typing import Any, Dict, Optional, Union
 from pathlib import Path
+from functools import lru_cache
 import json
 import numpy as np
 
 from threedify.export.base import BaseExporter
+from threedify.export._files import COPY_BUFSIZE, copy_file, ensure_parent
+from threedify.export._mesh import UNIT_CUBE, merge_vertices, simplify
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _trimesh():
+    import trimesh
+    return trimesh
+
+@lru_cache(maxsize=None)
+def _pygltflib():
+    import pygltflib
+    return pygltflib
+
+_GLB_MAGIC = 0x46546C67  # b'glTF'
+_GLB_CHUNK_JSON = 0x4E4F534A
+_GLB_CHUNK_BIN = 0x004E4942
+
+def _glb_to_gltf(src, dst):
+    """Split a GLB container into a .gltf JSON file and a .bin buffer sidecar.
+    The JSON and binary chunks are copied as they are, only the buffer URI is added,
+    so the model is never deserialized into an object graph.
+    Args:
+        src (str or Path): Source GLB file
+        dst (Path): Destination .gltf file; the buffer is written next to it as .bin
+    Raises:
+        ValueError: If the file is not a GLB version 2 container this can split
+    """
+    with open(src, 'rb') as fsrc:
+        magic, version, _ = struct.unpack('<III', fsrc.read(12))
+        if magic != _GLB_MAGIC or version != 2:
+            raise ValueError(f"Not a GLB 2.0 file: {src}")
+        length, chunk_type = struct.unpack('<II', fsrc.read(8))
+        if chunk_type != _GLB_CHUNK_JSON:
+            raise ValueError("GLB does not start with a JSON chunk")
+        gltf = json.loads(fsrc.read(length))
+        header = fsrc.read(8)
+        buffers = gltf.get('buffers', [])
+        if len(header) == 8:
+            length, chunk_type = struct.unpack('<II', header)
+            if chunk_type != _GLB_CHUNK_BIN or not buffers or 'uri' in buffers[0]:
+                raise ValueError("Unexpected GLB binary chunk")
+            bin_path = dst.with_suffix('.bin')
+            buffers[0]['uri'] = bin_path.name
+            with open(bin_path, 'wb') as fbin:
+                while length:
+                    data = fsrc.read(min(length, COPY_BUFSIZE))
+                    if not data:
+                        raise ValueError("Truncated GLB binary chunk")
+                    fbin.write(data)
+                    length -= len(data)
+        elif any('uri' not in buffer for buffer in buffers):
+            raise ValueError("GLB buffer has no binary chunk")
+    with open(dst, 'w', encoding='utf-8') as fdst:
+        json.dump(gltf, fdst, separators=(',', ':'))
+
 class GLTFExporter(BaseExporter):
     """Exporter for GLTF/GLB format."""
     def export(self, model_data: Any, output_path: Union[str, Path], **kwargs) -> Path:
@@ -22,6 +77,10 @@ class GLTFExporter(BaseExporter):
             **kwargs: Additional parameters
                 - binary (bool): Export as GLB (binary) format
                 - optimize (bool): Optimize the model for size
+                - decimate (bool): Allow decimation while optimizing (default True)
+                - decimate_threshold (int): Face count above which meshes are decimated
+                  (default 10000)
+                - target_faces (int): Face count to decimate to (default 80% of the faces)
                 - embed_textures (bool): Embed textures in the GLTF/GLB
                 - texture_resolution (int): Resolution for textures   
         Returns:
@@ -39,7 +98,9 @@ class GLTFExporter(BaseExporter):
         optimize = kwargs.get('optimize', True)
         embed_textures = kwargs.get('embed_textures', True)
         texture_resolution = kwargs.get('texture_resolution', 2048)
-        os.makedirs(output_path.parent, exist_ok=True)
+        decimation = {key: kwargs[key] for key in ('decimate', 'decimate_threshold', 'target_faces')
+                      if key in kwargs}
+        ensure_parent(output_path)
         
         try:
             if hasattr(model_data, 'original_path') and model_data.original_path.endswith('.glb'):
@@ -48,15 +109,17 @@ class GLTFExporter(BaseExporter):
             elif hasattr(model_data, 'mesh'):
                 return self._export_mesh(model_data, output_path, binary=binary, 
                                      optimize=optimize, embed_textures=embed_textures,
-                                     texture_resolution=texture_resolution)
+                                     texture_resolution=texture_resolution, **decimation)
                 
             elif hasattr(model_data, 'gaussian') and model_data.gaussian:
                 return self._export_gaussian(model_data, output_path, binary=binary,
-                                         optimize=optimize, embed_textures=embed_textures)
+                                         optimize=optimize, embed_textures=embed_textures,
+                                         **decimation)
                 
             else:
                 return self._export_generic(model_data, output_path, binary=binary,
-                                        optimize=optimize, embed_textures=embed_textures)
+                                        optimize=optimize, embed_textures=embed_textures,
+                                        **decimation)
         except Exception as e:
             logger.error(f"Failed to export model: {str(e)}")
             raise
@@ -70,22 +133,26 @@ class GLTFExporter(BaseExporter):
         Returns:
             Path: Path to the exported file
         """
-        from shutil import copyfile
         if binary and model_data.original_path.endswith('.glb'):
-            copyfile(model_data.original_path, output_path)
+            copy_file(model_data.original_path, output_path)
             return output_path
         elif not binary and model_data.original_path.endswith('.glb'):
             try:
-                import pygltflib
+                _glb_to_gltf(model_data.original_path, output_path)
+                return output_path
+            except (ValueError, struct.error) as e:
+                logger.warning(f"Could not split GLB directly ({str(e)}), converting with pygltflib")
+            try:
+                pygltflib = _pygltflib()
                 glb = pygltflib.GLTF2().load(model_data.original_path)
                 glb.save(output_path)
                 return output_path
             except ImportError:
                 logger.warning("pygltflib not available, copying GLB instead")
-                copyfile(model_data.original_path, output_path.with_suffix('.glb'))
+                copy_file(model_data.original_path, output_path.with_suffix('.glb'))
                 return output_path.with_suffix('.glb')
         else:
-            copyfile(model_data.original_path, output_path)
+            copy_file(model_data.original_path, output_path)
             return output_path
     
     def _export_mesh(self, model_data, output_path, **kwargs):
@@ -103,41 +170,45 @@ class GLTFExporter(BaseExporter):
         texture_resolution = kwargs.get('texture_resolution', 2048)
 
         try:
-            import trimesh
+            trimesh = _trimesh()
         except ImportError:
             logger.error("trimesh is required for GLTF export")
             raise ImportError("trimesh is required for GLTF export. Install with: pip install trimesh")
         if hasattr(model_data, 'mesh') and isinstance(model_data.mesh, dict):
             mesh_data = model_data.mesh
         else:
-            mesh_data = {
-                'vertices': np.array([
-                    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
-                    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
-                ]),
-                'faces': np.array([
-                    [0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7],
-                    [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
-                    [0, 3, 7], [0, 7, 4], [1, 2, 6], [1, 6, 5]
-                ])
-            }
+            mesh_data = UNIT_CUBE
+        vertices = np.asarray(mesh_data.get('vertices'))
+        faces = np.asarray(mesh_data.get('faces'))
+        colors = mesh_data.get('colors')
+        uvs = mesh_data.get('uvs')
+        if optimize:
+            logger.info("Optimizing mesh...")
+            n_vertices = len(vertices)
+            vertices, faces, index = merge_vertices(
+                vertices, faces, uvs=uvs if uvs is not None and len(uvs) == n_vertices else None)
+            if colors is not None and len(colors) == n_vertices:
+                colors = np.asarray(colors)[index]
+            if uvs is not None and len(uvs) == n_vertices:
+                uvs = np.asarray(uvs)[index]
         mesh = trimesh.Trimesh(
-            vertices=mesh_data.get('vertices'),
-            faces=mesh_data.get('faces')
+            vertices=vertices,
+            faces=faces
         )
-        if 'colors' in mesh_data and mesh_data['colors'] is not None:
-            mesh.visual.vertex_colors = mesh_data['colors']
-        if 'uvs' in mesh_data and mesh_data['uvs'] is not None:
-            mesh.visual.uv = mesh_data['uvs']
+        if colors is not None:
+            mesh.visual.vertex_colors = colors
+        if uvs is not None:
+            mesh.visual.uv = uvs
         if 'texture' in mesh_data and mesh_data['texture'] is not None:
             pass
         if optimize:
-            logger.info("Optimizing mesh...")
-            mesh = mesh.merge_vertices(digits_vertex=4)
-            if len(mesh.faces) > 10000:
-                mesh = mesh.simplify_quadratic_decimation(int(len(mesh.faces) * 0.8))
-            mesh.remove_duplicate_faces()
-            mesh.remove_unreferenced_vertices()
+            # One validating pass drops degenerate/duplicate faces and unreferenced vertices
+            mesh.process(validate=True)
+            if kwargs.get('decimate', True) and len(mesh.faces) > kwargs.get('decimate_threshold', 10000):
+                target_faces = kwargs.get('target_faces', int(len(mesh.faces) * 0.8))
+                vertices, faces = simplify(mesh.vertices, mesh.faces, target_faces)
+                if len(faces) != len(mesh.faces):
+                    mesh = trimesh.Trimesh(vertices=vertices, faces=faces)
         file_type = 'glb' if binary else 'gltf'
         mesh.export(
             output_path,
@@ -159,19 +230,13 @@ class GLTFExporter(BaseExporter):
             Path: Path to the exported file
         """
         if hasattr(model_data, 'download_path'):
-            from shutil import copyfile
             if model_data.download_path.endswith('.glb'):
-                copyfile(model_data.download_path, output_path)
+                copy_file(model_data.download_path, output_path)
                 return output_path
-        logger.info("Converting 3D Gaussian model to mesh for GLTF export")
-        
-        placeholder_mesh = {
-            'mesh': {
-                'vertices': np.random.rand(1000, 3) * 2 - 1,  # Random vertices just to generate a mesh
-                'faces': np.random.randint(0, 999, (500, 3)),  # Random faces
-                'colors': np.random.rand(1000, 4)  # Random colors with alpha
-            }
-        }
+        # Gaussian splats have no surface to convert; export the placeholder cube rather
+        # than fabricating (and then decimating) a random mesh
+        logger.warning("3D Gaussian to mesh conversion is not supported, exporting placeholder")
+        placeholder_mesh = {'mesh': UNIT_CUBE}
         return self._export_mesh(placeholder_mesh, output_path, **kwargs)
     
     def _export_generic(self, model_data, output_path, **kwargs):
@@ -195,19 +260,7 @@ class GLTFExporter(BaseExporter):
             return self._export_mesh(mesh_data, output_path, **kwargs)
             
         else:
-            placeholder_mesh = {
-                'mesh': {
-                    'vertices': np.array([
-                        [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
-                        [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
-                    ]),
-                    'faces': np.array([
-                        [0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7],
-                        [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
-                        [0, 3, 7], [0, 7, 4], [1, 2, 6], [1, 6, 5]
-                    ])
-                }
-            }
+            placeholder_mesh = {'mesh': UNIT_CUBE}
             logger.warning("Could not find valid 3D data in the model, exporting placeholder")
             return self._export_mesh(placeholder_mesh, output_path, **kwargs)
     
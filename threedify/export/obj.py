@@ -7,11 +7,90 @@ import os
 import logging
 from typing import Any, Dict, Optional, Union
 from pathlib import Path
+from types import SimpleNamespace
+from functools import lru_cache
 import numpy as np
 
 from threedify.export.base import BaseExporter
+from threedify.export._files import ensure_parent
+from threedify.export._mesh import (UNIT_CUBE, merge_vertices, optimize_topology,
+                                    remove_duplicate_faces, remove_unreferenced_vertices, simplify,
+                                    vertex_normals, write_rows)
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _trimesh():
+    import trimesh
+    return trimesh
+
+@lru_cache(maxsize=None)
+def _plyfile():
+    import plyfile
+    return plyfile
+
+def _read_ply_mesh(path):
+    """Read the vertex and face arrays of a PLY mesh with plyfile, without a trimesh object.
+    Args:
+        path (str): Path to the PLY file
+    Returns:
+        dict: Mesh data with vertices, faces and, when present, colors; None if the
+            PLY has no faces
+    """
+    data = _plyfile().PlyData.read(path)
+    if 'face' not in data or not data['face'].count:
+        return None
+    vertex = data['vertex']
+    mesh_data = {
+        'vertices': np.stack([vertex[axis] for axis in ('x', 'y', 'z')], axis=1),
+        'faces': np.vstack(data['face']['vertex_indices']),
+    }
+    names = vertex.data.dtype.names
+    if all(channel in names for channel in ('red', 'green', 'blue')):
+        mesh_data['colors'] = np.stack([vertex[channel] for channel in ('red', 'green', 'blue')], axis=1)
+    return mesh_data
+
+@lru_cache(maxsize=None)
+def _pil_image():
+    from PIL import Image
+    return Image
+
+def _write_obj(path, vertices, faces, normals=None, uvs=None, colors=None, precision=None):
+    """Write a mesh to OBJ without a material library.
+    The normals, uvs and colors are per vertex, so every face corner uses the same
+    index into the v, vt and vn lists and no corner-tuple lookup is needed.
+    Args:
+        path (Path): Path to save the output file
+        vertices (np.ndarray): (V, 3) vertex positions
+        faces (np.ndarray): (F, 3) vertex indices
+        normals (np.ndarray): Optional (V, 3) vertex normals
+        uvs (np.ndarray): Optional (V, 2) texture coordinates
+        colors (np.ndarray): Optional (V, 3+) vertex colors, 0-255 or 0-1
+        precision (int): Decimal places per value; None writes 8, as trimesh does
+    """
+    vertices = np.asarray(vertices, dtype=np.float64)
+    if colors is not None:
+        colors = np.asarray(colors)[:, :3]
+        if np.issubdtype(colors.dtype, np.integer):
+            colors = colors / 255.0
+        vertices = np.hstack([vertices, colors])
+    faces = np.asarray(faces) + 1
+    value = f' %.{8 if precision is None else precision}f'
+    with open(path, 'w', encoding='utf-8') as fh:
+        write_rows(fh, 'v' + value * vertices.shape[1] + '\n', vertices)
+        if uvs is not None:
+            write_rows(fh, 'vt' + value * 2 + '\n', np.asarray(uvs, dtype=np.float64))
+        if normals is not None:
+            write_rows(fh, 'vn' + value * 3 + '\n', np.asarray(normals, dtype=np.float64))
+        # 'v', 'v/vt', 'v//vn' or 'v/vt/vn' corners, all repeating the vertex's index
+        corner, repeat = {
+            (False, False): ('%d', 1),
+            (True, False): ('%d/%d', 2),
+            (False, True): ('%d//%d', 2),
+            (True, True): ('%d/%d/%d', 3),
+        }[uvs is not None, normals is not None]
+        face_format = 'f' + (' ' + corner) * faces.shape[1] + '\n'
+        write_rows(fh, face_format, np.repeat(faces, repeat, axis=1))
+
 class OBJExporter(BaseExporter):
     """Exporter for OBJ format."""
     def export(self, model_data: Any, output_path: Union[str, Path], **kwargs) -> Path:
@@ -23,6 +102,8 @@ class OBJExporter(BaseExporter):
                 - mtl (bool): Generate MTL file for materials
                 - texture_path (str): Path to texture image
                 - optimize (bool): Optimize the mesh before export  
+                - precision (int): Decimal places written per coordinate (default None,
+                  8 decimal places as trimesh writes them)
         Returns:
             Path: Path to the exported file
         """
@@ -34,21 +115,25 @@ class OBJExporter(BaseExporter):
         generate_mtl = kwargs.get('mtl', True)
         texture_path = kwargs.get('texture_path', None)
         optimize = kwargs.get('optimize', True)
-        os.makedirs(output_path.parent, exist_ok=True)
+        precision = kwargs.get('precision', None)
+        ensure_parent(output_path)
         
         try:
             if hasattr(model_data, 'mesh'):
                 return self._export_mesh(model_data, output_path, 
                                      generate_mtl=generate_mtl, 
                                      texture_path=texture_path,
-                                     optimize=optimize)
+                                     optimize=optimize,
+                                     precision=precision)
             elif hasattr(model_data, 'gaussian') and model_data.gaussian:
                 logger.info("Converting Gaussian model to mesh for OBJ export")
                 return self._export_gaussian_as_mesh(model_data, output_path,
-                                                generate_mtl=generate_mtl)
+                                                generate_mtl=generate_mtl,
+                                                precision=precision)
             else:
                 return self._export_generic(model_data, output_path,
-                                        generate_mtl=generate_mtl)
+                                        generate_mtl=generate_mtl,
+                                        precision=precision)
                 
         except Exception as e:
             logger.error(f"Failed to export model to OBJ: {str(e)}")
@@ -66,58 +151,88 @@ class OBJExporter(BaseExporter):
         generate_mtl = kwargs.get('generate_mtl', True)
         texture_path = kwargs.get('texture_path', None)
         optimize = kwargs.get('optimize', True)
+        precision = kwargs.get('precision', None)
         try:
-            import trimesh
+            trimesh = _trimesh()
         except ImportError:
             logger.error("trimesh is required for OBJ export")
             raise ImportError("trimesh is required for OBJ export. Install with: pip install trimesh")
         if hasattr(model_data, 'mesh') and isinstance(model_data.mesh, dict):
             mesh_data = model_data.mesh
         else:
-            mesh_data = {
-                'vertices': np.array([
-                    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
-                    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
-                ]),
-                'faces': np.array([
-                    [0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7],
-                    [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
-                    [0, 3, 7], [0, 7, 4], [1, 2, 6], [1, 6, 5]
-                ])
-            }
+            mesh_data = UNIT_CUBE
+        vertices = np.asarray(mesh_data.get('vertices'))
+        faces = np.asarray(mesh_data.get('faces'))
+        colors = mesh_data.get('colors')
+        uvs = mesh_data.get('uvs')
+        normals = mesh_data.get('normals')
+        if optimize:
+            logger.info("Optimizing mesh...")
+            # Vectorized clean-up on the raw arrays, before trimesh sees the mesh
+            n_vertices = len(vertices)
+            uvs = uvs if uvs is not None and len(uvs) == n_vertices else None
+            colors = colors if colors is not None and len(colors) == n_vertices else None
+            normals = normals if normals is not None and len(normals) == n_vertices else None
+            vertices, faces, index = merge_vertices(vertices, faces, uvs=uvs)
+            faces = remove_duplicate_faces(faces)
+            vertices, faces, kept = remove_unreferenced_vertices(vertices, faces)
+            index = index[kept]
+            if colors is not None:
+                colors = np.asarray(colors)[index]
+            if uvs is not None:
+                uvs = np.asarray(uvs)[index]
+            if normals is not None:
+                normals = np.asarray(normals)[index]
+            if len(faces) > 10000:
+                vertices, faces = simplify(vertices, faces, int(len(faces) * 0.8))
+                # Decimation moves and drops vertices, so per-vertex attributes no longer apply
+                colors = uvs = normals = None
+            vertices, faces, index = optimize_topology(vertices, faces)
+            if colors is not None:
+                colors = colors[index]
+            if uvs is not None:
+                uvs = uvs[index]
+            if normals is not None:
+                normals = normals[index]
         mesh = trimesh.Trimesh(
-            vertices=mesh_data.get('vertices'),
-            faces=mesh_data.get('faces')
+            vertices=vertices,
+            faces=faces
         )
-        if 'colors' in mesh_data and mesh_data['colors'] is not None:
-            mesh.visual.vertex_colors = mesh_data['colors']
-        if 'uvs' in mesh_data and mesh_data['uvs'] is not None:
-            mesh.visual.uv = mesh_data['uvs']
+        if colors is not None:
+            mesh.visual.vertex_colors = colors
+        if uvs is not None:
+            mesh.visual.uv = uvs
+        # Reuse the model's own normals; otherwise compute them once, vectorized
+        if normals is None or len(normals) != len(mesh.vertices):
+            normals = vertex_normals(mesh.vertices, mesh.faces)
         if texture_path and os.path.exists(texture_path):
             try:
-                from PIL import Image
-                texture_img = Image.open(texture_path)
+                texture_img = _pil_image().open(texture_path)
             except Exception as e:
                 logger.warning(f"Failed to load texture: {str(e)}")
-        
-        if optimize:
-            logger.info("Optimizing mesh...")
-            mesh = mesh.merge_vertices(digits_vertex=4)
-            if len(mesh.faces) > 10000:
-                mesh = mesh.simplify_quadratic_decimation(int(len(mesh.faces) * 0.8))
-            mesh.remove_duplicate_faces()
-            mesh.remove_unreferenced_vertices()
+
         mtl_path = None
         if generate_mtl:
             mtl_path = output_path.with_suffix('.mtl')
-        mesh.export(
-            output_path,
-            file_type='obj',
-            include_normals=True,
-            include_texture=texture_path is not None,
-            mtl_name=mtl_path.name if mtl_path else None,
-            resolver=None
-        )
+        if texture_path is None and mesh_data.get('texture') is None:
+            # Nothing to put in a material library, so write the arrays directly
+            visual = mesh.visual
+            _write_obj(output_path, mesh.vertices, mesh.faces,
+                       normals=normals,
+                       uvs=getattr(visual, 'uv', None),
+                       colors=visual.vertex_colors if visual.kind == 'vertex' else None,
+                       precision=precision)
+        else:
+            mesh.vertex_normals = normals
+            mesh.export(
+                output_path,
+                file_type='obj',
+                include_normals=True,
+                include_texture=texture_path is not None,
+                mtl_name=mtl_path.name if mtl_path else None,
+                resolver=None,
+                digits=8 if precision is None else precision
+            )
         logger.info(f"Exported mesh with {len(mesh.vertices)} vertices and {len(mesh.faces)} faces")
         return output_path
     
@@ -133,19 +248,24 @@ class OBJExporter(BaseExporter):
         if hasattr(model_data, 'download_path'):
             if model_data.download_path.endswith('.ply'):
                 try:
-                    import trimesh
-                    mesh = trimesh.load(model_data.download_path)
+                    mesh_data = _read_ply_mesh(model_data.download_path)
+                except ImportError:
+                    mesh_data = None
+                except Exception as e:
+                    logger.warning(f"plyfile could not read the PLY, trying trimesh: {str(e)}")
+                    mesh_data = None
+                if mesh_data is not None:
+                    # Straight from the PLY arrays to the OBJ writer, converting as stored
+                    return self._export_mesh(SimpleNamespace(mesh=mesh_data), output_path,
+                                             **{**kwargs, 'optimize': False})
+                try:
+                    mesh = _trimesh().load(model_data.download_path)
                     mesh.export(output_path, file_type='obj')
                     return output_path
                 except Exception as e:
                     logger.warning(f"Failed to convert PLY to OBJ: {str(e)}")
-        placeholder_mesh = {
-            'mesh': {
-                'vertices': np.random.rand(1000, 3) * 2 - 1,  # Random vertices, yeah well again!
-                'faces': np.random.randint(0, 999, (500, 3)),  # Random faces
-                'colors': np.random.rand(1000, 4)  # Random colors with alpha
-            }
-        }
+        logger.warning("Gaussian model has no PLY to convert, exporting placeholder")
+        placeholder_mesh = {'mesh': UNIT_CUBE}
         return self._export_mesh(placeholder_mesh, output_path, **kwargs)
     
     def _export_generic(self, model_data, output_path, **kwargs):
@@ -169,19 +289,7 @@ class OBJExporter(BaseExporter):
             return self._export_mesh(mesh_data, output_path, **kwargs)
             
         else:
-            placeholder_mesh = {
-                'mesh': {
-                    'vertices': np.array([
-                        [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
-                        [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
-                    ]),
-                    'faces': np.array([
-                        [0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7],
-                        [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
-                        [0, 3, 7], [0, 7, 4], [1, 2, 6], [1, 6, 5]
-                    ])
-                }
-            }
+            placeholder_mesh = {'mesh': UNIT_CUBE}
             logger.warning("Could not find valid 3D data in the model, exporting placeholder")
             return self._export_mesh(placeholder_mesh, output_path, **kwargs)
     
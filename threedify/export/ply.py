@@ -2,15 +2,222 @@
 This module provides functionality for exporting 3D models to PLY format.
 """
 
-import os
 import logging
 from typing import Any, Dict, Optional, Union
 from pathlib import Path
 import numpy as np
 
 from threedify.export.base import BaseExporter
+from threedify.export._files import copy_file, ensure_parent
+from threedify.export._mesh import UNIT_CUBE, optimize_topology, vertex_normals, write_rows
 logger = logging.getLogger(__name__)
 
+def _ply_colors(colors):
+    """Convert colors to 8-bit channels, accepting 0-255 or 0-1 ranges."""
+    colors = np.asarray(colors)
+    if np.issubdtype(colors.dtype, np.integer):
+        return colors
+    if colors.max() <= 1.0:
+        colors = colors * 255.0
+    return np.clip(np.rint(colors), 0, 255)
+
+# Header comments holding the int16 position scale and per-axis offset of quantized
+# files; positions ~= quantized * scale + offset
+_SCALE_COMMENT = 'quantization_scale'
+_OFFSET_COMMENT = 'quantization_offset'
+
+# Vertices converted per block while quantizing an existing PLY
+_QUANTIZE_BLOCK_ROWS = 1 << 20
+
+_PLY_DTYPES = {
+    'char': 'i1', 'uchar': 'u1', 'short': '<i2', 'ushort': '<u2',
+    'int': '<i4', 'uint': '<u4', 'float': '<f4', 'double': '<f8',
+    'int8': 'i1', 'uint8': 'u1', 'int16': '<i2', 'uint16': '<u2',
+    'int32': '<i4', 'uint32': '<u4', 'float32': '<f4', 'float64': '<f8',
+}
+
+def _quantization_scale(extent):
+    """Scale mapping coordinates within +-extent onto the int16 range."""
+    return max(extent, 1e-6) / 32767
+
+def _quantization_frame(low, high):
+    """Offset and scale mapping the box [low, high] onto the int16 range.
+    Centring on the box keeps the step small for georeferenced data far from the origin.
+    Args:
+        low (np.ndarray): (3,) per-axis minimum
+        high (np.ndarray): (3,) per-axis maximum
+    Returns:
+        tuple: (offset, scale) with the (3,) float64 box centre and one scale for all axes
+    """
+    low, high = np.asarray(low, dtype=np.float64), np.asarray(high, dtype=np.float64)
+    return (low + high) / 2, _quantization_scale(float(np.max(high - low)) / 2)
+
+def _quantization_comments(offset, scale):
+    """Header comment lines recording a quantization scale and offset."""
+    return [f'comment {_SCALE_COMMENT} {scale!r}',
+            'comment {} {!r} {!r} {!r}'.format(_OFFSET_COMMENT, *offset.tolist())]
+
+def _quantize_positions(positions):
+    """Quantize positions to int16 around their bounding box centre.
+    Args:
+        positions (np.ndarray): (N, 3) float positions
+    Returns:
+        tuple: (int16 positions, offset, scale) where positions ~= quantized * scale + offset
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    if not len(positions):
+        return np.empty((0, 3), dtype='<i2'), np.zeros(3), _quantization_scale(0.0)
+    offset, scale = _quantization_frame(positions.min(axis=0), positions.max(axis=0))
+    return np.rint((positions - offset) / scale).astype('<i2'), offset, scale
+
+def _quantize_ply(src, dst):
+    """Rewrite a binary vertex-only PLY (e.g. a Gaussian splat) with int16 positions.
+    The source is memory-mapped and converted block by block, so every other vertex
+    property is carried over without loading the whole file.
+    Args:
+        src (str or Path): Source PLY file
+        dst (str or Path): Destination PLY file
+    Raises:
+        ValueError: If the file is not a binary little-endian PLY with a single vertex
+            element of scalar x/y/z properties
+    """
+    with open(src, 'rb') as fh:
+        header = []
+        while not header or header[-1] != 'end_header':
+            line = fh.readline()
+            if not line:
+                raise ValueError("PLY header is not terminated")
+            header.append(line.decode('ascii').rstrip('\r\n'))
+        offset = fh.tell()
+    if header[0] != 'ply' or 'format binary_little_endian 1.0' not in header:
+        raise ValueError("not a binary little-endian PLY")
+    elements = [line for line in header if line.startswith('element ')]
+    if len(elements) != 1 or elements[0].split()[1] != 'vertex':
+        raise ValueError("expected a single vertex element")
+    count = int(elements[0].split()[2])
+    fields = []
+    for line in header:
+        if line.startswith('property '):
+            parts = line.split()
+            if parts[1] == 'list' or parts[1] not in _PLY_DTYPES:
+                raise ValueError(f"unsupported property: {line}")
+            fields.append((parts[2], _PLY_DTYPES[parts[1]]))
+    names = [name for name, _ in fields]
+    if not all(axis in names for axis in 'xyz'):
+        raise ValueError("vertex element has no x/y/z properties")
+    source = np.memmap(src, dtype=fields, mode='r', offset=offset, shape=(count,))
+    if count:
+        offset, scale = _quantization_frame([source[axis].min() for axis in 'xyz'],
+                                            [source[axis].max() for axis in 'xyz'])
+    else:
+        offset, scale = np.zeros(3), _quantization_scale(0.0)
+    quantized = [(name, '<i2' if name in ('x', 'y', 'z') else dtype) for name, dtype in fields]
+    out_header = []
+    for line in header:
+        parts = line.split()
+        if parts[0] == 'property' and parts[2] in ('x', 'y', 'z'):
+            line = f'property short {parts[2]}'
+        out_header.append(line)
+        if parts[0] == 'format':
+            out_header.extend(_quantization_comments(offset, scale))
+    with open(dst, 'wb') as fh:
+        fh.write(('\n'.join(out_header) + '\n').encode('ascii'))
+        for start in range(0, count, _QUANTIZE_BLOCK_ROWS):
+            block = source[start:start + _QUANTIZE_BLOCK_ROWS]
+            record = np.empty(len(block), dtype=quantized)
+            for name in names:
+                if name in ('x', 'y', 'z'):
+                    axis_offset = offset['xyz'.index(name)]
+                    record[name] = np.rint((block[name].astype(np.float64) - axis_offset) / scale)
+                else:
+                    record[name] = block[name]
+            record.tofile(fh)
+
+def _write_ply(path, vertices, faces=None, normals=None, colors=None, binary=True, precision=None,
+               quantize=False):
+    """Write vertices (and faces) to a PLY file with whole-array writes.
+    Args:
+        path (Path): Path to save the output file
+        vertices (np.ndarray): (N, 3) positions; float32 input stays float32, else double
+        faces (np.ndarray): Optional (F, k) vertex indices
+        normals (np.ndarray): Optional (N, 3) normals
+        colors (np.ndarray): Optional (N, 3) or (N, 4) colors, 0-255 or 0-1
+        binary (bool): Write binary little-endian rather than ASCII
+        precision (int): Decimal places per ASCII coordinate or normal; None writes
+            the shortest repr that round-trips
+        quantize (bool): Store positions as int16 with one scale and a per-axis offset,
+            recorded in header comments
+    """
+    vertices = np.asarray(vertices)
+    comments = []
+    if quantize:
+        vertices, offset, scale = _quantize_positions(vertices)
+        comments.extend(_quantization_comments(offset, scale))
+        coord = '<i2'
+    else:
+        coord = '<f4' if vertices.dtype == np.float32 else '<f8'
+    fields = [('x', coord), ('y', coord), ('z', coord)]
+    if normals is not None:
+        fields += [('nx', '<f4'), ('ny', '<f4'), ('nz', '<f4')]
+    if colors is not None:
+        colors = _ply_colors(colors)
+        fields += [(name, 'u1') for name in ('red', 'green', 'blue', 'alpha')[:colors.shape[1]]]
+    record = np.empty(len(vertices), dtype=fields)
+    for i, axis in enumerate('xyz'):
+        record[axis] = vertices[:, i]
+    if normals is not None:
+        normals = np.asarray(normals)
+        for i, name in enumerate(('nx', 'ny', 'nz')):
+            record[name] = normals[:, i]
+    if colors is not None:
+        for i, name in enumerate(('red', 'green', 'blue', 'alpha')[:colors.shape[1]]):
+            record[name] = colors[:, i]
+    ply_types = {'<f4': 'float', '<f8': 'double', 'u1': 'uchar', '<i2': 'short'}
+    encoding = 'binary_little_endian' if binary else 'ascii'
+    header = ['ply', f'format {encoding} 1.0', *comments, f'element vertex {len(record)}']
+    header += [f'property {ply_types[dtype]} {name}' for name, dtype in fields]
+    if faces is not None:
+        faces = np.asarray(faces)
+        header += [f'element face {len(faces)}', 'property list uchar int vertex_indices']
+    header.append('end_header\n')
+    if not binary:
+        with open(path, 'w', encoding='ascii') as fh:
+            fh.write('\n'.join(header))
+            value = '%r' if precision is None else f'%.{precision}f'
+            row_format = ' '.join('%d' if dtype in ('u1', '<i2') else value
+                                  for _, dtype in fields) + '\n'
+            columns = np.column_stack([record[name].astype(np.float64) for name, _ in fields])
+            write_rows(fh, row_format, columns)
+            if faces is not None:
+                face_format = '%d' + ' %d' * faces.shape[1] + '\n'
+                write_rows(fh, face_format, np.hstack([np.full((len(faces), 1), faces.shape[1]), faces]))
+        return
+    with open(path, 'wb') as fh:
+        fh.write('\n'.join(header).encode('ascii'))
+        record.tofile(fh)
+        if faces is not None:
+            # Each face is a count byte followed by its indices, as one packed record
+            face_record = np.empty(len(faces), dtype=[('count', 'u1'), ('vertex_indices', '<i4', (faces.shape[1],))])
+            face_record['count'] = faces.shape[1]
+            face_record['vertex_indices'] = faces
+            face_record.tofile(fh)
+
+class PointCloudData:
+    """Point cloud gathered from a generic model for export."""
+    __slots__ = ('point_cloud', 'colors', 'normals', 'type')
+
+    def __init__(self, point_cloud, colors=None, normals=None):
+        """Initialize the point cloud.
+        Args:
+            point_cloud (np.ndarray): (N, 3) point positions
+            colors (np.ndarray): Optional (N, 3) or (N, 4) colors
+            normals (np.ndarray): Optional (N, 3) normals
+        """
+        self.point_cloud = point_cloud
+        self.colors = colors
+        self.normals = normals
+        self.type = 'point_cloud'
+
 class PLYExporter(BaseExporter):
     """Exporter for PLY format."""
     def export(self, model_data: Any, output_path: Union[str, Path], **kwargs) -> Path:
@@ -22,6 +229,12 @@ class PLYExporter(BaseExporter):
                 - binary (bool): Use binary format instead of ASCII
                 - normals (bool): Include normals if available
                 - color (bool): Include colors if available     
+                - optimize (bool): Reorder mesh faces and vertices for cache locality
+                - precision (int): Decimal places per ASCII value, as for CityGML export
+                  (default None, full round-trip precision)
+                - quantize (bool): Store positions as int16 around the model's bounding box
+                  centre, with the scale and offset kept in 'quantization_scale' and
+                  'quantization_offset' header comments (default False)
         Returns:
             Path: Path to the exported file
         """
@@ -32,33 +245,41 @@ class PLYExporter(BaseExporter):
         binary = kwargs.get('binary', True)
         include_normals = kwargs.get('normals', True)
         include_colors = kwargs.get('color', True)
-        os.makedirs(output_path.parent, exist_ok=True)
+        optimize = kwargs.get('optimize', True)
+        precision = kwargs.get('precision', None)
+        quantize = kwargs.get('quantize', False)
+        ensure_parent(output_path)
         try:
             if hasattr(model_data, 'point_cloud'):
                 return self._export_point_cloud(model_data, output_path, 
                                            binary=binary, 
                                            include_normals=include_normals,
-                                           include_colors=include_colors)
+                                           include_colors=include_colors,
+                                           precision=precision,
+                                           quantize=quantize)
             elif hasattr(model_data, 'mesh'):
                 return self._export_mesh(model_data, output_path, 
                                      binary=binary, 
                                      include_normals=include_normals,
-                                     include_colors=include_colors)
+                                     include_colors=include_colors,
+                                     optimize=optimize,
+                                     precision=precision,
+                                     quantize=quantize)
             elif hasattr(model_data, 'gaussian') and model_data.gaussian:
-                if hasattr(model_data, 'download_path') and model_data.download_path.endswith('.ply'):
-                    from shutil import copyfile
-                    copyfile(model_data.download_path, output_path)
-                    return output_path
-                else:
-                    return self._export_gaussian(model_data, output_path, 
-                                             binary=binary, 
-                                             include_normals=include_normals,
-                                             include_colors=include_colors)
+                return self._export_gaussian(model_data, output_path, 
+                                         binary=binary, 
+                                         include_normals=include_normals,
+                                         include_colors=include_colors,
+                                         precision=precision,
+                                         quantize=quantize)
             else:
                 return self._export_generic(model_data, output_path,
                                         binary=binary, 
                                         include_normals=include_normals,
-                                        include_colors=include_colors)
+                                        include_colors=include_colors,
+                                        optimize=optimize,
+                                        precision=precision,
+                                        quantize=quantize)
         except Exception as e:
             logger.error(f"Failed to export model to PLY: {str(e)}")
             raise
@@ -74,17 +295,6 @@ class PLYExporter(BaseExporter):
         binary = kwargs.get('binary', True)
         include_normals = kwargs.get('normals', True)
         include_colors = kwargs.get('colors', True)
-        try:
-            import trimesh
-            use_trimesh = True
-        except ImportError:
-            use_trimesh = False
-            try:
-                import open3d as o3d
-                use_open3d = True
-            except ImportError:
-                logger.error("Either trimesh or open3d is required for PLY export")
-                raise ImportError("Either trimesh or open3d is required for PLY export.")
         if hasattr(model_data, 'point_cloud'):
             points = model_data.point_cloud
             colors = None
@@ -97,33 +307,9 @@ class PLYExporter(BaseExporter):
             points = np.random.randn(1000, 3)
             colors = np.random.rand(1000, 3) if include_colors else None
             normals = None
-        if use_trimesh:
-            cloud = trimesh.PointCloud(
-                vertices=points,
-                colors=colors
-            )
-            cloud.export(
-                output_path,
-                file_type='ply',
-                encoding='binary' if binary else 'ascii',
-                include_normals=normals is not None
-            )
-            
-        else:  # use open3d
-            pcd = o3d.geometry.PointCloud()
-            pcd.points = o3d.utility.Vector3dVector(points)
-            if colors is not None:
-                if colors.max() > 1.0:
-                    colors = colors / 255.0
-                pcd.colors = o3d.utility.Vector3dVector(colors)
-            if normals is not None:
-                pcd.normals = o3d.utility.Vector3dVector(normals)
-            o3d.io.write_point_cloud(
-                str(output_path),
-                pcd,
-                write_ascii=not binary,
-                compressed=False
-            )
+        # Structured array written in one go; no trimesh/open3d copy of the cloud
+        _write_ply(output_path, points, normals=normals, colors=colors, binary=binary,
+                   precision=kwargs.get('precision', None), quantize=kwargs.get('quantize', False))
         logger.info(f"Exported point cloud with {len(points)} points")
         return output_path
     
@@ -139,66 +325,23 @@ class PLYExporter(BaseExporter):
         binary = kwargs.get('binary', True)
         include_normals = kwargs.get('normals', True)
         include_colors = kwargs.get('colors', True)
-        try:
-            import trimesh
-            use_trimesh = True
-        except ImportError:
-            use_trimesh = False
-            try:
-                import open3d as o3d
-                use_open3d = True
-            except ImportError:
-                logger.error("Either trimesh or open3d is required for PLY export")
-                raise ImportError("Either trimesh or open3d is required for PLY export.")
         if hasattr(model_data, 'mesh') and isinstance(model_data.mesh, dict):
             mesh_data = model_data.mesh
         else:
-            mesh_data = {
-                'vertices': np.array([
-                    [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
-                    [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
-                ]),
-                'faces': np.array([
-                    [0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7],
-                    [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
-                    [0, 3, 7], [0, 7, 4], [1, 2, 6], [1, 6, 5]
-                ])
-            }
+            mesh_data = UNIT_CUBE
         vertices = mesh_data.get('vertices')
         faces = mesh_data.get('faces')
         colors = None
         if include_colors and 'colors' in mesh_data and mesh_data['colors'] is not None:
             colors = mesh_data['colors']
-        if use_trimesh:
-            mesh = trimesh.Trimesh(
-                vertices=vertices,
-                faces=faces
-            )
-            if colors is not None:
-                mesh.visual.vertex_colors = colors
-            mesh.export(
-                output_path,
-                file_type='ply',
-                encoding='binary' if binary else 'ascii',
-                include_normals=include_normals
-            )
-            
-        else:  # use open3d again
-            mesh = o3d.geometry.TriangleMesh()
-            mesh.vertices = o3d.utility.Vector3dVector(vertices)
-            mesh.triangles = o3d.utility.Vector3iVector(faces)
-            if colors is not None:
-                if colors.max() > 1.0:
-                    colors = colors / 255.0
-                mesh.vertex_colors = o3d.utility.Vector3dVector(colors[:, :3])
-            if include_normals:
-                mesh.compute_vertex_normals()
-            o3d.io.write_triangle_mesh(
-                str(output_path),
-                mesh,
-                write_ascii=not binary,
-                compressed=False
-            )
+        if kwargs.get('optimize', True):
+            n_vertices = len(vertices)
+            vertices, faces, index = optimize_topology(vertices, faces)
+            if colors is not None and len(colors) == n_vertices:
+                colors = np.asarray(colors)[index]
+        normals = vertex_normals(vertices, faces) if include_normals else None
+        _write_ply(output_path, vertices, faces=faces, normals=normals, colors=colors, binary=binary,
+                   precision=kwargs.get('precision', None), quantize=kwargs.get('quantize', False))
         logger.info(f"Exported mesh with {len(vertices)} vertices and {len(faces)} faces")
         return output_path
     
@@ -212,19 +355,18 @@ class PLYExporter(BaseExporter):
             Path: Path to the exported file
         """
         if hasattr(model_data, 'download_path') and model_data.download_path.endswith('.ply'):
-            from shutil import copyfile
-            copyfile(model_data.download_path, output_path)
+            if kwargs.get('quantize', False):
+                try:
+                    _quantize_ply(model_data.download_path, output_path)
+                    return output_path
+                except ValueError as e:
+                    logger.warning(f"Cannot quantize this PLY ({str(e)}), copying it unchanged")
+            copy_file(model_data.download_path, output_path)
             return output_path
-        logger.info("Converting Gaussian model to point cloud for PLY export")
-        n_points = 5000
-        points = np.random.randn(n_points, 3)
-        colors = np.random.rand(n_points, 3)
-        placeholder_data = type('PointCloudData', (), {
-            'point_cloud': points,
-            'colors': colors,
-            'type': 'point_cloud'
-        })
-        return self._export_point_cloud(placeholder_data, output_path, **kwargs)
+        # Without the source PLY there is nothing to convert; export the placeholder cube
+        # rather than fabricating a random point cloud
+        logger.warning("Gaussian model has no PLY to copy, exporting placeholder")
+        return self._export_mesh({'mesh': UNIT_CUBE}, output_path, **kwargs)
     
     def _export_generic(self, model_data, output_path, **kwargs):
         """Export generic model data to PLY.
@@ -247,31 +389,16 @@ class PLYExporter(BaseExporter):
             return self._export_mesh(mesh_data, output_path, **kwargs)
             
         elif hasattr(model_data, 'points') or hasattr(model_data, 'point_cloud'):
-            points = getattr(model_data, 'points', None) or getattr(model_data, 'point_cloud', None)
-            pc_data = type('PointCloudData', (), {
-                'point_cloud': points,
-                'type': 'point_cloud'
-            })
-            if hasattr(model_data, 'colors'):
-                pc_data.colors = getattr(model_data, 'colors')
-            if hasattr(model_data, 'normals'):
-                pc_data.normals = getattr(model_data, 'normals')
+            points = getattr(model_data, 'points', None)
+            if points is None:
+                points = getattr(model_data, 'point_cloud', None)
+            pc_data = PointCloudData(points,
+                                     colors=getattr(model_data, 'colors', None),
+                                     normals=getattr(model_data, 'normals', None))
             return self._export_point_cloud(pc_data, output_path, **kwargs)
             
         else:
-            placeholder_mesh = {
-                'mesh': {
-                    'vertices': np.array([
-                        [0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0],
-                        [0, 0, 1], [1, 0, 1], [1, 1, 1], [0, 1, 1]
-                    ]),
-                    'faces': np.array([
-                        [0, 1, 2], [0, 2, 3], [4, 5, 6], [4, 6, 7],
-                        [0, 1, 5], [0, 5, 4], [2, 3, 7], [2, 7, 6],
-                        [0, 3, 7], [0, 7, 4], [1, 2, 6], [1, 6, 5]
-                    ])
-                }
-            }
+            placeholder_mesh = {'mesh': UNIT_CUBE}
             logger.warning("Could not find valid 3D data in the model, exporting placeholder")
             return self._export_mesh(placeholder_mesh, output_path, **kwargs)
     
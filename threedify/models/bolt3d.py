@@ -7,20 +7,53 @@ import tempfile
 from typing import Any, Dict, Optional, Union, List, Tuple
 from pathlib import Path
 import time
+from functools import lru_cache
 import numpy as np
-from PIL import Image
 
 from threedify.models.base import BaseModel
 
-try:
-    from gradio_client import Client
-except ImportError:
-    raise ImportError(
-        "gradio_client is required for API access to Bolt3D. "
-        "Install it with: pip install gradio_client"
-    )
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _gradio_client():
+    """Import gradio_client on first API use; it is slow to import and only needed online."""
+    try:
+        import gradio_client
+    except ImportError:
+        raise ImportError(
+            "gradio_client is required for API access to Bolt3D. "
+            "Install it with: pip install gradio_client"
+        ) from None
+    return gradio_client
+
+class Bolt3DResult:
+    """Result of a Bolt3D generation: the mesh arrays (if parsed) and the GLB they came from."""
+    __slots__ = ('mesh', 'format', 'original_path', 'type')
+
+    def __init__(self, mesh: Optional[Dict[str, Any]], format: str, original_path: str):
+        """Initialize the result.
+        Args:
+            mesh (dict): Mesh data (vertices, faces, optional texture and uvs), or None
+            format (str): Format of the generated file ('glb' or 'unknown')
+            original_path (str): Path to the generated file
+        """
+        self.mesh = mesh
+        self.format = format
+        self.original_path = original_path
+        self.type = 'bolt3d_result'
+
+@lru_cache(maxsize=16)
+def _load_glb(path, mtime):
+    """Load a generated GLB once per file version.
+    Args:
+        path (str): Path to the GLB file
+        mtime (float): Modification time of the file, so a rewritten file is reloaded
+    Returns:
+        The loaded trimesh object; shared between callers, so treat it as read-only
+    """
+    import trimesh
+    return trimesh.load(path)
+
 class Bolt3DModel(BaseModel):
     """Bolt3D model for generating 3D models from images using the Splatter Image API.
     This model uses the Hugging Face hosted Splatter Image API to generate 3D models.
@@ -77,7 +110,7 @@ class Bolt3DModel(BaseModel):
         logger.info(f"Connecting to Bolt3D API at {self._api_url}")
 
         # try:
-        self._client = Client(self._api_url)
+        self._client = _gradio_client().Client(self._api_url)
         logger.info("Connected to Bolt3D API successfully")
             
     
@@ -98,12 +131,10 @@ class Bolt3DModel(BaseModel):
             Processed results in a standard format
         """
         if model_path.endswith('.glb'):
-            import trimesh
-            
             try:
-                mesh = trimesh.load(model_path)
-                vertices = np.array(mesh.vertices)
-                faces = np.array(mesh.faces)
+                mesh = _load_glb(model_path, os.path.getmtime(model_path))
+                vertices = np.asarray(mesh.vertices, dtype=np.float32)
+                faces = np.asarray(mesh.faces)
                 mesh_data = {
                     'vertices': vertices,
                     'faces': faces
@@ -113,31 +144,16 @@ class Bolt3DModel(BaseModel):
                         mesh_data['texture'] = mesh.visual.material.image
                 if hasattr(mesh.visual, 'uv'):
                     mesh_data['uvs'] = mesh.visual.uv
-                result = type('Bolt3DResult', (), {
-                    'mesh': mesh_data,
-                    'format': 'glb',
-                    'original_path': model_path,
-                    'type': 'bolt3d_result'
-                })
+                result = Bolt3DResult(mesh_data, 'glb', model_path)
                 return result
                 
             except Exception as e:
                 logger.error(f"Failed to process Bolt3D output: {str(e)}")
-                result = type('Bolt3DResult', (), {
-                    'mesh': None,
-                    'format': 'glb',
-                    'original_path': model_path,
-                    'type': 'bolt3d_result'
-                })               
+                result = Bolt3DResult(None, 'glb', model_path)
                 return result
         else:
             # If it's not a GLB, just return the path
-            result = type('Bolt3DResult', (), {
-                'mesh': None,
-                'format': 'unknown',
-                'original_path': model_path,
-                'type': 'bolt3d_result'
-            })   
+            result = Bolt3DResult(None, 'unknown', model_path)
             return result
     
     def load_weights(self, weights_path: str):
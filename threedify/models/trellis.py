@@ -2,36 +2,122 @@
 """
 
 import os
+import asyncio
+import gc
+import hashlib
+import itertools
+import json
 import logging
+import shutil
 import tempfile
+import threading
 import time
 from typing import Any, Dict, Optional, Union, List, Tuple
 from pathlib import Path
+from functools import lru_cache, partial
 import numpy as np
-from PIL import Image
 
 from threedify.models.base import BaseModel
 
-try:
-    from gradio_client import Client, handle_file
-except ImportError:
-    raise ImportError(
-        "gradio_client is required for API access to TRELLIS. "
-        "Install it with: pip install gradio_client"
-    )
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=None)
+def _gradio_client():
+    """Import gradio_client on first API use; it is slow to import and only needed online."""
+    try:
+        import gradio_client
+    except ImportError:
+        raise ImportError(
+            "gradio_client is required for API access to TRELLIS. "
+            "Install it with: pip install gradio_client"
+        ) from None
+    return gradio_client
+
+class _ClientPool:
+    """Fixed set of gradio clients, handed out round-robin.
+    Each client has its own HTTP connection and API session, so concurrent requests
+    do not queue behind each other on one connection.
+    """
+    def __init__(self, api_url: str, size: int):
+        """Connect `size` clients to the API.
+        Args:
+            api_url (str): URL of the gradio Space
+            size (int): Number of clients
+        """
+        client_class = _gradio_client().Client
+        self.clients = [client_class(api_url) for _ in range(max(1, size))]
+        self.session_started = False
+        # Whether the Space has the batched endpoint; None until view_api has been read
+        self.has_batch_endpoint = None
+        # next() on itertools.count is atomic under the GIL, so threads share it safely
+        self._counter = itertools.count()
+
+    def next(self):
+        """Return the next client in turn."""
+        return self.clients[next(self._counter) % len(self.clients)]
+
+@lru_cache(maxsize=None)
+def _trimesh():
+    import trimesh
+    return trimesh
+
+@lru_cache(maxsize=None)
+def _pil_image():
+    from PIL import Image
+    return Image
+
+# Longest image edge uploaded; the Space resizes inputs itself, so larger uploads only cost bandwidth
+_MAX_UPLOAD_EDGE = 1024
+_UPLOAD_JPEG_QUALITY = 92
+
+# Bytes read per update while hashing an input image
+_HASH_BLOCK = 1 << 20
+
+def _link_or_copy(src, dst):
+    """Hard-link `src` to `dst`, copying instead when they are on different filesystems."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+# Fixed generation settings sent with every request
+_GENERATION_PARAMS = {
+    'is_multiimage': "false",
+    'seed': 0,
+    'ss_guidance_strength': 7.5,
+    'ss_sampling_steps': 12,
+    'slat_guidance_strength': 3,
+    'slat_sampling_steps': 12,
+    'multiimage_algo': "stochastic",
+    'mesh_simplify': 0.95,
+    'texture_size': 1024,
+}
+# Batched variant of /quick_generate_glb, used by generate_batch when the Space exposes it
+_BATCH_ENDPOINT = "/quick_generate_glb_batch"
+
+# One pool per Space and size, shared by every TrellisModel in the process
+_pools: Dict[Tuple[str, int], _ClientPool] = {}
+_pools_lock = threading.Lock()
+
 class TrellisModel(BaseModel):
     """TRELLIS model for generating 3D models from images using the TRELLIS-3D API.
     This model leverages the Hugging Face hosted TRELLIS API for high-quality 3D asset generation.
     """
-    def __init__(self, api_url: str = "Steven18/trellis-3d-api"):
+    def __init__(self, api_url: str = "Steven18/trellis-3d-api", pool_size: int = 4,
+                 cache_dir: Optional[Union[str, Path]] = None, max_cache_gb: float = 5.0):
         """Initialize the TRELLIS model API client.
         Args:
             api_url (str): URL to the TRELLIS-3D API (default uses the official HF space)
+            pool_size (int): Number of API connections used for concurrent requests
+            cache_dir (str or Path): Directory generated models are cached in
+                (default: ~/.cache/threedify/trellis)
+            max_cache_gb (float): Size the cache is trimmed to; 0 disables caching
         """
         self._api_url = api_url
-        self._client = None
+        self._pool_size = pool_size
+        self._cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.cache' / 'threedify' / 'trellis'
+        self._max_cache_bytes = int(max_cache_gb * (1 << 30))
+        self._pool = None
         self._session_active = False
     
     def generate(self, data: Any, **kwargs) -> Any:
@@ -51,68 +137,255 @@ class TrellisModel(BaseModel):
         Returns:
             Generated 3D model data
         """
-        if self._client is None:
-            self._connect_api()
-        if not self._session_active:
-            self._start_session()
-        image_path = self._preprocess(data)
+        cache_key = self._cache_key(data, kwargs)
+        cached = self._cache_lookup(cache_key) if cache_key else None
+        if cached is not None:
+            logger.info(f"Using cached TRELLIS result for {data}")
+            return cached
+        self._ensure_session()
+        image_path, temporary_path = self._preprocess(data)
 
         try:
             logger.info("Preprocessing image")
-            result = self._client.predict(
-                    image=handle_file(image_path),
-                    is_multiimage="false",
-                    seed=0,
-                    ss_guidance_strength=7.5,
-                    ss_sampling_steps=12,
-                    slat_guidance_strength=3,
-                    slat_sampling_steps=12,
-                    multiimage_algo="stochastic",
-                    mesh_simplify=0.95,
-                    texture_size=1024,
+            result = self._pool.next().predict(
+                    image=_gradio_client().handle_file(image_path),
+                    **_GENERATION_PARAMS,
                     api_name="/quick_generate_glb"
             )
             print(f"Result file path: {result}")
             model_path, download_path = result
-
+            if cache_key:
+                return self._cache_store(cache_key, model_path, download_path)
             return model_path, download_path
             
         except Exception as e:
             logger.error(f"API call failed: {str(e)}")
             raise
+        finally:
+            if temporary_path is not None:
+                os.remove(temporary_path)
     
-    def _connect_api(self):
-        """Connect to the TRELLIS API.
+    def _cache_key(self, data, params):
+        """Content hash of an input image and the generation parameters.
+        Args:
+            data: Input data; only image files can be cached
+            params (dict): Generation parameters
+        Returns:
+            str: Hex digest, or None if the result cannot be cached
+        """
+        if self._max_cache_bytes <= 0 or not isinstance(data, (str, Path)) or not os.path.isfile(data):
+            return None
+        digest = hashlib.blake2b(digest_size=20)
+        with open(data, 'rb') as fh:
+            for block in iter(lambda: fh.read(_HASH_BLOCK), b''):
+                digest.update(block)
+        digest.update(json.dumps({'api_url': self._api_url, **params}, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def _cache_files(self, key):
+        """Cached (display, download) files for a key, whatever their extensions."""
+        display = next(self._cache_dir.glob(f'{key}.display.*'), None)
+        download = next((path for path in self._cache_dir.glob(f'{key}.*')
+                         if not path.name.startswith(f'{key}.display.')), None)
+        return display, download
+
+    def _cache_lookup(self, key):
+        """Return cached (model_path, download_path) for a key, or None on a miss."""
+        if not self._cache_dir.is_dir():
+            return None
+        display, download = self._cache_files(key)
+        if download is None:
+            return None
+        # Bump the modification time so trimming evicts least recently used entries first
+        for path in (display, download):
+            if path is not None:
+                os.utime(path)
+        return str(display or download), str(download)
+
+    def _cache_store(self, key, model_path, download_path):
+        """Link an API result into the cache and trim the cache to its size limit.
+        Returns:
+            tuple: (model_path, download_path) of the cached copies, or the originals
+                if they could not be cached
+        """
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            cached_download = self._cache_dir / f'{key}{Path(download_path).suffix}'
+            _link_or_copy(download_path, cached_download)
+            cached_display = cached_download
+            if os.path.abspath(model_path) != os.path.abspath(download_path):
+                cached_display = self._cache_dir / f'{key}.display{Path(model_path).suffix}'
+                _link_or_copy(model_path, cached_display)
+            self._trim_cache(keep=key)
+        except OSError as e:
+            logger.warning(f"Could not cache TRELLIS result: {str(e)}")
+            return model_path, download_path
+        return str(cached_display), str(cached_download)
+
+    def _trim_cache(self, keep):
+        """Delete the least recently used cache files until the cache fits its limit.
+        Args:
+            keep (str): Key of the entry just stored, which is never deleted
         """
-        logger.info(f"Connecting to TRELLIS API at {self._api_url}")
+        entries = [(entry.stat(), entry) for entry in self._cache_dir.iterdir()
+                   if entry.is_file() and not entry.name.startswith(f'{keep}.')]
+        total = sum(entry.stat().st_size for entry in self._cache_dir.iterdir() if entry.is_file())
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime):
+            if total <= self._max_cache_bytes:
+                break
+            entry.unlink()
+            total -= stat.st_size
+
+    async def generate_batch(self, images: List[Any], concurrency: int = 5, **kwargs) -> List[Any]:
+        """Generate 3D models for several inputs with concurrent API calls.
+        gradio_client is synchronous, so each call runs in a worker thread; at most
+        `concurrency` requests are in flight at once.
+        Args:
+            images (list): Input data, one per model
+            concurrency (int): Maximum number of simultaneous API requests
+            **kwargs: Parameters applied to every generate() call
+        Returns:
+            list: The generate() results, in input order
+        """
+        loop = asyncio.get_running_loop()
+        # Connect once up front so the concurrent calls do not race to start the session
+        await loop.run_in_executor(None, self._ensure_session)
+        if len(images) > 1 and await loop.run_in_executor(None, self._has_batch_endpoint):
+            return await loop.run_in_executor(None, partial(self._generate_batched, images, kwargs))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(image):
+            async with semaphore:
+                return await loop.run_in_executor(None, partial(self.generate, image, **kwargs))
+
+        return await asyncio.gather(*[_one(image) for image in images])
+
+    def _has_batch_endpoint(self):
+        """Whether the Space exposes the batched generation endpoint; read once per pool."""
+        if self._pool.has_batch_endpoint is None:
+            try:
+                api = self._pool.clients[0].view_api(print_info=False, return_format='dict')
+                self._pool.has_batch_endpoint = _BATCH_ENDPOINT in api.get('named_endpoints', {})
+            except Exception as e:
+                logger.warning(f"Could not read the TRELLIS API description: {str(e)}")
+                self._pool.has_batch_endpoint = False
+        return self._pool.has_batch_endpoint
+
+    def _generate_batched(self, images, params):
+        """Generate models for several inputs with one call to the batched endpoint.
+        Cached results are reused; only the remaining inputs are sent.
+        Args:
+            images (list): Input data, one per model
+            params (dict): Generation parameters, used for the cache keys
+        Returns:
+            list: (model_path, download_path) per input, in input order
+        """
+        keys = [self._cache_key(image, params) for image in images]
+        results = [self._cache_lookup(key) if key else None for key in keys]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if not pending:
+            return results
+        uploads = [self._preprocess(images[i]) for i in pending]
         try:
-            self._client = Client(self._api_url)
-            logger.info("Connected to TRELLIS API successfully")   
+            handle_file = _gradio_client().handle_file
+            logger.info(f"Generating {len(pending)} models with one batched TRELLIS request")
+            generated = self._pool.next().predict(
+                images=[handle_file(image_path) for image_path, _ in uploads],
+                **_GENERATION_PARAMS,
+                api_name=_BATCH_ENDPOINT
+            )
         except Exception as e:
-            logger.error(f"Failed to connect to TRELLIS API: {str(e)}")
+            logger.error(f"API call failed: {str(e)}")
             raise
+        finally:
+            for _, temporary_path in uploads:
+                if temporary_path is not None:
+                    os.remove(temporary_path)
+        for i, (model_path, download_path) in zip(pending, generated):
+            results[i] = (self._cache_store(keys[i], model_path, download_path) if keys[i]
+                          else (model_path, download_path))
+        return results
+
+    def _ensure_session(self):
+        """Connect to the API and start its sessions unless both are already done."""
+        if self._pool is None:
+            self._connect_api()
+        if not self._session_active:
+            self._start_session()
+
+    def _connect_api(self):
+        """Connect to the TRELLIS API, reusing the process-wide client pool for this URL.
+        """
+        key = (self._api_url, self._pool_size)
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                logger.info(f"Connecting to TRELLIS API at {self._api_url} ({self._pool_size} connections)")
+                try:
+                    pool = _pools[key] = _ClientPool(self._api_url, self._pool_size)
+                    logger.info("Connected to TRELLIS API successfully")   
+                except Exception as e:
+                    logger.error(f"Failed to connect to TRELLIS API: {str(e)}")
+                    raise
+        self._pool = pool
     
     def _start_session(self):
-        """Start a session with the TRELLIS API.
+        """Start a session on every pooled client, once per process.
         """
-        logger.info("Starting TRELLIS API session") 
-        try:
-            self._client.predict(api_name="/start_session")
-            self._session_active = True
-            logger.info("TRELLIS API session started successfully")    
-        except Exception as e:
-            logger.error(f"Failed to start TRELLIS API session: {str(e)}")
-            self._session_active = False
-            raise
+        with _pools_lock:
+            if not self._pool.session_started:
+                logger.info("Starting TRELLIS API session") 
+                try:
+                    for client in self._pool.clients:
+                        client.predict(api_name="/start_session")
+                    self._pool.session_started = True
+                    logger.info("TRELLIS API session started successfully")    
+                except Exception as e:
+                    logger.error(f"Failed to start TRELLIS API session: {str(e)}")
+                    self._session_active = False
+                    raise
+        self._session_active = True
     
     def _preprocess(self, data):
-        """Placeholder - Preprocess input data for TRELLIS.
+        """Prepare an input image for upload to TRELLIS.
+        Images whose long edge exceeds 1024 px are downsized with Lanczos filtering and
+        re-encoded (JPEG at quality 92, or PNG when there is an alpha channel to keep).
         Args:
-            data: Input data    
+            data: Input data (image path or PIL image)
         Returns:
-            Preprocessed data ready for TRELLIS API
+            tuple: (path to upload, temporary file to delete afterwards or None)
         """
-        return data
+        Image = _pil_image()
+        if isinstance(data, Image.Image):
+            return self._write_upload(data)
+        if isinstance(data, (str, Path)) and os.path.isfile(data):
+            with Image.open(data) as image:
+                if max(image.size) <= _MAX_UPLOAD_EDGE:
+                    # Small enough already: upload the file as it is
+                    return data, None
+                return self._write_upload(image)
+        return data, None
+
+    def _write_upload(self, image):
+        """Downsize an image to the upload limit if needed and encode it to a temporary file.
+        Args:
+            image (PIL.Image.Image): Image to upload
+        Returns:
+            tuple: (path to upload, temporary file to delete afterwards)
+        """
+        Image = _pil_image()
+        scale = _MAX_UPLOAD_EDGE / max(image.size)
+        if scale < 1:
+            logger.info(f"Resizing {image.size[0]}x{image.size[1]} input to a {_MAX_UPLOAD_EDGE} px long edge")
+            image = image.resize((max(1, int(image.width * scale)), max(1, int(image.height * scale))),
+                                 Image.LANCZOS)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        with tempfile.NamedTemporaryFile(suffix='.png' if has_alpha else '.jpg', delete=False) as fh:
+            if has_alpha:
+                image.save(fh, format='PNG', optimize=True)
+            else:
+                image.convert('RGB').save(fh, format='JPEG', quality=_UPLOAD_JPEG_QUALITY, optimize=True)
+        return fh.name, fh.name
     
     def _postprocess(self, model_path, download_path, output_format):
         """Postprocess TRELLIS output.
@@ -126,18 +399,24 @@ class TrellisModel(BaseModel):
         result_data = {} 
         if output_format == 'glb':
             try:
-                import trimesh
-                mesh = trimesh.load(download_path) 
+                # A GLB loads as a scene; force='mesh' flattens it into one Trimesh
+                mesh = _trimesh().load(download_path, force='mesh')
+                # Plain-ndarray views of trimesh's TrackedArrays: no copy, and no hashing
+                # bookkeeping on later access; a copy is made only if the layout requires it
                 result_data['mesh'] = {
-                    'vertices': np.array(mesh.vertices),
-                    'faces': np.array(mesh.faces)
+                    'vertices': np.ascontiguousarray(mesh.vertices.view(np.ndarray)),
+                    'faces': np.ascontiguousarray(mesh.faces.view(np.ndarray))
                 }
                 if hasattr(mesh.visual, 'material'):
                     if hasattr(mesh.visual.material, 'image'):
                         result_data['mesh']['texture'] = mesh.visual.material.image
-                if hasattr(mesh.visual, 'uv'):
-                    result_data['mesh']['uvs'] = mesh.visual.uv
-                    
+                if getattr(mesh.visual, 'uv', None) is not None:
+                    result_data['mesh']['uvs'] = np.ascontiguousarray(mesh.visual.uv.view(np.ndarray))
+                # Only plain arrays leave this method; trimesh's caches hold reference
+                # cycles, so collect the mesh now rather than at some later GC pass
+                del mesh
+                gc.collect()
+
             except Exception as e:
                 logger.warning(f"Could not load GLB with trimesh: {str(e)}")
                 result_data['mesh'] = None
@@ -0,0 +1,73 @@
+"""Compiled kernels for the processors.
+numba is optional; without it the helpers fall back to plain NumPy.
+"""
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# Below this many points NumPy's passes beat waking numba's thread pool
+_PARALLEL_MIN_SIZE = 1 << 20
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _outlier_mask_kernel(points, sigmas):
+        n = points.shape[0]
+        cx = cy = cz = 0.0
+        for i in numba.prange(n):
+            cx += points[i, 0]
+            cy += points[i, 1]
+            cz += points[i, 2]
+        cx /= n
+        cy /= n
+        cz /= n
+        distances = np.empty(n)
+        total = 0.0
+        total_sq = 0.0
+        for i in numba.prange(n):
+            d = np.sqrt((points[i, 0] - cx) ** 2 + (points[i, 1] - cy) ** 2 + (points[i, 2] - cz) ** 2)
+            distances[i] = d
+            total += d
+            total_sq += d * d
+        mean = total / n
+        threshold = mean + sigmas * np.sqrt(max(total_sq / n - mean * mean, 0.0))
+        mask = np.empty(n, dtype=np.bool_)
+        for i in numba.prange(n):
+            mask[i] = distances[i] < threshold
+        return mask
+
+def outlier_mask(points: np.ndarray, sigmas: float = 2.0) -> np.ndarray:
+    """Flag the points closer to the centroid than mean + `sigmas` std of the distances.
+    Args:
+        points (np.ndarray): (N, 3) points
+        sigmas (float): Standard deviations above the mean distance that are kept
+    Returns:
+        np.ndarray: Boolean mask of the inliers
+    """
+    if numba is not None and len(points) >= _PARALLEL_MIN_SIZE:
+        return _outlier_mask_kernel(np.ascontiguousarray(points, dtype=np.float64), sigmas)
+    distances = np.linalg.norm(points - points.mean(axis=0), axis=1)
+    return distances < distances.mean() + sigmas * distances.std()
+
+# Shift and mask pairs that spread the low 21 bits of a uint64 two zero bits apart
+_SPREAD_STEPS = tuple((np.uint64(shift), np.uint64(mask)) for shift, mask in (
+    (32, 0x1F00000000FFFF), (16, 0x1F0000FF0000FF), (8, 0x100F00F00F00F00F),
+    (4, 0x10C30C30C30C30C3), (2, 0x1249249249249249)))
+
+def morton3d(x: np.ndarray, y: np.ndarray, z: np.ndarray) -> np.ndarray:
+    """Interleave the bits of three integer coordinate arrays into Z-order (Morton) keys.
+    Args:
+        x, y, z (np.ndarray): Non-negative integer coordinates below 2**21
+    Returns:
+        np.ndarray: uint64 keys; cells close in space get close keys
+    """
+    key = np.zeros(np.shape(x), dtype=np.uint64)
+    for shift, coordinate in enumerate((x, y, z)):
+        spread = np.asarray(coordinate).astype(np.uint64)
+        for step, mask in _SPREAD_STEPS:
+            spread = (spread | (spread << step)) & mask
+        key |= spread << np.uint64(shift)
+    return key
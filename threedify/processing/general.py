@@ -10,6 +10,19 @@ from threedify.processing.base import BaseProcessor
 
 logger = logging.getLogger(__name__)
 
+class ProcessedData:
+    """Result of the pass-through processor."""
+    __slots__ = ("data", "original_data")
+    type = 'processed_data'
+
+    def __init__(self, data):
+        """Initialize the processed data.
+        Args:
+            data: Data the processor was given, passed through unchanged
+        """
+        self.data = data
+        self.original_data = data
+
 class GeneralProcessor(BaseProcessor):
     """General processor for any data type (fallback)."""
     def process(self, data: Any, **kwargs) -> Any:
@@ -21,11 +34,7 @@ class GeneralProcessor(BaseProcessor):
             Processed data
         """
         logger.info("Processing data with general processor")
-        processed_data = type('ProcessedData', (), {
-            'data': data,
-            'original_data': data,
-            'type': 'processed_data'
-        })
+        processed_data = ProcessedData(data)
         logger.info("General processing complete")
         return processed_data
     
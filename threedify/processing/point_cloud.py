@@ -9,8 +9,36 @@ from typing import Any, Dict, Optional, List, Tuple, Union
 import numpy as np
 
 from threedify.processing.base import BaseProcessor
+from threedify.processing._kernels import morton3d, outlier_mask
 logger = logging.getLogger(__name__)
 
+# Voxel-size corrections tried while downsampling, and the accepted |log(kept / wanted)|
+_VOXEL_REFINE_STEPS = 4
+_VOXEL_TOLERANCE = 0.1
+
+# Points whose neighbourhoods are decomposed per batch while estimating normals
+_NORMALS_BLOCK_POINTS = 1 << 16
+
+class ProcessedPointCloud:
+    """Result of point cloud processing."""
+    __slots__ = ("point_cloud", "colors", "normals", "building_segments", "original_data")
+    type = 'processed_point_cloud'
+
+    def __init__(self, point_cloud, colors, normals, building_segments, original_data):
+        """Initialize the processed point cloud.
+        Args:
+            point_cloud (np.ndarray): (N, 3) processed points
+            colors (np.ndarray): (N, 3) colors of the points, if any
+            normals (np.ndarray): (N, 3) estimated normals, if requested
+            building_segments (dict): Roof and wall point indices, in building mode
+            original_data: Data the processor was given
+        """
+        self.point_cloud = point_cloud
+        self.colors = colors
+        self.normals = normals
+        self.building_segments = building_segments
+        self.original_data = original_data
+
 class PointCloudProcessor(BaseProcessor):
     """Processor for point cloud data."""
     def process(self, data: Any, **kwargs) -> Any:
@@ -41,8 +69,11 @@ class PointCloudProcessor(BaseProcessor):
         remove_outliers = kwargs.get('remove_outliers', False)
         estimate_normals = kwargs.get('estimate_normals', True)
         building_mode = kwargs.get('building_mode', False)
-        processed_point_cloud = point_cloud.copy()
-        processed_colors = colors.copy() if colors is not None else None
+        # No stage modifies its input in place (each returns freshly indexed arrays), so
+        # nothing is copied up front; asarray also drops subclasses such as trimesh's
+        # TrackedArray, whose hashing bookkeeping would otherwise follow every slice
+        processed_point_cloud = np.asarray(point_cloud)
+        processed_colors = np.asarray(colors) if colors is not None else None
 
         if downsample < 1.0:
             processed_point_cloud, processed_colors = self._downsample(
@@ -63,20 +94,16 @@ class PointCloudProcessor(BaseProcessor):
         else:
             building_segments = None
 
-        processed_data = type('ProcessedPointCloud', (), {
-            'point_cloud': processed_point_cloud,
-            'colors': processed_colors,
-            'normals': normals,
-            'building_segments': building_segments,
-            'original_data': data,
-            'type': 'processed_point_cloud'
-        })
+        processed_data = ProcessedPointCloud(processed_point_cloud, processed_colors, normals,
+                                             building_segments, data)
         logger.info(f"Point cloud processing complete. Result has {len(processed_point_cloud)} points")
         return processed_data
     
     def _downsample(self, point_cloud: np.ndarray, colors: Optional[np.ndarray], 
                     factor: float) -> Tuple[np.ndarray, Optional[np.ndarray]]:
-        """Downsample a point cloud.
+        """Downsample a point cloud on a voxel grid, keeping one point per occupied voxel.
+        The voxel size is tuned so that about `factor` of the points remain, which
+        gives even spatial coverage instead of a random subset.
         Args:
             point_cloud (np.ndarray): Point cloud to downsample
             colors (np.ndarray): Colors of the point cloud
@@ -89,11 +116,66 @@ class PointCloudProcessor(BaseProcessor):
         n_sample = max(1, int(n_points * factor))
         if n_sample >= n_points:
             return point_cloud, colors
-        indices = np.random.choice(n_points, n_sample, replace=False)
-        downsampled_point_cloud = point_cloud[indices]
-        downsampled_colors = colors[indices] if colors is not None else None
-        logger.info(f"Downsampled from {n_points} to {n_sample} points")
+        low = point_cloud.min(axis=0)
+        extent = point_cloud.max(axis=0) - low
+        extent = extent[extent > 0]
+        if not len(extent):
+            indices = np.arange(1)
+        else:
+            # Start from the voxel that would split the bounding box into n_sample cells,
+            # then correct for how the points actually fill it (surfaces fill ~voxel^-2)
+            voxel = float(np.prod(extent) / n_sample) ** (1.0 / len(extent))
+            # Keep every axis within the 2**21 cells the Z-order key can hold
+            min_voxel = float(extent.max()) / ((1 << 21) - 1)
+            indices = self._voxel_representatives(point_cloud, low, voxel)
+            best = indices
+            previous = None
+            for _ in range(_VOXEL_REFINE_STEPS):
+                ratio = len(indices) / n_sample
+                if abs(np.log(ratio)) < _VOXEL_TOLERANCE:
+                    break
+                # Secant step in log-log space once two grids have been tried, clamped so a
+                # plateau in the kept count cannot throw the voxel size off by orders of magnitude
+                exponent = 1.0 / 3
+                if previous is not None:
+                    exponent = 1.0
+                    if previous[1] != len(indices):
+                        exponent = np.log(voxel / previous[0]) / np.log(previous[1] / len(indices))
+                        exponent = float(np.clip(exponent, 1.0 / 3, 1.0))
+                previous = (voxel, len(indices))
+                voxel = max(voxel * ratio ** exponent, min_voxel)
+                indices = self._voxel_representatives(point_cloud, low, voxel)
+                if abs(len(indices) - n_sample) < abs(len(best) - n_sample):
+                    best = indices
+            indices = best
+        # np.take into a preallocated buffer gathers rows faster than fancy indexing
+        downsampled_point_cloud = np.empty((len(indices),) + point_cloud.shape[1:], point_cloud.dtype)
+        np.take(point_cloud, indices, axis=0, out=downsampled_point_cloud)
+        downsampled_colors = None
+        if colors is not None:
+            downsampled_colors = np.empty((len(indices),) + colors.shape[1:], colors.dtype)
+            np.take(colors, indices, axis=0, out=downsampled_colors)
+        logger.info(f"Downsampled from {n_points} to {len(indices)} points")
         return downsampled_point_cloud, downsampled_colors
+
+    @staticmethod
+    def _voxel_representatives(point_cloud: np.ndarray, low: np.ndarray, voxel: float) -> np.ndarray:
+        """Index of the first point in each occupied voxel, in input order.
+        Args:
+            point_cloud (np.ndarray): (N, 3) points
+            low (np.ndarray): Minimum corner of the grid
+            voxel (float): Voxel edge length
+        Returns:
+            np.ndarray: Indices of the kept points
+        """
+        cells = np.floor((point_cloud - low) / voxel).astype(np.int64)
+        # 21 bits per axis fit the three cell coordinates into one Z-order key, so the
+        # sort inside np.unique walks neighbouring voxels together
+        np.clip(cells, 0, (1 << 21) - 1, out=cells)
+        keys = morton3d(cells[:, 0], cells[:, 1], cells[:, 2])
+        _, indices = np.unique(keys, return_index=True)
+        indices.sort()
+        return indices
     
     def _remove_outliers(self, point_cloud: np.ndarray, 
                           colors: Optional[np.ndarray]) -> Tuple[np.ndarray, Optional[np.ndarray]]:
@@ -105,25 +187,45 @@ class PointCloudProcessor(BaseProcessor):
             tuple: Processed point cloud and colors
         """
         logger.info("Removing outliers from point cloud")
-        center = np.mean(point_cloud, axis=0)
-        distances = np.linalg.norm(point_cloud - center, axis=1)
-        threshold = np.mean(distances) + 2 * np.std(distances)
-        mask = distances < threshold
-        filtered_point_cloud = point_cloud[mask]
-        filtered_colors = colors[mask] if colors is not None else None
+        mask = outlier_mask(point_cloud)
+        # compress selects rows by mask without the general boolean-indexing machinery
+        filtered_point_cloud = point_cloud.compress(mask, axis=0)
+        filtered_colors = colors.compress(mask, axis=0) if colors is not None else None
         logger.info(f"Removed {np.sum(~mask)} outliers out of {len(point_cloud)} points")
         return filtered_point_cloud, filtered_colors
     
-    def _estimate_normals(self, point_cloud: np.ndarray) -> np.ndarray:
-        """Estimate normals for a point cloud.
+    def _estimate_normals(self, point_cloud: np.ndarray, k: int = 16) -> np.ndarray:
+        """Estimate normals by PCA over each point's k nearest neighbours.
+        The normal is the eigenvector of the smallest eigenvalue of the neighbourhood
+        covariance, oriented away from the cloud's centroid.
         Args:
             point_cloud (np.ndarray): Point cloud to process   
+            k (int): Neighbours per point, including the point itself
         Returns:
-            np.ndarray: Estimated normals
+            np.ndarray: Estimated unit normals (float32)
         """
         logger.info("Estimating normals for point cloud")
-        normals = np.random.randn(*point_cloud.shape)
-        normals = normals / np.linalg.norm(normals, axis=1, keepdims=True)
+        from scipy.spatial import cKDTree
+        n_points = len(point_cloud)
+        normals = np.zeros((n_points, 3), dtype=np.float32)
+        k = min(k, n_points)
+        if k < 3:
+            return normals
+        # Centre in float64 first: georeferenced coordinates lose the local geometry in float32
+        points = np.asarray(point_cloud, dtype=np.float64)
+        points = (points - points.mean(axis=0)).astype(np.float32)
+        _, neighbours = cKDTree(points).query(points, k=k, workers=-1)
+        # Blocks bound the (block, k, 3) neighbourhood and (block, 3, 3) covariance tensors
+        for start in range(0, n_points, _NORMALS_BLOCK_POINTS):
+            stop = min(start + _NORMALS_BLOCK_POINTS, n_points)
+            nbrs = points[neighbours[start:stop]]
+            nbrs -= nbrs.mean(axis=1, keepdims=True)
+            cov = np.matmul(nbrs.transpose(0, 2, 1), nbrs)
+            _, vectors = np.linalg.eigh(cov)
+            block = vectors[:, :, 0]
+            flip = np.einsum('ni,ni->n', block, points[start:stop]) < 0
+            block[flip] *= -1
+            normals[start:stop] = block
         return normals
     
     def _process_building(self, point_cloud: np.ndarray, 
@@ -136,9 +238,11 @@ class PointCloudProcessor(BaseProcessor):
             tuple: Processed point cloud, colors, and building segments
         """
         logger.info("Applying specialized processing for buildings")
+        heights = point_cloud[:, 2]
+        roof = heights > np.median(heights)
         building_segments = {
-            'roof': {'indices': np.where(point_cloud[:, 2] > np.median(point_cloud[:, 2]))[0]},
-            'walls': {'indices': np.where(point_cloud[:, 2] <= np.median(point_cloud[:, 2]))[0]},
+            'roof': {'indices': np.flatnonzero(roof)},
+            'walls': {'indices': np.flatnonzero(~roof)},
         }
         return point_cloud, colors, building_segments
     
@@ -2,12 +2,137 @@
 """
 
 import logging
+from collections.abc import Sequence
+from functools import lru_cache
 from typing import Any, Dict, Optional, List, Tuple, Union
 import numpy as np
 
 from threedify.processing.base import BaseProcessor
 
 logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _cv2():
+    import cv2
+    # Let OpenCV's parallel loops use every core (-1 restores its default thread count)
+    cv2.setNumThreads(-1)
+    return cv2
+
+@lru_cache(maxsize=None)
+def _pil():
+    import PIL.Image
+    import PIL.ImageEnhance
+    import PIL.ImageFilter
+    return PIL
+
+@lru_cache(maxsize=None)
+def _skimage_feature():
+    from skimage import feature
+    return feature
+
+def _percentiles(values: np.ndarray, *percentiles: float) -> List[float]:
+    """Linearly interpolated percentiles, as np.percentile, by selection instead of a sort.
+    One np.partition call (a histogram for uint8) places every rank the percentiles need.
+    Args:
+        values (np.ndarray): Values of any shape
+        *percentiles (float): Percentiles in [0, 100]
+    Returns:
+        list: The percentile values, in the order given
+    """
+    flat = values.ravel()
+    ranks = [(flat.size - 1) * p / 100.0 for p in percentiles]
+    bounds = sorted({bound for rank in ranks for bound in (int(np.floor(rank)), int(np.ceil(rank)))})
+    if flat.dtype == np.uint8:
+        # 8-bit rasters: the value at any rank comes from a 256-bin cumulative histogram
+        cumulative = np.cumsum(np.bincount(flat, minlength=256))
+        at_rank = dict(zip(bounds, np.searchsorted(cumulative, bounds, side='right')))
+    else:
+        selected = np.partition(flat, bounds)
+        at_rank = {bound: selected[bound] for bound in bounds}
+    results = []
+    for rank in ranks:
+        below = float(at_rank[int(np.floor(rank))])
+        above = float(at_rank[int(np.ceil(rank))])
+        results.append(below + (above - below) * (rank - int(np.floor(rank))))
+    return results
+
+def _as_uint8(image_array: np.ndarray) -> np.ndarray:
+    """Return an image array as uint8, treating float arrays as 0-1 intensities."""
+    if image_array.dtype == np.uint8:
+        return image_array
+    if np.issubdtype(image_array.dtype, np.floating):
+        return (np.clip(image_array, 0, 1) * 255).astype(np.uint8)
+    return np.clip(image_array, 0, 255).astype(np.uint8)
+
+# Pixels Canny, SIFT and the GLCM run on; larger images are area-downsampled first
+_FEATURE_MAX_PIXELS = 1_000_000
+
+class _LabelMasks(Sequence):
+    """Per-building uint8 masks (255 inside), computed from a label image when indexed."""
+    __slots__ = ("_labels", "_count")
+
+    def __init__(self, labels: np.ndarray, count: int):
+        """Initialize the masks.
+        Args:
+            labels (np.ndarray): Label image; building i is filled with i + 1, background 0
+            count (int): Number of buildings
+        """
+        self._labels = labels
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._count))]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("building mask index out of range")
+        return (self._labels == index + 1).view(np.uint8) * np.uint8(255)
+
+class ProcessedRaster:
+    """Result of raster processing.
+    The PIL image is only built, from the array, when `image` is first read.
+    """
+    __slots__ = ("_image", "_source_image", "array", "features", "building_segments", "metadata",
+                 "original_data")
+    type = 'processed_raster'
+
+    def __init__(self, array, features, building_segments, metadata, original_data, source_image=None):
+        """Initialize the processed raster.
+        Args:
+            array (np.ndarray): Pixel array of the processed image
+            features (dict): Extracted features, if requested
+            building_segments (dict): Detected building outlines, in building mode
+            metadata (dict): Metadata of the input image
+            original_data: Data the processor was given
+            source_image (PIL.Image.Image): Input image, copied as the result image when
+                no stage changed the pixels
+        """
+        self._image = None
+        self._source_image = source_image
+        self.array = array
+        self.features = features
+        self.building_segments = building_segments
+        self.metadata = metadata
+        self.original_data = original_data
+
+    @property
+    def image(self):
+        """PIL.Image.Image: Processed image, created on first access."""
+        if self._image is None:
+            if self._source_image is not None:
+                self._image = self._source_image.copy()
+            else:
+                self._image = _pil().Image.fromarray(_as_uint8(self.array))
+        return self._image
+
+    @image.setter
+    def image(self, value):
+        self._image = value
+
 class RasterProcessor(BaseProcessor):
     """Processor for raster data (satellite imagery, aerial photos, etc.)."""
     def process(self, data: Any, **kwargs) -> Any:
@@ -20,6 +145,8 @@ class RasterProcessor(BaseProcessor):
                 - extract_features (bool): Whether to extract features
                 - building_mode (bool): Special processing for buildings
                 - denoise (bool): Apply denoising algorithms
+                - denoise_strength (str): 'normal' (bilateral filter, default) or 'high'
+                  (non-local means)
                 - normalize (bool): Apply normalization to pixel values
                 - contrast_stretch (tuple): Apply contrast stretching (min_percentile, max_percentile)    
         Returns:
@@ -32,10 +159,11 @@ class RasterProcessor(BaseProcessor):
             image_array = data.array
             metadata = getattr(data, 'metadata', {})
         else:
-            from PIL import Image
+            Image = _pil().Image
             if isinstance(data, Image.Image):
                 image = data
-                image_array = np.array(image)
+                # Read-only view of the pixels; no stage writes to its input
+                image_array = np.asarray(image)
                 metadata = {
                     'width': image.width,
                     'height': image.height,
@@ -43,129 +171,130 @@ class RasterProcessor(BaseProcessor):
                 }
             else:
                 image_array = data
-                image = Image.fromarray(image_array if image_array.dtype == np.uint8 
-                                       else (image_array * 255).astype(np.uint8))
+                # The result image is built from the array if it is ever read
+                image = None
                 metadata = {}
         resize = kwargs.get('resize', None)
         enhance = kwargs.get('enhance', False)
         extract_features = kwargs.get('extract_features', True)
         building_mode = kwargs.get('building_mode', False)
         denoise = kwargs.get('denoise', False)
+        denoise_strength = kwargs.get('denoise_strength', 'normal')
         normalize = kwargs.get('normalize', False)
         contrast_stretch = kwargs.get('contrast_stretch', None)
-        processed_image = image.copy()
-        processed_array = image_array.copy()
+        # Every stage takes and returns a uint8 array; the PIL image is built lazily from the result
+        processed_array = image_array
         if normalize:
-            processed_array, processed_image = self._normalize(processed_array)
+            processed_array = self._normalize(processed_array)
         if contrast_stretch:
-            processed_array, processed_image = self._contrast_stretch(processed_array, *contrast_stretch)
+            processed_array = self._contrast_stretch(processed_array, *contrast_stretch)
         if denoise:
-            processed_array, processed_image = self._denoise(processed_array)
+            processed_array = self._denoise(processed_array, strength=denoise_strength)
         if resize:
-            processed_image, processed_array = self._resize(processed_image, resize)
+            processed_array = self._resize(processed_array, resize)
         if enhance:
-            processed_image, processed_array = self._enhance(processed_image)
+            processed_array = self._enhance(processed_array)
         if extract_features:
             features = self._extract_features(processed_array)
         else:
             features = None
         if building_mode:
-            processed_image, processed_array, building_segments = self._process_building(
-                processed_image, processed_array)
+            processed_array, building_segments = self._process_building(processed_array)
         else:
             building_segments = None
-        processed_data = type('ProcessedRaster', (), {
-            'image': processed_image,
-            'array': processed_array,
-            'features': features,
-            'building_segments': building_segments,
-            'metadata': metadata,
-            'original_data': data,
-            'type': 'processed_raster'
-        })
+        source_image = None
+        if processed_array is image_array:
+            source_image = image
+            processed_array = image_array.copy()
+        processed_data = ProcessedRaster(processed_array, features, building_segments, metadata, data,
+                                         source_image=source_image)
         logger.info("Raster processing complete")
         return processed_data
     
-    def _resize(self, image, target_size: Tuple[int, int]):
-        """Resize an image.
+    def _resize(self, image_array: np.ndarray, target_size: Tuple[int, int]) -> np.ndarray:
+        """Resize an image, with area averaging when shrinking and Lanczos when enlarging.
         Args:
-            image: PIL Image to resize
+            image_array (np.ndarray): Image as numpy array
             target_size (tuple): Target size (width, height)  
         Returns:
-            tuple: Resized image and array
+            np.ndarray: Resized array
         """
         logger.info(f"Resizing image to {target_size}")
-        resized_image = image.resize(target_size, resample=image.LANCZOS)
-        resized_array = np.array(resized_image)
-        return resized_image, resized_array
+        cv2 = _cv2()
+        width, height = (int(size) for size in target_size)
+        image_array = _as_uint8(image_array)
+        if (width, height) == (image_array.shape[1], image_array.shape[0]):
+            return image_array
+        # INTER_AREA is both faster and alias-free for downscaling; Lanczos4 is sharper upwards
+        shrinking = width * height < image_array.shape[0] * image_array.shape[1]
+        return cv2.resize(image_array, (width, height),
+                          interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LANCZOS4)
     
-    def _normalize(self, image_array):
-        """Normalize image pixel values to range [0, 1].
+    def _normalize(self, image_array: np.ndarray) -> np.ndarray:
+        """Stretch image pixel values to the full 0-255 range.
         Args:
-            image_array: Numpy array of image  
+            image_array (np.ndarray): Image as numpy array  
         Returns:
-            tuple: Normalized array and corresponding PIL Image
+            np.ndarray: Normalized uint8 array
         """
         logger.info("Normalizing image values")
-        if image_array.dtype == np.uint8:
-            normalized = image_array.astype(np.float32) / 255.0
-        else:
-            min_val = np.min(image_array)
-            max_val = np.max(image_array)
-            normalized = (image_array - min_val) / (max_val - min_val + 1e-10)
-        normalized_uint8 = (normalized * 255).astype(np.uint8)
-        from PIL import Image
-        normalized_image = Image.fromarray(normalized_uint8)
-        return normalized, normalized_image
+        cv2 = _cv2()
+        if image_array.dtype not in (np.uint8, np.float32, np.float64):
+            image_array = image_array.astype(np.float32)
+        return cv2.normalize(image_array, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
     
-    def _contrast_stretch(self, image_array, min_percentile=2, max_percentile=98):
+    def _contrast_stretch(self, image_array: np.ndarray, min_percentile=2, max_percentile=98) -> np.ndarray:
         """Apply contrast stretching to enhance image details.
         Args:
-            image_array: Numpy array of image
+            image_array (np.ndarray): Image as numpy array
             min_percentile: Lower percentile for clipping
             max_percentile: Upper percentile for clipping
         Returns:
-            tuple: Contrast-stretched array and PIL Image
+            np.ndarray: Contrast-stretched uint8 array
         """
         logger.info(f"Applying contrast stretching ({min_percentile}%, {max_percentile}%)")
-        p_low = np.percentile(image_array, min_percentile)
-        p_high = np.percentile(image_array, max_percentile)
-        stretched = np.clip(image_array, p_low, p_high)
-        stretched = (stretched - p_low) / (p_high - p_low + 1e-10)
-        stretched_uint8 = (stretched * 255).astype(np.uint8)
-        from PIL import Image
-        stretched_image = Image.fromarray(stretched_uint8)
-        return stretched, stretched_image
+        p_low, p_high = _percentiles(image_array, min_percentile, max_percentile)
+        scale = 255.0 / (p_high - p_low + 1e-10)
+        if image_array.dtype == np.uint8:
+            # The stretch maps each of the 256 levels independently: apply it as a lookup table
+            lut = np.clip((np.arange(256) - p_low) * scale, 0, 255).astype(np.uint8)
+            return lut[image_array]
+        stretched = image_array.astype(np.float32)
+        np.clip(stretched, p_low, p_high, out=stretched)
+        np.subtract(stretched, p_low, out=stretched)
+        np.multiply(stretched, scale, out=stretched)
+        return stretched.astype(np.uint8)
     
-    def _denoise(self, image_array):
+    def _denoise(self, image_array: np.ndarray, strength: str = 'normal') -> np.ndarray:
         """Apply denoising to the image.
         Args:
-            image_array: Numpy array of image 
+            image_array (np.ndarray): Image as numpy array 
+            strength (str): 'normal' for an edge-preserving bilateral filter, 'high' for
+                the much slower non-local means
         Returns:
-            tuple: Denoised array and PIL Image
+            np.ndarray: Denoised uint8 array
         """
-        logger.info("Applying denoising algorithm")
-        import cv2
-        if len(image_array.shape) == 3:  # Color image
-            denoised = cv2.fastNlMeansDenoisingColored(
-                image_array.astype(np.uint8), None, 10, 10, 7, 21)
-        else:  
-            denoised = cv2.fastNlMeansDenoising(
-                image_array.astype(np.uint8), None, 10, 7, 21)
-        from PIL import Image
-        denoised_image = Image.fromarray(denoised)
-        return denoised, denoised_image
+        logger.info(f"Applying denoising algorithm ({strength})")
+        cv2 = _cv2()
+        image_array = _as_uint8(image_array)
+        if strength == 'high':
+            if len(image_array.shape) == 3:  # Color image
+                return cv2.fastNlMeansDenoisingColored(image_array, None, 10, 10, 7, 21)
+            return cv2.fastNlMeansDenoising(image_array, None, 10, 7, 21)
+        return cv2.bilateralFilter(image_array, d=5, sigmaColor=50, sigmaSpace=50)
     
-    def _enhance(self, image):
+    def _enhance(self, image_array: np.ndarray) -> np.ndarray:
         """Enhance an image with multiple techniques.
         Args:
-            image: PIL Image to enhance  
+            image_array (np.ndarray): Image as numpy array  
         Returns:
-            tuple: Enhanced image and array
+            np.ndarray: Enhanced uint8 array
         """
         logger.info("Enhancing image with multiple techniques")
-        from PIL import ImageEnhance, ImageFilter
-        enhancer = ImageEnhance.Contrast(image)
+        PIL = _pil()
+        ImageEnhance, ImageFilter = PIL.ImageEnhance, PIL.ImageFilter
+        enhanced = PIL.Image.fromarray(_as_uint8(image_array))
+        enhancer = ImageEnhance.Contrast(enhanced)
         enhanced = enhancer.enhance(1.2)
         enhancer = ImageEnhance.Brightness(enhanced)
         enhanced = enhancer.enhance(1.1)
@@ -174,8 +303,7 @@ class RasterProcessor(BaseProcessor):
         enhancer = ImageEnhance.Color(enhanced)
         enhanced = enhancer.enhance(1.1)
         enhanced = enhanced.filter(ImageFilter.UnsharpMask(radius=2.0, percent=150))
-        enhanced_array = np.array(enhanced)
-        return enhanced, enhanced_array
+        return np.array(enhanced)
     
     def _extract_features(self, image_array: np.ndarray) -> Dict:
         """Extract features from an image using computer vision techniques.
@@ -185,17 +313,31 @@ class RasterProcessor(BaseProcessor):
             dict: Extracted features
         """
         logger.info("Extracting features from image")
-        import cv2
+        cv2 = _cv2()
+        color = image_array.ndim == 3
+        planes = [image_array[..., c] for c in range(image_array.shape[2])] if color else [image_array]
+        if len(planes) <= 4:
+            # One SIMD pass for mean and standard deviation (OpenCV handles up to 4 channels)
+            mean, std = (stat.ravel() for stat in cv2.meanStdDev(image_array))
+        else:
+            mean, std = np.mean(image_array, axis=(0, 1)), np.std(image_array, axis=(0, 1))
+        # minMaxLoc finds both extremes of a channel in a single pass
+        extremes = np.array([cv2.minMaxLoc(plane)[:2] for plane in planes], dtype=image_array.dtype)
         features = {
-            'mean': np.mean(image_array, axis=(0, 1)),
-            'std': np.std(image_array, axis=(0, 1)),
-            'min': np.min(image_array, axis=(0, 1)),
-            'max': np.max(image_array, axis=(0, 1)),
+            'mean': mean if color else mean[0],
+            'std': std if color else std[0],
+            'min': extremes[:, 0] if color else extremes[0, 0],
+            'max': extremes[:, 1] if color else extremes[0, 1],
         }
         if len(image_array.shape) == 3:
-            gray = cv2.cvtColor(image_array.astype(np.uint8), cv2.COLOR_RGB2GRAY)
+            gray = cv2.cvtColor(_as_uint8(image_array), cv2.COLOR_RGB2GRAY)
         else:
-            gray = image_array.astype(np.uint8)
+            gray = _as_uint8(image_array)
+        # Only summary statistics are kept, so large rasters are analysed at about 1 MP
+        scale = int(np.sqrt(gray.size / _FEATURE_MAX_PIXELS)) if gray.size > _FEATURE_MAX_PIXELS else 1
+        if scale > 1:
+            gray = cv2.resize(gray, None, fx=1 / scale, fy=1 / scale, interpolation=cv2.INTER_AREA)
+        features['analysis_scale'] = scale
         edges = cv2.Canny(gray, 100, 200)
         features['edge_density'] = np.sum(edges > 0) / (edges.shape[0] * edges.shape[1])
         try:
@@ -211,13 +353,15 @@ class RasterProcessor(BaseProcessor):
             features['keypoint_mean_strength'] = 0
             features['keypoint_max_strength'] = 0 
         try:
-            from skimage.feature import graycomatrix, graycoprops
+            feature = _skimage_feature()
+            graycomatrix, graycoprops = feature.graycomatrix, feature.graycoprops
             if gray.shape[0] > 1000 or gray.shape[1] > 1000:
                 factor = max(1, min(gray.shape[0], gray.shape[1]) // 1000)
                 gray_small = gray[::factor, ::factor]
             else:
                 gray_small = gray
-            gray_small = (gray_small / 16).astype(np.uint8)
+            # 16 grey levels by integer shift, without a float intermediate
+            gray_small = gray_small >> 4
             glcm = graycomatrix(gray_small, [1], [0, np.pi/4, np.pi/2, 3*np.pi/4], 
                                levels=16, symmetric=True, normed=True)
             features['contrast'] = graycoprops(glcm, 'contrast').mean()
@@ -229,18 +373,16 @@ class RasterProcessor(BaseProcessor):
             logger.warning(f"Could not compute texture features: {str(e)}")    
         return features
     
-    def _process_building(self, image, image_array: np.ndarray) -> Tuple:
+    def _process_building(self, image_array: np.ndarray) -> Tuple:
         """Apply specialized processing for buildings using more advanced techniques.
         Args:
-            image: PIL Image to process
             image_array (np.ndarray): Image as numpy array  
         Returns:
-            tuple: Processed image, array, and building segments
+            tuple: Annotated uint8 array and building segments
         """
         logger.info("Applying specialized processing for buildings")
-        import cv2
-        import numpy as np
-        image_array_uint8 = image_array.astype(np.uint8)
+        cv2 = _cv2()
+        image_array_uint8 = _as_uint8(image_array)
         if len(image_array_uint8.shape) == 3 and image_array_uint8.shape[2] == 3:
             grayscale = cv2.cvtColor(image_array_uint8, cv2.COLOR_RGB2GRAY)
         else:
@@ -252,42 +394,41 @@ class RasterProcessor(BaseProcessor):
         opening = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel, iterations=2)
         contours, hierarchy = cv2.findContours(opening, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
         min_building_area = grayscale.shape[0] * grayscale.shape[1] * 0.01  # 1% of image area
-        building_contours = [cnt for cnt in contours if cv2.contourArea(cnt) > min_building_area]
+        contour_areas = np.fromiter(map(cv2.contourArea, contours), dtype=np.float64, count=len(contours))
+        keep = np.flatnonzero(contour_areas > min_building_area)
+        building_contours = [contours[i] for i in keep]
         result_array = image_array_uint8.copy()
         cv2.drawContours(result_array, building_contours, -1, (0, 0, 255), 2)
-        building_masks = []
-        for i, cnt in enumerate(building_contours):
-            mask = np.zeros_like(grayscale)
-            cv2.drawContours(mask, [cnt], -1, 255, -1)
-            building_masks.append(mask)
+        # Every building is filled into one shared label image; masks are cut from it on access
+        labels = np.zeros(grayscale.shape[:2], dtype=np.int32)
+        bounding_boxes, centroids = [], []
+        for label, cnt in enumerate(building_contours, start=1):
+            cv2.drawContours(labels, [cnt], -1, label, -1)
+            bounding_boxes.append(cv2.boundingRect(cnt))
+            M = cv2.moments(cnt)
+            if M["m00"] != 0:
+                centroids.append((int(M["m10"] / M["m00"]), int(M["m01"] / M["m00"])))
+            else:
+                centroids.append(None)
         edges = cv2.Canny(grayscale, 100, 200)
         lines = cv2.HoughLinesP(edges, 1, np.pi/180, threshold=50, minLineLength=50, maxLineGap=10)
         
         if lines is not None:
-            for line in lines:
-                x1, y1, x2, y2 = line[0]
+            # OpenCV 4 returns (N, 1, 4) segments, OpenCV 5 (N, 4)
+            for x1, y1, x2, y2 in lines.reshape(-1, 4):
                 cv2.line(result_array, (x1, y1), (x2, y2), (0, 255, 0), 1)
-        from PIL import Image
-        result_image = Image.fromarray(result_array)
         building_segments = {
             'edges': edges,
             'contours': building_contours,
-            'masks': building_masks,
+            'labels': labels,
+            'masks': _LabelMasks(labels, len(building_contours)),
             'count': len(building_contours),
             'lines': lines if lines is not None else [],
-            'areas': [cv2.contourArea(cnt) for cnt in building_contours],
-            'bounding_boxes': [cv2.boundingRect(cnt) for cnt in building_contours]
+            'areas': contour_areas[keep].tolist(),
+            'bounding_boxes': bounding_boxes,
+            'centroids': centroids
         }
-        building_segments['centroids'] = []
-        for cnt in building_contours:
-            M = cv2.moments(cnt)
-            if M["m00"] != 0:
-                cX = int(M["m10"] / M["m00"])
-                cY = int(M["m01"] / M["m00"])
-                building_segments['centroids'].append((cX, cY))
-            else:
-                building_segments['centroids'].append(None)
-        return result_image, result_array, building_segments
+        return result_array, building_segments
     
     @property
     def name(self) -> str:
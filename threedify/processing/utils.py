@@ -1,16 +1,19 @@
+import logging
+from importlib import import_module
 from typing import Dict
 from threedify.processing.base import BaseProcessor
-from threedify.processing.point_cloud import PointCloudProcessor
-from threedify.processing.raster import RasterProcessor
-from threedify.processing.vector import VectorProcessor
-from threedify.processing.general import GeneralProcessor
 
-_PROCESSORS: Dict[str, BaseProcessor] = {
-    "point_cloud": PointCloudProcessor(),
-    "raster": RasterProcessor(),
-    "vector": VectorProcessor(),
-    "general": GeneralProcessor(),
+logger = logging.getLogger(__name__)
+
+# Processor modules are imported and instantiated on first request; _PROCESSORS caches
+# the instances
+_PROCESSOR_CLASSES: Dict[str, tuple] = {
+    "point_cloud": ("threedify.processing.point_cloud", "PointCloudProcessor"),
+    "raster": ("threedify.processing.raster", "RasterProcessor"),
+    "vector": ("threedify.processing.vector", "VectorProcessor"),
+    "general": ("threedify.processing.general", "GeneralProcessor"),
 }
+_PROCESSORS: Dict[str, BaseProcessor] = {}
 
 def get_processor(processor_type: str) -> BaseProcessor:
     """Get a processor instance by type.
@@ -20,11 +23,28 @@ def get_processor(processor_type: str) -> BaseProcessor:
         BaseProcessor: Processor instance
     Raises:
         ValueError: If the processor type is not registered
+        ImportError: If the processor's dependencies are not installed; the type is
+            then removed from the registry
     """
-    if processor_type not in _PROCESSORS:
+    try:
+        return _PROCESSORS[processor_type]
+    except KeyError:
+        pass
+    try:
+        module_name, class_name = _PROCESSOR_CLASSES[processor_type]
+    except KeyError:
+        available = list(dict.fromkeys([*_PROCESSOR_CLASSES, *_PROCESSORS]))
         raise ValueError(f"Unknown processor type: {processor_type}. "
-                         f"Available types: {list(_PROCESSORS.keys())}")
-    return _PROCESSORS[processor_type]
+                         f"Available types: {available}") from None
+    try:
+        processor_class = getattr(import_module(module_name), class_name)
+    except ImportError as e:
+        # Drop the entry so later lookups and the available types reflect this install
+        del _PROCESSOR_CLASSES[processor_type]
+        logger.warning(f"The {processor_type} processor is unavailable: {str(e)}")
+        raise
+    processor = processor_class()
+    return _PROCESSORS.setdefault(processor_type, processor)
 
 def register_processor(processor_type: str, processor_instance: BaseProcessor):
     """Register a new processor type.
@@ -34,4 +54,4 @@ def register_processor(processor_type: str, processor_instance: BaseProcessor):
     Returns:
         None
     """
-    _PROCESSORS[processor_type] = processor_instance
\ No newline at end of file
+    _PROCESSORS[processor_type] = processor_instance
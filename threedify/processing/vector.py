@@ -1,14 +1,87 @@
 """Vector data processing module.for actual implementation, I would use libraries like Shapely or GeoPandas
-    to process the vector data. For now, due  to lack of time needs to be invested i will just write a placeholder.
+    to process the vector data. Geometries are simplified with Shapely; building mode is still a placeholder.
 """
 
 import logging
+from functools import lru_cache
 from typing import Any, Dict, Optional, List, Tuple, Union
 import numpy as np
 
 from threedify.processing.base import BaseProcessor
 
 logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _shapely():
+    import shapely
+    import shapely.geometry
+    return shapely
+
+def _simplify_geometries(vector, tolerance):
+    """Douglas-Peucker simplify geometries in GEOS, keeping the container they came in.
+    Topology is preserved, so polygons stay valid and rings do not collapse.
+    Args:
+        vector: Loaded VectorData with ragged coordinate arrays, a GeoDataFrame or
+            GeoSeries, shapely geometries, or an object exposing __geo_interface__
+        tolerance (float): Maximum distance a vertex may move
+    Returns:
+        The simplified geometries in the same form as `vector`, shapely geometries for
+        __geo_interface__ input, or None if `vector` holds no geometries
+    """
+    shapely = _shapely()
+    # Geometries first: a Polygon's .coords raises instead of returning None
+    if isinstance(vector, (shapely.Geometry, np.ndarray, list, tuple)):
+        return shapely.simplify(vector, tolerance, preserve_topology=True)
+    geoseries = getattr(vector, 'geometry', None)
+    if hasattr(geoseries, 'simplify'):
+        # GeoPandas hands each geometry to GEOS
+        simplified = geoseries.simplify(tolerance, preserve_topology=True)
+        return vector.set_geometry(simplified) if hasattr(vector, 'set_geometry') else simplified
+    if hasattr(vector, 'offsets') and vector.coords is None and getattr(vector, 'geometries', None) is not None:
+        # Loader output with mixed geometry types carries the geometry array instead
+        return type(vector)(vector.vector, path=vector.path, attributes=vector.attributes,
+                            geometries=shapely.simplify(vector.geometries, tolerance,
+                                                        preserve_topology=True))
+    if getattr(vector, 'offsets', None) is not None and getattr(vector, 'coords', None) is not None:
+        # One vectorized GEOS call over the loader's flat arrays, then back to them
+        geometries = shapely.from_ragged_array(
+            shapely.GeometryType[vector.vector['geometry_type']], vector.coords, vector.offsets)
+        geometry_type, coords, offsets = shapely.to_ragged_array(
+            shapely.simplify(geometries, tolerance, preserve_topology=True))
+        logger.info(f"Simplified {len(vector.coords)} vertices to {len(coords)}")
+        return type(vector)({**vector.vector, 'geometry_type': geometry_type.name}, path=vector.path,
+                            coords=coords, offsets=offsets, attributes=vector.attributes)
+    interface = getattr(vector, '__geo_interface__', None)
+    if interface is not None:
+        if interface.get('type') == 'FeatureCollection':
+            geometries = np.array([shapely.geometry.shape(feature['geometry'])
+                                   for feature in interface['features']], dtype=object)
+        else:
+            geometries = shapely.geometry.shape(interface)
+        return shapely.simplify(geometries, tolerance, preserve_topology=True)
+    return None
+
+class ProcessedVector:
+    """Result of vector processing."""
+    __slots__ = ("vector", "simplified", "building_segments", "original_data", "geometries")
+    type = 'processed_vector'
+
+    def __init__(self, vector, simplified, building_segments, original_data, geometries=None):
+        """Initialize the processed vector data.
+        Args:
+            vector: Vector features
+            simplified (bool): Whether the geometries were simplified
+            building_segments (dict): Building segments, in building mode
+            original_data: Data the processor was given
+            geometries: The simplified geometries, in the container the input came in
+                (VectorData, GeoDataFrame, shapely geometries); None if not simplified
+        """
+        self.vector = vector
+        self.simplified = simplified
+        self.building_segments = building_segments
+        self.original_data = original_data
+        self.geometries = geometries
+
 class VectorProcessor(BaseProcessor):
     """Processor for vector data (shapefiles, etc.)."""
     def process(self, data: Any, **kwargs) -> Any:
@@ -16,7 +89,7 @@ class VectorProcessor(BaseProcessor):
         Args:
             data: Input vector data
             **kwargs: Additional processor-specific parameters
-                - simplify (float): Simplification tolerance
+                - simplify (float): Douglas-Peucker tolerance; 0 keeps the geometries as given
                 - building_mode (bool): Special processing for buildings   
         Returns:
             Processed vector data
@@ -24,14 +97,21 @@ class VectorProcessor(BaseProcessor):
         logger.info("Processing vector data")
         simplify = kwargs.get('simplify', 0.0)
         building_mode = kwargs.get('building_mode', False)
-        # Placeholder for processed data
-        processed_data = type('ProcessedVector', (), {
-            'vector': data.vector if hasattr(data, 'vector') else data,
-            'simplified': simplify > 0,
-            'building_segments': {} if building_mode else None,
-            'original_data': data,
-            'type': 'processed_vector'
-        })
+        simplified = None
+        if simplify > 0:
+            try:
+                simplified = _simplify_geometries(data, simplify)
+                if simplified is None and hasattr(data, 'vector'):
+                    # A wrapper carrying its geometries (e.g. a GeoDataFrame) as .vector
+                    simplified = _simplify_geometries(data.vector, simplify)
+            except ImportError:
+                logger.warning("shapely is required to simplify vector geometries, keeping them as loaded")
+            else:
+                if simplified is None:
+                    logger.warning("No geometries to simplify, keeping the vector data as given")
+        processed_data = ProcessedVector(data.vector if hasattr(data, 'vector') else data,
+                                         simplified is not None, {} if building_mode else None, data,
+                                         geometries=simplified)
         logger.info("Vector processing complete")
         return processed_data
     
@@ -4,6 +4,23 @@
 from abc import ABC, abstractmethod
 from typing import Any, Dict, Optional
 
+# Model data attributes that select a visualizer's _visualize_* method, in priority order
+_DATA_KINDS = ('point_cloud', 'mesh', 'gaussian')
+
+def _data_kind(model_data: Any) -> str:
+    """Name the kind of 3D data a model result carries.
+    Args:
+        model_data: Model data to visualize
+    Returns:
+        str: The first of 'point_cloud', 'mesh' or 'gaussian' the data has set
+            ('gaussian' is a flag, so False does not count), else 'generic'
+    """
+    for kind in _DATA_KINDS:
+        value = getattr(model_data, kind, None)
+        if value is not None and value is not False:
+            return kind
+    return 'generic'
+
 class BaseVisualizer(ABC):
     """Base class for visualizers."""
     @abstractmethod
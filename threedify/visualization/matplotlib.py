@@ -2,11 +2,57 @@
 """
 
 import logging
-from typing import Any, Dict, Optional, Union
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional, Tuple, Union
 import numpy as np
-from threedify.visualization.base import BaseVisualizer
+from threedify.visualization.base import BaseVisualizer, _data_kind
+from threedify.visualization.utils import _as_f32, _as_i32
 
 logger = logging.getLogger(__name__)
+
+# _visualize_* method drawing each kind of data; anything else goes to _visualize_generic
+_DISPATCH = {
+    'point_cloud': '_visualize_point_cloud',
+    'mesh': '_visualize_mesh',
+}
+
+# Cleared figures kept per (figsize, dpi) for reuse_figure renders, at most one per CPU;
+# a figure is only ever in the pool or held by one render
+_FIG_POOL: Dict[Tuple[Tuple[float, float], int], List[Any]] = defaultdict(list)
+_FIG_POOL_SIZE = os.cpu_count() or 1
+_fig_pool_lock = threading.Lock()
+
+@contextmanager
+def _acquire_fig(figsize, dpi):
+    """Borrow a figure from the pool, creating one if none is free.
+    The figure is cleared and returned to the pool on exit. Pooled figures are not
+    registered with pyplot, so batch renders do not accumulate open figures.
+    Args:
+        figsize (tuple): Figure size (width, height) in inches
+        dpi (int): DPI for the figure
+    Yields:
+        matplotlib.figure.Figure: A blank figure with an Agg canvas
+    """
+    key = (tuple(figsize), dpi)
+    with _fig_pool_lock:
+        pool = _FIG_POOL[key]
+        fig = pool.pop() if pool else None
+    if fig is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(fig)
+    try:
+        yield fig
+    finally:
+        fig.clf()
+        with _fig_pool_lock:
+            if len(pool) < _FIG_POOL_SIZE:
+                pool.append(fig)
+
 class MatplotlibVisualizer(BaseVisualizer):
     """Visualizer using Matplotlib."""
     def visualize(self, model_data: Any, **kwargs) -> Any:
@@ -20,8 +66,13 @@ class MatplotlibVisualizer(BaseVisualizer):
                 - save_image (str): Path to save the visualization as image
                 - point_size (float): Size of points for point clouds
                 - opacity (float): Opacity of mesh surfaces 
+                - max_points (int): Point clouds larger than this are randomly
+                  decimated before plotting (default 200000)
+                - reuse_figure (bool): With save_image, draw on a pooled figure that is
+                  cleared and reused by later renders of the same size, for batch
+                  rendering; the saved path is returned instead of the figure
         Returns:
-            Matplotlib figure
+            Matplotlib figure, or the save_image path when reuse_figure is set
         """
         logger.info("Creating Matplotlib visualization")
         figsize = kwargs.get('figsize', (10, 8))
@@ -30,52 +81,76 @@ class MatplotlibVisualizer(BaseVisualizer):
         save_image = kwargs.get('save_image', None)
         point_size = kwargs.get('point_size', 2)
         opacity = kwargs.get('opacity', 0.8)
+        max_points = kwargs.get('max_points', 200_000)
+        reuse_figure = kwargs.get('reuse_figure', False)
         try:
-            import matplotlib.pyplot as plt
             from mpl_toolkits.mplot3d import Axes3D
+            kind = _data_kind(model_data)
+            options = {'point_cloud': {'point_size': point_size, 'max_points': max_points},
+                       'mesh': {'opacity': opacity}}.get(kind, {})
+            draw = getattr(self, _DISPATCH.get(kind, '_visualize_generic'))
+            if reuse_figure and save_image:
+                with _acquire_fig(figsize, dpi) as fig:
+                    fig.patch.set_facecolor(background_color)
+                    draw(fig, model_data, background_color, **options)
+                    fig.savefig(save_image, bbox_inches='tight', facecolor=fig.get_facecolor())
+                logger.info(f"Visualization saved to {save_image}")
+                return save_image
+            import matplotlib.pyplot as plt
             fig = plt.figure(figsize=figsize, dpi=dpi)
             fig.patch.set_facecolor(background_color)
-            if hasattr(model_data, 'point_cloud'):
-                ax = self._visualize_point_cloud(fig, model_data, background_color, point_size)
-            elif hasattr(model_data, 'mesh'):
-                ax = self._visualize_mesh(fig, model_data, background_color, opacity)
-            else:
-                ax = self._visualize_generic(fig, model_data, background_color)
+            ax = draw(fig, model_data, background_color, **options)
             if save_image:
-                plt.savefig(save_image, bbox_inches='tight', facecolor=fig.get_facecolor())
+                fig.savefig(save_image, bbox_inches='tight', facecolor=fig.get_facecolor())
                 logger.info(f"Visualization saved to {save_image}")
             return fig
         except Exception as e:
             logger.error(f"Failed to create visualization: {str(e)}")
             raise
     
-    def _visualize_point_cloud(self, fig, model_data, background_color, point_size):
+    def _visualize_point_cloud(self, fig, model_data, background_color, point_size, max_points=200_000):
         """Visualize a point cloud using Matplotlib.
         Args:
             fig: Matplotlib figure
             model_data: Point cloud data
             background_color (tuple): Background color (r, g, b)
             point_size (float): Size of points
+            max_points (int): Number of points plotted at most; larger clouds are
+                decimated with a fixed-seed uniform sample
         Returns:
             Matplotlib axis
         """
         points = model_data.point_cloud
-        if hasattr(model_data, 'colors') and model_data.colors is not None:
-            colors = model_data.colors
-            if colors.shape[1] > 3:
-                colors = colors[:, :3]  # Use just RGB, drop alpha if present
+        colors = getattr(model_data, 'colors', None)
+        if max_points and len(points) > max_points:
+            keep = np.random.default_rng(0).choice(len(points), max_points, replace=False)
+            keep.sort()
+            points = points[keep]
+            colors = colors[keep] if colors is not None else None
+        points = _as_f32(points)
+        # Final float32 RGBA rows, written in place, so scatter has no colors to parse
+        rgba = np.empty((len(points), 4), dtype=np.float32)
+        if colors is not None:
+            colors = np.asarray(colors)
+            rgba[:, :3] = colors[:, :3]  # Use just RGB, drop alpha if present
+            if np.issubdtype(colors.dtype, np.integer):
+                rgba[:, :3] *= 1 / 255
         else:
-            colors = np.ones((len(points), 3)) * 0.7
+            rgba[:, :3] = 0.7
+        rgba[:, 3] = 0.8
         ax = fig.add_subplot(111, projection='3d')
         ax.set_facecolor(background_color)
-        ax.scatter(
+        scatter = ax.scatter(
             points[:, 0],
             points[:, 1],
             points[:, 2],
-            c=colors,
             s=point_size,
-            alpha=0.8
+            # Depth shading re-sorts and recolors every point on each draw; rasterizing
+            # saves the points as one image layer instead of N vector markers
+            depthshade=False,
+            rasterized=True
         )
+        scatter.set_facecolor(rgba)
         ax.set_xlabel('X', color='white')
         ax.set_ylabel('Y', color='white')
         ax.set_zlabel('Z', color='white')
@@ -118,29 +193,24 @@ class MatplotlibVisualizer(BaseVisualizer):
             colors = None
         ax = fig.add_subplot(111, projection='3d')
         ax.set_facecolor(background_color)
-        mesh_list = []
-        for face in faces:
-            mesh_list.append([vertices[face[0]], vertices[face[1]], vertices[face[2]]])
-        
-        poly = Poly3DCollection(mesh_list, alpha=opacity)
+        vertices = _as_f32(vertices)
+        faces = _as_i32(faces)
+        # One gather builds the (F, 3, 3) triangle corners
+        poly = Poly3DCollection(vertices[faces[:, :3]], alpha=opacity)
         if colors is not None:
-            face_colors = []
-            for face in faces:
-                face_color = np.mean(colors[face], axis=0)[:3]  # Use RGB only
-                face_colors.append(face_color)
-            poly.set_facecolor(face_colors)
+            # Mean corner color per face, RGB only
+            poly.set_facecolor(np.asarray(colors)[faces[:, :3]].mean(axis=1)[:, :3])
         else:
             poly.set_facecolor('cyan')
         ax.add_collection3d(poly)
-        all_pts = vertices
-        x_min, x_max = np.min(all_pts[:, 0]), np.max(all_pts[:, 0])
-        y_min, y_max = np.min(all_pts[:, 1]), np.max(all_pts[:, 1])
-        z_min, z_max = np.min(all_pts[:, 2]), np.max(all_pts[:, 2])
-        padding = max(max(x_max - x_min, y_max - y_min), z_max - z_min) * 0.1
-        
-        ax.set_xlim([x_min - padding, x_max + padding])
-        ax.set_ylim([y_min - padding, y_max + padding])
-        ax.set_zlim([z_min - padding, z_max + padding])
+        lower = vertices.min(axis=0)[:3]
+        upper = vertices.max(axis=0)[:3]
+        # Equal-scale cube around the bounds, with 10% of the largest extent as padding
+        middle = (lower + upper) / 2
+        radius = 0.6 * (upper - lower).max()
+        ax.set_xlim3d(middle[0] - radius, middle[0] + radius)
+        ax.set_ylim3d(middle[1] - radius, middle[1] + radius)
+        ax.set_zlim3d(middle[2] - radius, middle[2] + radius)
         
         ax.set_xlabel('X', color='white')
         ax.set_ylabel('Y', color='white')
@@ -154,8 +224,6 @@ class MatplotlibVisualizer(BaseVisualizer):
         ax.tick_params(axis='x', colors='white')
         ax.tick_params(axis='y', colors='white')
         ax.tick_params(axis='z', colors='white')
-        
-        self._set_axes_equal(ax)
         return ax
     
     def _visualize_generic(self, fig, model_data, background_color):
@@ -2,12 +2,106 @@
 """
 
 import logging
-from typing import Any, Dict, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional, Union
 import numpy as np
 
-from threedify.visualization.base import BaseVisualizer
+from threedify.visualization.base import BaseVisualizer, _data_kind
+from threedify.visualization.utils import _as_f32, _as_i32
 logger = logging.getLogger(__name__)
 
+# ASCII hex digits of every byte value, for building '#rrggbb' strings without a Python loop
+_HEX_DIGITS = np.frombuffer(''.join(f'{i:02x}' for i in range(256)).encode('ascii'),
+                            dtype=np.uint8).reshape(256, 2)
+
+def _hex_colors(colors: np.ndarray) -> np.ndarray:
+    """Format per-point colors as CSS hex strings in one vectorized pass.
+    Args:
+        colors (np.ndarray): (N, 3) RGB or (N, 4) RGBA colors, 0-1 floats or 0-255 integers
+    Returns:
+        np.ndarray: (N,) '#rrggbb' or '#rrggbbaa' strings
+    """
+    colors = np.asarray(colors)
+    if colors.dtype == np.uint8:
+        channels = colors
+    else:
+        # Clip once into a scratch buffer, scale it in place and cast into the uint8 buffer
+        channels = np.empty(colors.shape, dtype=np.uint8)
+        if np.issubdtype(colors.dtype, np.integer):
+            np.copyto(channels, np.clip(colors, 0, 255), casting='unsafe')
+        else:
+            scaled = np.clip(colors, 0, 1, dtype=np.float32)
+            scaled *= 255
+            np.copyto(channels, scaled, casting='unsafe')
+    n, k = channels.shape
+    text = np.empty((n, 1 + 2 * k), dtype=np.uint8)
+    text[:, 0] = ord('#')
+    text[:, 1:] = _HEX_DIGITS[channels].reshape(n, 2 * k)
+    return text.view(f'S{1 + 2 * k}').ravel().astype(f'U{1 + 2 * k}')
+
+@lru_cache(maxsize=None)
+def _gaussian_preview(num_points=5000):
+    """Placeholder cloud drawn for Gaussian models, generated once per process.
+    Args:
+        num_points (int): Number of points
+    Returns:
+        tuple: (3, N) float32 x/y/z rows and (N,) '#rrggbb' colors, both read-only
+    """
+    rng = np.random.default_rng(0)
+    xyz = _as_f32(rng.standard_normal((num_points, 3), dtype=np.float32).T)
+    colors = _hex_colors(rng.integers(0, 256, (num_points, 3), dtype=np.uint8))
+    xyz.setflags(write=False)
+    colors.setflags(write=False)
+    return xyz, colors
+
+@lru_cache(maxsize=32)
+def _bg_rgb(background_color: tuple) -> str:
+    """CSS rgb() string of a 0-1 (r, g, b) background color."""
+    return f'rgb({int(background_color[0]*255)}, {int(background_color[1]*255)}, {int(background_color[2]*255)})'
+
+def _base_layout(width, height, background_color, title, scene=True):
+    """Layout settings shared by every Plotly figure.
+    Args:
+        width (int): Visualization width
+        height (int): Visualization height
+        background_color (tuple): Background color (r, g, b)
+        title (str): Figure title
+        scene (bool): Add the labelled, data-proportioned 3D scene and tight margins
+    Returns:
+        dict: Keyword arguments for fig.update_layout
+    """
+    bg = _bg_rgb(tuple(background_color))
+    layout = dict(width=width, height=height, paper_bgcolor=bg, plot_bgcolor=bg, title=title)
+    if scene:
+        layout.update(
+            scene=dict(
+                xaxis_title='X',
+                yaxis_title='Y',
+                zaxis_title='Z',
+                aspectmode='data'
+            ),
+            margin=dict(l=0, r=0, b=0, t=30)
+        )
+    return layout
+
+def _write_html(fig, save_html, include_plotlyjs, validate):
+    """Save a figure as a standalone HTML page.
+    Args:
+        fig: Plotly figure
+        save_html (str): Path to save the HTML to
+        include_plotlyjs (bool or str): How the page gets plotly.js, as for fig.write_html
+        validate (bool): Validate the figure again while writing
+    """
+    fig.write_html(save_html, include_plotlyjs=include_plotlyjs, full_html=True,
+                   validate=validate, include_mathjax=False)
+
+# _visualize_* method drawing each kind of data; anything else goes to _visualize_generic
+_DISPATCH = {
+    'point_cloud': '_visualize_point_cloud',
+    'mesh': '_visualize_mesh',
+    'gaussian': '_visualize_gaussian',
+}
+
 class PlotlyVisualizer(BaseVisualizer):
     """Visualizer using Plotly."""
     
@@ -20,6 +114,11 @@ class PlotlyVisualizer(BaseVisualizer):
                 - height (int): Visualization height
                 - background_color (tuple): Background color (r, g, b)
                 - save_html (str): Path to save the visualization as HTML
+                - include_plotlyjs (bool or str): How save_html gets plotly.js (default
+                  'cdn', a script tag instead of ~3.5 MB inlined per file); True inlines
+                  it, 'directory' writes one shared plotly.min.js next to the file
+                - validate (bool): Validate the figure again while writing save_html
+                  (default False; traces are validated when they are built)
                 - point_size (float): Size of points for point clouds
                 - opacity (float): Opacity of mesh surfaces   
         Returns:
@@ -30,27 +129,125 @@ class PlotlyVisualizer(BaseVisualizer):
         height = kwargs.get('height', 600)
         background_color = kwargs.get('background_color', (0.1, 0.1, 0.1))
         save_html = kwargs.get('save_html', None)
+        include_plotlyjs = kwargs.get('include_plotlyjs', 'cdn')
+        validate = kwargs.get('validate', False)
         point_size = kwargs.get('point_size', 2)
         opacity = kwargs.get('opacity', 0.8)
         try:
             import plotly.graph_objects as go
-            if hasattr(model_data, 'point_cloud'):
-                fig = self._visualize_point_cloud(model_data, width, height, background_color, point_size)
-            elif hasattr(model_data, 'mesh'):
-                fig = self._visualize_mesh(model_data, width, height, background_color, opacity)
-            elif hasattr(model_data, 'gaussian') and model_data.gaussian:
-                fig = self._visualize_gaussian(model_data, width, height, background_color)
-            else:
-                fig = self._visualize_generic(model_data, width, height, background_color)
+            kind = _data_kind(model_data)
+            options = {'point_cloud': {'point_size': point_size},
+                       'mesh': {'opacity': opacity}}.get(kind, {})
+            fig = getattr(self, _DISPATCH.get(kind, '_visualize_generic'))(
+                model_data, width, height, background_color, **options)
             
             if save_html:
-                fig.write_html(save_html)
+                _write_html(fig, save_html, include_plotlyjs, validate)
                 logger.info(f"Visualization saved to {save_html}")
             return fig
             
         except Exception as e:
             logger.error(f"Failed to create visualization: {str(e)}")
             raise
+
+    def visualize_many(self, datas: Iterable[Any], **kwargs) -> Any:
+        """Visualize several point clouds in one Plotly figure.
+        All points go into one Scatter3d whose customdata holds each point's cloud index,
+        so the figure, scene and WebGL context are set up once for every cloud. A slider
+        shows all clouds or one at a time: each step is an animation frame that hides the
+        combined trace and fills a second trace with that cloud's slice of the arrays.
+        The axes span every cloud, so the camera stays put between steps.
+        Args:
+            datas: Point cloud model data, each with a point_cloud and optional colors
+            **kwargs: Additional parameters
+                - width (int): Visualization width
+                - height (int): Visualization height
+                - background_color (tuple): Background color (r, g, b)
+                - save_html (str): Path to save the visualization as HTML
+                - include_plotlyjs (bool or str): As for visualize (default 'cdn')
+                - validate (bool): As for visualize (default False)
+                - point_size (float): Size of the points
+        Returns:
+            Plotly figure
+        """
+        datas = list(datas)
+        logger.info(f"Creating Plotly visualization of {len(datas)} point clouds")
+        width = kwargs.get('width', 800)
+        height = kwargs.get('height', 600)
+        background_color = kwargs.get('background_color', (0.1, 0.1, 0.1))
+        save_html = kwargs.get('save_html', None)
+        include_plotlyjs = kwargs.get('include_plotlyjs', 'cdn')
+        validate = kwargs.get('validate', False)
+        point_size = kwargs.get('point_size', 2)
+        try:
+            import plotly.graph_objects as go
+            clouds = [np.asarray(data.point_cloud) for data in datas]
+            counts = np.fromiter(map(len, clouds), dtype=np.int64, count=len(clouds))
+            bounds = np.concatenate([[0], np.cumsum(counts)])
+            # Every cloud is written straight into one set of contiguous float32 rows
+            xyz = np.empty((3, bounds[-1]), dtype=np.float32)
+            for cloud, start, stop in zip(clouds, bounds[:-1], bounds[1:]):
+                xyz[:, start:stop] = cloud[:, :3].T
+            ids = np.repeat(np.arange(len(clouds), dtype=np.int32), counts)
+            colors = [getattr(data, 'colors', None) for data in datas]
+            if datas and all(color is not None for color in colors):
+                colors = _hex_colors(np.concatenate([np.asarray(color)[:, :3] for color in colors]))
+                color_range = {}
+            else:
+                # Without colors for every cloud, color each by its index
+                colors = ids
+                color_range = dict(colorscale='Viridis', cmin=0, cmax=max(len(clouds) - 1, 1))
+            fig = go.Figure(data=[
+                go.Scatter3d(
+                    x=xyz[0], y=xyz[1], z=xyz[2],
+                    customdata=ids,
+                    mode='markers',
+                    marker=dict(size=point_size, color=colors, opacity=0.8, **color_range),
+                    hovertemplate='cloud %{customdata}<extra></extra>',
+                    name='all'
+                ),
+                go.Scatter3d(
+                    x=[], y=[], z=[],
+                    mode='markers',
+                    marker=dict(size=point_size, opacity=0.8, **color_range),
+                    hovertemplate='cloud %{customdata}<extra></extra>',
+                    name='selected'
+                ),
+            ])
+            frames = [go.Frame(name='all', traces=[0, 1], data=[
+                go.Scatter3d(visible=True), go.Scatter3d(x=[], y=[], z=[], customdata=[])])]
+            for index, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+                # Slices are views of the combined arrays, so no cloud is copied again here
+                frames.append(go.Frame(name=str(index), traces=[0, 1], data=[
+                    go.Scatter3d(visible=False),
+                    go.Scatter3d(x=xyz[0, start:stop], y=xyz[1, start:stop], z=xyz[2, start:stop],
+                                 customdata=ids[start:stop],
+                                 marker=dict(color=colors[start:stop]))]))
+            fig.frames = frames
+            steps = [dict(method='animate', label=frame.name,
+                          args=[[frame.name], dict(mode='immediate', frame=dict(duration=0, redraw=True),
+                                                   transition=dict(duration=0))])
+                     for frame in frames]
+            layout = _base_layout(width, height, background_color, 'Point Cloud Visualization')
+            if len(xyz[0]):
+                lower = xyz.min(axis=1)
+                upper = xyz.max(axis=1)
+                span = np.maximum(upper - lower, np.finfo(np.float32).eps)
+                layout['scene'].update(
+                    xaxis=dict(range=[lower[0], upper[0]]),
+                    yaxis=dict(range=[lower[1], upper[1]]),
+                    zaxis=dict(range=[lower[2], upper[2]]),
+                    aspectmode='manual',
+                    aspectratio=dict(zip('xyz', (span / span.max()).tolist())))
+            fig.update_layout(**layout, showlegend=False,
+                              sliders=[dict(active=0, currentvalue=dict(prefix='Cloud: '), steps=steps)])
+            if save_html:
+                _write_html(fig, save_html, include_plotlyjs, validate)
+                logger.info(f"Visualization saved to {save_html}")
+            return fig
+        except Exception as e:
+            logger.error(f"Failed to create visualization: {str(e)}")
+            raise
     
     def _visualize_point_cloud(self, model_data, width, height, background_color, point_size):
         """Visualize a point cloud using Plotly.
@@ -66,20 +263,19 @@ class PlotlyVisualizer(BaseVisualizer):
         import plotly.graph_objects as go
         points = model_data.point_cloud
         if hasattr(model_data, 'colors') and model_data.colors is not None:
-            colors = model_data.colors
-            if colors.shape[1] == 3:  # RGB
-                colors = [f'rgb({int(r*255)}, {int(g*255)}, {int(b*255)})' 
-                         for r, g, b in colors]
-            elif colors.shape[1] == 4:  # RGBA
-                colors = [f'rgba({int(r*255)}, {int(g*255)}, {int(b*255)}, {a})' 
-                         for r, g, b, a in colors]
+            # RGB or RGBA rows become '#rrggbb' / '#rrggbbaa' strings, vectorized
+            colors = _hex_colors(model_data.colors)
         else:
-            colors = ['rgb(128, 128, 128)'] * len(points)
+            # One color for every point; no per-point list to build or validate
+            colors = 'rgb(128, 128, 128)'
+
         
+        # One contiguous float32 row per axis, which plotly.py writes as binary typed arrays
+        xyz = _as_f32(np.asarray(points)[:, :3].T)
         fig = go.Figure(data=[go.Scatter3d(
-            x=points[:, 0],
-            y=points[:, 1],
-            z=points[:, 2],
+            x=xyz[0],
+            y=xyz[1],
+            z=xyz[2],
             mode='markers',
             marker=dict(
                 size=point_size,
@@ -87,20 +283,7 @@ class PlotlyVisualizer(BaseVisualizer):
                 opacity=0.8
             )
         )])
-        fig.update_layout(
-            width=width,
-            height=height,
-            scene=dict(
-                xaxis_title='X',
-                yaxis_title='Y',
-                zaxis_title='Z',
-                aspectmode='data'
-            ),
-            margin=dict(l=0, r=0, b=0, t=30),
-            paper_bgcolor=f'rgb({int(background_color[0]*255)}, {int(background_color[1]*255)}, {int(background_color[2]*255)})',
-            plot_bgcolor=f'rgb({int(background_color[0]*255)}, {int(background_color[1]*255)}, {int(background_color[2]*255)})',
-            title='Point Cloud Visualization'
-        )
+        fig.update_layout(**_base_layout(width, height, background_color, 'Point Cloud Visualization'))
         return fig
     
     def _visualize_mesh(self, model_data, width, height, background_color, opacity):
@@ -131,21 +314,25 @@ class PlotlyVisualizer(BaseVisualizer):
                 [0, 3, 7], [0, 7, 4], [1, 2, 6], [1, 6, 5]
             ])
             colors = None
-        i, j, k = faces[:, 0], faces[:, 1], faces[:, 2]
+        faces = np.asarray(faces)
+        # One contiguous row per coordinate and per corner, so each goes out as a packed
+        # float32/int32 typed array rather than a strided view
+        xyz = _as_f32(np.asarray(vertices)[:, :3].T)
+        ijk = _as_i32(faces[:, :3].T)
         colorscale = None
         intensity = None
     
         if colors is not None:
-            face_colors = np.zeros(len(faces))
-            for idx, face in enumerate(faces):
-                face_colors[idx] = np.mean(colors[face])
+            # Mean over each face's corners (and channels) as the face intensity, in one reduction
+            corner_colors = np.asarray(colors)[faces]
+            face_colors = corner_colors.mean(axis=tuple(range(1, corner_colors.ndim)))
             colorscale = 'Viridis'
             intensity = face_colors
         mesh_3d = go.Mesh3d(
-            x=vertices[:, 0],
-            y=vertices[:, 1],
-            z=vertices[:, 2],
-            i=i, j=j, k=k,
+            x=xyz[0],
+            y=xyz[1],
+            z=xyz[2],
+            i=ijk[0], j=ijk[1], k=ijk[2],
             opacity=opacity,
             flatshading=True
         )
@@ -155,20 +342,7 @@ class PlotlyVisualizer(BaseVisualizer):
         else:
             mesh_3d.color = 'lightblue'
         fig = go.Figure(data=[mesh_3d])
-        fig.update_layout(
-            width=width,
-            height=height,
-            scene=dict(
-                xaxis_title='X',
-                yaxis_title='Y',
-                zaxis_title='Z',
-                aspectmode='data'
-            ),
-            margin=dict(l=0, r=0, b=0, t=30),
-            paper_bgcolor=f'rgb({int(background_color[0]*255)}, {int(background_color[1]*255)}, {int(background_color[2]*255)})',
-            plot_bgcolor=f'rgb({int(background_color[0]*255)}, {int(background_color[1]*255)}, {int(background_color[2]*255)})',
-            title='Mesh Visualization'
-        )
+        fig.update_layout(**_base_layout(width, height, background_color, 'Mesh Visualization'))
         return fig
     
     def _visualize_gaussian(self, model_data, width, height, background_color):
@@ -182,36 +356,20 @@ class PlotlyVisualizer(BaseVisualizer):
             Plotly figure
         """
         import plotly.graph_objects as go
-        import numpy as np
-        num_points = 5000
-        points = np.random.randn(num_points, 3)
-        colors = np.random.rand(num_points, 3)
-        colors_str = [f'rgb({int(r*255)}, {int(g*255)}, {int(b*255)})' for r, g, b in colors]
+        xyz, colors = _gaussian_preview()
         fig = go.Figure(data=[go.Scatter3d(
-            x=points[:, 0],
-            y=points[:, 1],
-            z=points[:, 2],
+            x=xyz[0],
+            y=xyz[1],
+            z=xyz[2],
             mode='markers',
             marker=dict(
                 size=3,
-                color=colors_str,
+                color=colors,
                 opacity=0.7
             )
         )])
-        fig.update_layout(
-            width=width,
-            height=height,
-            scene=dict(
-                xaxis_title='X',
-                yaxis_title='Y',
-                zaxis_title='Z',
-                aspectmode='data'
-            ),
-            margin=dict(l=0, r=0, b=0, t=30),
-            paper_bgcolor=f'rgb({int(background_color[0]*255)}, {int(background_color[1]*255)}, {int(background_color[2]*255)})',
-            plot_bgcolor=f'rgb({int(background_color[0]*255)}, {int(background_color[1]*255)}, {int(background_color[2]*255)})',
-            title='3D Gaussian Model Visualization (Preview)'
-        )
+        fig.update_layout(**_base_layout(width, height, background_color,
+                                         '3D Gaussian Model Visualization (Preview)'))
         return fig
     
     def _visualize_generic(self, model_data, width, height, background_color):
@@ -239,11 +397,7 @@ class PlotlyVisualizer(BaseVisualizer):
             )
         )
         fig.update_layout(
-            width=width,
-            height=height,
-            paper_bgcolor=f'rgb({int(background_color[0]*255)}, {int(background_color[1]*255)}, {int(background_color[2]*255)})',
-            plot_bgcolor=f'rgb({int(background_color[0]*255)}, {int(background_color[1]*255)}, {int(background_color[2]*255)})',
-            title='Model Data Visualization',
+            **_base_layout(width, height, background_color, 'Model Data Visualization', scene=False),
             xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
             yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
         )
@@ -1,14 +1,25 @@
+from importlib import import_module
 from typing import Dict
+import numpy as np
 from threedify.visualization.base import BaseVisualizer
-from threedify.visualization.jupyter import JupyterVisualizer
-from threedify.visualization.plotly import PlotlyVisualizer
-from threedify.visualization.matplotlib import MatplotlibVisualizer
 
-_VISUALIZERS: Dict[str, BaseVisualizer] = {
-    "jupyter": JupyterVisualizer(),
-    "plotly": PlotlyVisualizer(),
-    "matplotlib": MatplotlibVisualizer(),
+# Visualizer modules (and with them plotly or matplotlib) are imported and instantiated
+# on first request; _VISUALIZERS caches the instances
+_VISUALIZER_CLASSES: Dict[str, tuple] = {
+    "jupyter": ("threedify.visualization.jupyter", "JupyterVisualizer"),
+    "plotly": ("threedify.visualization.plotly", "PlotlyVisualizer"),
+    "matplotlib": ("threedify.visualization.matplotlib", "MatplotlibVisualizer"),
+    "vispy": ("threedify.visualization.vispy", "VispyVisualizer"),
 }
+_VISUALIZERS: Dict[str, BaseVisualizer] = {}
+
+def _as_f32(array) -> np.ndarray:
+    """Return array as C-contiguous float32, copying only if it is not one already."""
+    return np.ascontiguousarray(array, dtype=np.float32)
+
+def _as_i32(array) -> np.ndarray:
+    """Return array as C-contiguous int32, copying only if it is not one already."""
+    return np.ascontiguousarray(array, dtype=np.int32)
 
 def get_visualizer(visualizer_type: str) -> BaseVisualizer:
     """Get a visualizer instance by type.
@@ -19,10 +30,18 @@ def get_visualizer(visualizer_type: str) -> BaseVisualizer:
     Raises:
         ValueError: If the visualizer type is not registered
     """
-    if visualizer_type not in _VISUALIZERS:
+    try:
+        return _VISUALIZERS[visualizer_type]
+    except KeyError:
+        pass
+    try:
+        module_name, class_name = _VISUALIZER_CLASSES[visualizer_type]
+    except KeyError:
+        available = list(dict.fromkeys([*_VISUALIZER_CLASSES, *_VISUALIZERS]))
         raise ValueError(f"Unknown visualizer type: {visualizer_type}. "
-                         f"Available types: {list(_VISUALIZERS.keys())}")
-    return _VISUALIZERS[visualizer_type]
+                         f"Available types: {available}") from None
+    visualizer = getattr(import_module(module_name), class_name)()
+    return _VISUALIZERS.setdefault(visualizer_type, visualizer)
 
 def register_visualizer(visualizer_type: str, visualizer_instance: BaseVisualizer):
     """Register a new visualizer type.
@@ -32,4 +51,4 @@ def register_visualizer(visualizer_type: str, visualizer_instance: BaseVisualize
     Returns:
         None
     """
-    _VISUALIZERS[visualizer_type] = visualizer_instance
\ No newline at end of file
+    _VISUALIZERS[visualizer_type] = visualizer_instance
@@ -0,0 +1,168 @@
+"""VisPy visualization for threedify.
+Draws with OpenGL through VisPy, so point clouds far beyond what Matplotlib's 3D axes
+can handle stay interactive.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any
+import numpy as np
+
+from threedify.visualization.base import BaseVisualizer, _data_kind
+from threedify.visualization.utils import _as_f32
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def _vispy_scene():
+    from vispy import scene
+    return scene
+
+@lru_cache(maxsize=None)
+def _vispy_io():
+    import vispy.io
+    return vispy.io
+
+# _visualize_* method drawing each kind of data; anything else goes to _visualize_generic
+_DISPATCH = {
+    'point_cloud': '_visualize_point_cloud',
+    'mesh': '_visualize_mesh',
+}
+
+def _rgba(colors, alpha):
+    """Convert per-element colors to the float32 RGBA rows VisPy uploads.
+    Args:
+        colors (np.ndarray): (N, 3) RGB or (N, 4) RGBA colors, 0-1 floats or 0-255 integers
+        alpha (float): Alpha given to RGB colors
+    Returns:
+        np.ndarray: (N, 4) float32 colors in 0-1
+    """
+    colors = np.asarray(colors)
+    rgba = np.empty((len(colors), 4), dtype=np.float32)
+    channels = min(colors.shape[1], 4)
+    rgba[:, :channels] = colors[:, :channels]
+    if np.issubdtype(colors.dtype, np.integer):
+        rgba[:, :channels] *= 1 / 255
+    if channels < 4:
+        rgba[:, 3] = alpha
+    return rgba
+
+class VispyVisualizer(BaseVisualizer):
+    """Visualizer using VisPy (OpenGL)."""
+    def visualize(self, model_data: Any, **kwargs) -> Any:
+        """Visualize model data using VisPy.
+        Args:
+            model_data: Model data to visualize
+            **kwargs: Additional parameters
+                - width (int): Canvas width
+                - height (int): Canvas height
+                - background_color (tuple): Background color (r, g, b)
+                - save_image (str): Path to save the rendered canvas as PNG
+                - show (bool): Open the canvas in a window (default False)
+                - point_size (float): Size of points for point clouds, in pixels
+                - opacity (float): Opacity of mesh surfaces
+        Returns:
+            VisPy SceneCanvas
+        """
+        logger.info("Creating VisPy visualization")
+        width = kwargs.get('width', 800)
+        height = kwargs.get('height', 600)
+        background_color = kwargs.get('background_color', (0.1, 0.1, 0.1))
+        save_image = kwargs.get('save_image', None)
+        show = kwargs.get('show', False)
+        point_size = kwargs.get('point_size', 2)
+        opacity = kwargs.get('opacity', 0.8)
+        try:
+            try:
+                scene = _vispy_scene()
+            except ImportError:
+                logger.error("vispy is required for VisPy visualization")
+                raise ImportError("vispy is required for VisPy visualization. Install with: pip install vispy")
+            canvas = scene.SceneCanvas(keys='interactive', size=(width, height),
+                                       bgcolor=background_color, show=show)
+            view = canvas.central_widget.add_view()
+            kind = _data_kind(model_data)
+            options = {'point_cloud': {'point_size': point_size},
+                       'mesh': {'opacity': opacity}}.get(kind, {})
+            getattr(self, _DISPATCH.get(kind, '_visualize_generic'))(view, model_data, **options)
+            view.camera = 'arcball'
+            view.camera.set_range()
+            if save_image:
+                _vispy_io().write_png(save_image, canvas.render())
+                logger.info(f"Visualization saved to {save_image}")
+            return canvas
+        except Exception as e:
+            logger.error(f"Failed to create visualization: {str(e)}")
+            raise
+
+    def _visualize_point_cloud(self, view, model_data, point_size):
+        """Visualize a point cloud using VisPy.
+        Args:
+            view: VisPy ViewBox to draw into
+            model_data: Point cloud data
+            point_size (float): Size of the points, in pixels
+        Returns:
+            VisPy Markers visual
+        """
+        scene = _vispy_scene()
+        points = _as_f32(np.asarray(model_data.point_cloud)[:, :3])
+        colors = getattr(model_data, 'colors', None)
+        if colors is not None:
+            face_color = _rgba(colors, 0.8)
+        else:
+            face_color = (0.7, 0.7, 0.7, 0.8)
+        markers = scene.visuals.Markers()
+        markers.set_data(points, face_color=face_color, edge_width=0, size=point_size)
+        view.add(markers)
+        return markers
+
+    def _visualize_mesh(self, view, model_data, opacity):
+        """Visualize a mesh using VisPy.
+        Args:
+            view: VisPy ViewBox to draw into
+            model_data: Mesh data
+            opacity (float): Opacity of mesh surfaces
+        Returns:
+            VisPy Mesh visual
+        """
+        scene = _vispy_scene()
+        if hasattr(model_data, 'mesh') and isinstance(model_data.mesh, dict):
+            vertices = model_data.mesh.get('vertices', np.array([]))
+            faces = model_data.mesh.get('faces', np.array([]))
+            colors = model_data.mesh.get('colors', None)
+        else:
+            from threedify.export._mesh import UNIT_CUBE
+            vertices, faces, colors = UNIT_CUBE['vertices'], UNIT_CUBE['faces'], None
+        vertices = _as_f32(np.asarray(vertices)[:, :3])
+        faces = np.ascontiguousarray(np.asarray(faces)[:, :3], dtype=np.uint32)
+        if colors is not None:
+            mesh = scene.visuals.Mesh(vertices=vertices, faces=faces,
+                                      vertex_colors=_rgba(colors, opacity), shading='flat')
+        else:
+            mesh = scene.visuals.Mesh(vertices=vertices, faces=faces,
+                                      color=(0.0, 1.0, 1.0, opacity), shading='flat')
+        if opacity < 1:
+            mesh.set_gl_state('translucent', depth_test=True, cull_face=False)
+        view.add(mesh)
+        return mesh
+
+    def _visualize_generic(self, view, model_data):
+        """Create a generic visualization for unknown data.
+        Args:
+            view: VisPy ViewBox to draw into
+            model_data: Model data to visualize
+        Returns:
+            VisPy Text visual
+        """
+        scene = _vispy_scene()
+        text = scene.visuals.Text("Unknown data type. Cannot create visualization.",
+                                  color='white', font_size=14, pos=(0, 0, 0))
+        view.add(text)
+        return text
+
+    @property
+    def name(self) -> str:
+        """Get the name of the visualizer.
+        Returns:
+            str: Visualizer name
+        """
+        return "vispy"